@@ -0,0 +1,346 @@
+"""
+Benchmarks de `impuestos_package`.
+
+Uso (desde la raíz del repositorio, con el paquete instalado):
+
+    python benchmarks/run.py                       # todos, tamaños 1k/100k/1M
+    python benchmarks/run.py --rapido              # tamaños chicos, para probar
+    python benchmarks/run.py calcular cache        # sólo algunos grupos
+    python benchmarks/run.py --comparar benchmarks/resultados/0.1.0.json
+
+Los resultados se guardan en JSON (por defecto en
+``benchmarks/resultados/<versión>.json``) con una métrica por clave. El
+sufijo indica la unidad y el sentido: ``_ms`` y ``_bytes`` (menor es mejor)
+y ``_por_s`` (mayor es mejor). Con ``--comparar`` se marca como regresión todo cambio
+peor que ``--tolerancia`` y el proceso termina con código 1.
+
+Las UFV salen de una serie sintética local (`UFVArchivo`) o de un servidor
+HTTP falso en 127.0.0.1 (`servidor_ufv.py`); nunca se consulta al BCB.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List
+
+from servidor_ufv import ServidorUFV, valor_ufv
+
+from impuestos_package.batch import procesar_filas
+from impuestos_package.calculadora import CalculadoraDeuda
+from impuestos_package.cli import _percentil
+from impuestos_package.estructuras import Nodo
+from impuestos_package.motor import MotorDeuda
+from impuestos_package.proveedores import crear_cadena
+from impuestos_package.ufv import BCBAPIUFV
+from impuestos_package.ufv_cache import CacheUFV
+from impuestos_package.ufv_local import UFVArchivo
+
+try:
+    import numpy as np
+    from impuestos_package.lote import calcular_lote
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+INICIO_SERIE, FIN_SERIE = date(2010, 1, 1), date(2030, 12, 31)
+
+GRUPOS: Dict[str, Callable] = {}
+
+
+def grupo(nombre: str):
+    def registrar(funcion):
+        GRUPOS[nombre] = funcion
+        return funcion
+    return registrar
+
+
+# --- Utilidades ----------------------------------------------------------------
+def _cronometrar(funcion: Callable[[], object], repeticiones: int, calentamiento: int = 3) -> List[float]:
+    """Duración en segundos de cada llamada, ordenadas de menor a mayor."""
+    for _ in range(calentamiento):
+        funcion()
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - t0)
+    tiempos.sort()
+    return tiempos
+
+
+def _latencias(prefijo: str, tiempos: List[float]) -> Dict[str, float]:
+    return {
+        f"{prefijo}_p50_ms": _percentil(tiempos, 50) * 1000,
+        f"{prefijo}_p99_ms": _percentil(tiempos, 99) * 1000,
+    }
+
+
+def _serie_sintetica() -> UFVArchivo:
+    dias = (FIN_SERIE - INICIO_SERIE).days + 1
+    return UFVArchivo((INICIO_SERIE + timedelta(days=n), valor_ufv(INICIO_SERIE + timedelta(days=n)))
+                      for n in range(dias))
+
+
+def _obligaciones(n: int, semilla: int = 42):
+    """Genera `n` filas deterministas como las de un CSV de obligaciones."""
+    azar = random.Random(semilla)
+    base = date(2015, 1, 1).toordinal()
+    for k in range(n):
+        venc = base + azar.randrange(3000)
+        yield {
+            "id": str(k),
+            "TO": f"{azar.uniform(100, 100000):.2f}",
+            "fecha_inicio": date.fromordinal(venc).isoformat(),
+            "fecha_fin": date.fromordinal(venc + azar.randrange(1, 1500)).isoformat(),
+            "tasa": f"{azar.choice((3.5, 4, 6, 12)):g}",
+            "dias": str(azar.randrange(1, 1500)),
+            "porcentaje": f"{azar.choice((0, 10, 20, 100)):g}",
+        }
+
+
+# --- Grupos de benchmarks --------------------------------------------------------
+@grupo("calcular")
+def bench_calcular(args) -> Dict[str, float]:
+    """Latencia de un `CalculadoraDeuda.calcular()` (y de `MotorDeuda`) con UFV locales y por HTTP."""
+    api = _serie_sintetica()
+    params = dict(TO=1500.0, fecha_inicio="2023-03-15", fecha_fin="2024-11-30", tasa=6.0, dias=626,
+                  porcentaje=20.0)
+    resultados = _latencias("calcular_local", _cronometrar(
+        lambda: CalculadoraDeuda(**params, api=api).calcular(), args.repeticiones))
+    resultados.update(_latencias("calcular_local_exacto", _cronometrar(
+        lambda: CalculadoraDeuda(**params, api=api, exacto=True).calcular(), args.repeticiones)))
+    motor = MotorDeuda(api=api)
+    resultados.update(_latencias("motor_local", _cronometrar(
+        lambda: motor.calcular(**params), args.repeticiones)))
+
+    with ServidorUFV() as servidor:
+        http = BCBAPIUFV()
+        http.BASE_URL = servidor.url
+        resultados.update(_latencias("calcular_http", _cronometrar(
+            lambda: CalculadoraDeuda(**params, api=http).calcular(), max(args.repeticiones // 10, 10))))
+        http.cerrar()
+    return resultados
+
+
+@grupo("lote")
+def bench_lote(args) -> Dict[str, float]:
+    """Rendimiento por lotes: flujo fila a fila (`procesar_filas`) y vectorizado (`calcular_lote`)."""
+    api = _serie_sintetica()
+    resultados = {}
+    for n in args.tamanos:
+        t0 = time.perf_counter()
+        deque(procesar_filas(_obligaciones(n), api=api, tamano_bloque=1000), maxlen=0)
+        resultados[f"procesar_filas_{n}_por_s"] = n / (time.perf_counter() - t0)
+
+        columnas = {c: [] for c in ("TO", "fecha_inicio", "fecha_fin", "tasa", "dias", "porcentaje")}
+        for fila in _obligaciones(n):
+            for c, valores in columnas.items():
+                valores.append(fila[c] if c.startswith("fecha") else float(fila[c]))
+        if np is not None:
+            t0 = time.perf_counter()
+            calcular_lote(**columnas, api=api)
+            resultados[f"calcular_lote_{n}_por_s"] = n / (time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            calcular_lote(**columnas, api=api, exacto=True)
+            resultados[f"calcular_lote_exacto_{n}_por_s"] = n / (time.perf_counter() - t0)
+        del columnas
+        gc.collect()
+    return resultados
+
+
+@grupo("parse")
+def bench_parse(args) -> Dict[str, float]:
+    """Lectura de payloads UFV grandes: `_parse_valor` fila a fila y `_parse_payload` en bloque."""
+    api = BCBAPIUFV()
+    resultados = {}
+    for n in (1000, 100000):
+        payload = [{"fecha": (INICIO_SERIE + timedelta(days=k % 6000)).isoformat(),
+                    "valor": f"{2 + k * 1e-5:.5f}".replace(".", ",")} for k in range(n)]
+        repeticiones = max(args.repeticiones // 100, 3)
+        por_fila = _cronometrar(lambda: [api._parse_valor(item) for item in payload], repeticiones, 1)
+        en_bloque = _cronometrar(lambda: api._parse_payload(payload), repeticiones, 1)
+        resultados[f"parse_valor_{n}_por_s"] = n / _percentil(por_fila, 50)
+        resultados[f"parse_payload_{n}_por_s"] = n / _percentil(en_bloque, 50)
+    return resultados
+
+
+@grupo("cache")
+def bench_cache(args) -> Dict[str, float]:
+    """Caminos de fallo y acierto del caché UFV contra un servidor falso local."""
+    fechas = [(date(2022, 1, 1) + timedelta(days=k)).isoformat() for k in range(365)]
+    resultados = {}
+    with ServidorUFV() as servidor, tempfile.TemporaryDirectory() as tmp:
+        cache = CacheUFV(os.path.join(tmp, "ufv.sqlite3"))
+        api = BCBAPIUFV(cache=cache)
+        api.BASE_URL = servidor.url
+
+        t0 = time.perf_counter()
+        api.valores_en(fechas)
+        resultados["cache_disco_fallo_365_ms"] = (time.perf_counter() - t0) * 1000
+        consultas = servidor.consultas
+        resultados.update(_latencias("cache_disco_acierto_365", _cronometrar(
+            lambda: api.valores_en(fechas), max(args.repeticiones // 10, 10))))
+        resultados.update(_latencias("cache_disco_acierto_1", _cronometrar(
+            lambda: api.valor_en("2022-06-15"), args.repeticiones)))
+
+        cadena = crear_cadena(origen=api)
+        cadena.valores_en(fechas)
+        resultados.update(_latencias("cache_memoria_acierto_365", _cronometrar(
+            lambda: cadena.valores_en(fechas), max(args.repeticiones // 10, 10))))
+        if servidor.consultas != consultas:
+            raise RuntimeError("El camino de acierto consultó al servidor UFV.")
+        api.cerrar()
+        cache.cerrar()
+    return resultados
+
+
+@grupo("importacion")
+def bench_importacion(args) -> Dict[str, float]:
+    """Tiempo de arranque: ``import impuestos_package`` y primer cálculo offline en un intérprete nuevo."""
+    codigos = {
+        "importar": "import impuestos_package",
+        "calcular_offline": (
+            "from impuestos_package import CalculadoraDeuda\n"
+            "from impuestos_package.ufv_local import UFVArchivo\n"
+            "api = UFVArchivo([('2024-01-01', 2.0), ('2024-02-01', 2.1)])\n"
+            "CalculadoraDeuda(1000.0, '2024-01-01', '2024-02-01', 12.0, 30, 10.0, api=api).calcular()"
+        ),
+    }
+    base = _cronometrar(lambda: subprocess.run([sys.executable, "-c", "pass"], check=True), 10, 1)
+    resultados = {}
+    for nombre, codigo in codigos.items():
+        tiempos = _cronometrar(lambda: subprocess.run([sys.executable, "-c", codigo], check=True), 10, 1)
+        # Se descuenta el arranque del intérprete vacío
+        resultados[f"importacion_{nombre}_ms"] = (_percentil(tiempos, 50) - _percentil(base, 50)) * 1000
+    return resultados
+
+
+class _NodoConDict:
+    """`Nodo` tal como era antes de ``__slots__``, como referencia de memoria."""
+
+    def __init__(self, valor):
+        self.valor = valor
+        self.izq = None
+        self.der = None
+
+
+def _bytes_por_elemento(crear: Callable[[int], object], n: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        antes = tracemalloc.get_traced_memory()[0]
+        elementos = [crear(k) for k in range(n)]
+        despues = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del elementos
+    return (despues - antes) / n
+
+
+@grupo("memoria")
+def bench_memoria(args) -> Dict[str, float]:
+    """Bytes por obligación retenida: resultados dict vs `ResultadoDeuda`, nodos con y sin ``__slots__``."""
+    api = _serie_sintetica()
+    n = min(args.tamanos[-1], 100000)
+    params = dict(fecha_inicio="2023-03-15", fecha_fin="2024-11-30", tasa=6.0, dias=626, porcentaje=20.0)
+
+    def calculadora(k):
+        return CalculadoraDeuda(TO=1000.0 + k, **params, api=api, capacidad_historial=0)
+
+    return {
+        "memoria_resultado_dict_bytes": _bytes_por_elemento(lambda k: calculadora(k).calcular(), n),
+        "memoria_resultado_compacto_bytes": _bytes_por_elemento(
+            lambda k: calculadora(k).calcular(compacto=True), n),
+        "memoria_nodo_con_dict_bytes": _bytes_por_elemento(_NodoConDict, n),
+        "memoria_nodo_slots_bytes": _bytes_por_elemento(Nodo, n),
+    }
+
+
+# --- Comparación y salida -------------------------------------------------------------
+def _comparar(actual: Dict[str, float], anterior: Dict[str, float], tolerancia: float) -> List[str]:
+    """Imprime la variación de cada métrica común y devuelve las que empeoraron."""
+    regresiones = []
+    for clave in sorted(set(actual) & set(anterior)):
+        if not anterior[clave]:
+            continue
+        cambio = actual[clave] / anterior[clave] - 1
+        peor = cambio > tolerancia if clave.endswith(("_ms", "_bytes")) else cambio < -tolerancia
+        marca = "  << REGRESIÓN" if peor else ""
+        print(f"  {clave:45s} {anterior[clave]:14.3f} -> {actual[clave]:14.3f} ({cambio:+.1%}){marca}")
+        if peor:
+            regresiones.append(clave)
+    return regresiones
+
+
+def _version() -> str:
+    try:
+        from importlib.metadata import version
+        return version("impuestos-package")
+    except Exception:
+        return "desarrollo"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de impuestos_package.")
+    parser.add_argument("grupos", nargs="*", help=f"Grupos a correr: {', '.join(GRUPOS)} (todos por defecto).")
+    parser.add_argument("--tamanos", default="1000,100000,1000000", help="Tamaños de lote, separados por coma.")
+    parser.add_argument("--repeticiones", type=int, default=2000, help="Repeticiones de las mediciones de latencia.")
+    parser.add_argument("--rapido", action="store_true", help="Tamaños y repeticiones reducidos.")
+    parser.add_argument("--salida", help="Archivo JSON de resultados.")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior para detectar regresiones.")
+    parser.add_argument("--tolerancia", type=float, default=0.10, help="Empeoramiento tolerado (0.10 = 10%%).")
+    args = parser.parse_args(argv)
+    desconocidos = [g for g in args.grupos if g not in GRUPOS]
+    if desconocidos:
+        parser.error(f"grupos desconocidos: {', '.join(desconocidos)}")
+    args.tamanos = [1000, 10000] if args.rapido else [int(t) for t in args.tamanos.split(",")]
+    if args.rapido:
+        args.repeticiones = min(args.repeticiones, 200)
+
+    metricas: Dict[str, float] = {}
+    for nombre in args.grupos or list(GRUPOS):
+        print(f"[{nombre}] {GRUPOS[nombre].__doc__}", flush=True)
+        for clave, valor in GRUPOS[nombre](args).items():
+            print(f"  {clave:45s} {valor:14.3f}")
+            metricas[clave] = valor
+
+    version = _version()
+    informe = {
+        "version": version,
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+        "metricas": metricas,
+    }
+    salida = args.salida or os.path.join(DIRECTORIO, "resultados", f"{version}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+    with open(salida, "w", encoding="utf-8") as f:
+        json.dump(informe, f, indent=2, ensure_ascii=False)
+    print(f"Resultados guardados en {salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            anterior = json.load(f)
+        print(f"Comparación con {args.comparar} (versión {anterior.get('version')}):")
+        regresiones = _comparar(metricas, anterior["metricas"], args.tolerancia)
+        if regresiones:
+            print(f"{len(regresiones)} métricas empeoraron más de {args.tolerancia:.0%}.")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Servidor HTTP local que imita el endpoint UFV del BCB, para los benchmarks.
+
+Responde cualquier rango ``cFecIni``/``cFecFin`` con una fila por día
+(``{"fecha": ..., "valor": "2,12345"}``) y valores deterministas, de modo
+que los resultados se pueden comparar entre corridas. Cuenta las consultas
+recibidas para verificar cuántas llegaron realmente a la "red".
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def valor_ufv(dia: date) -> float:
+    """Serie sintética creciente: ~2.0 en 2010, +0.0001 por día."""
+    return round(2.0 + (dia.toordinal() - date(2010, 1, 1).toordinal()) * 0.0001, 5)
+
+
+class ServidorUFV:
+    def __init__(self, latencia: float = 0.0) -> None:
+        self.latencia = latencia
+        self.consultas = 0
+        self._candado = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._hilo = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}/ufv.php"
+
+    def _handler(self):
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                q = parse_qs(urlparse(self.path).query)
+                ini = date.fromisoformat(q["cFecIni"][0])
+                fin = date.fromisoformat(q["cFecFin"][0])
+                with servidor._candado:
+                    servidor.consultas += 1
+                if servidor.latencia:
+                    threading.Event().wait(servidor.latencia)
+                filas = []
+                dia = ini
+                while dia <= fin:
+                    filas.append({"fecha": dia.isoformat(), "valor": f"{valor_ufv(dia):.5f}".replace(".", ",")})
+                    dia += timedelta(days=1)
+                cuerpo = json.dumps(filas).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self) -> "ServidorUFV":
+        self._hilo.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
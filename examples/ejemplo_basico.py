@@ -8,18 +8,10 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from impuestos_package.calculadora import CalculadoraDeuda
+from impuestos_package.ufv_local import UFVArchivo
 
-# --- DummyAPI con las UFV reales 2025-06-23 → 2025-11-10 ---
-class DummyAPI:
-    def _parse_valor(self, item):
-        return float(item["valor"]) if float(item["valor"]) > 0 else None
-
-    def consumir_endpoint(self, fi, ff, timeout=10):
-        # UFV reales de las fechas solicitadas
-        return [{"valor": "2.73596"}, {"valor": "2.96361"}]
-
-import impuestos_package.calculadora as calc_mod
-calc_mod.BCBAPIUFV = DummyAPI
+# --- UFV reales 2025-06-23 → 2025-11-10, sin consultar la red ---
+ufv_local = UFVArchivo([("2025-06-23", 2.73596), ("2025-11-10", 2.96361)])
 # -------------------------------------------------------------
 
 def main():
@@ -38,7 +30,8 @@ def main():
         fecha_fin=fecha_fin,
         tasa=tasa,
         dias=dias,
-        porcentaje=porcentaje
+        porcentaje=porcentaje,
+        api=ufv_local
     )
 
     # Ejecutar cálculo
@@ -6,28 +6,14 @@ cuando la API del BCB no está disponible.
 """
 
 # ============================================================
-# 🔹 Simular API UFV (modo offline sin conexión)
-# ============================================================
-
-from impuestos_package import calculadora as calc_mod
-
-class DummyAPI:
-    """Simula los valores UFV del BCB para entornos offline."""
-    def _parse_valor(self, item):
-        return float(item["valor"])
-
-    def consumir_endpoint(self, fi, ff, timeout=10):
-        # UFVs simuladas para 2025-06-23 → 2025-11-10
-        return [{"valor": "2.73596"}, {"valor": "2.96361"}]
-
-# Sobrescribe la API real del paquete por la simulada
-calc_mod.BCBAPIUFV = DummyAPI
-
-# ============================================================
-# 🔹 Importar la clase principal
+# 🔹 UFV locales (modo offline sin conexión)
 # ============================================================
 
 from impuestos_package.calculadora import CalculadoraDeuda
+from impuestos_package.ufv_local import UFVArchivo
+
+# UFVs para 2025-06-23 → 2025-11-10; se inyectan con `api=`
+ufv_local = UFVArchivo([("2025-06-23", 2.73596), ("2025-11-10", 2.96361)])
 
 # ============================================================
 # 🔹 Crear una instancia de la calculadora
@@ -39,7 +25,8 @@ calc = CalculadoraDeuda(
     fecha_fin="2025-11-10",     # Fecha final
     tasa=6,                     # Tasa de interés anual
     dias=140,                   # Días de mora
-    porcentaje=12               # Sanción en %
+    porcentaje=12,              # Sanción en %
+    api=ufv_local               # UFV locales en lugar de la API del BCB
 )
 
 # ============================================================
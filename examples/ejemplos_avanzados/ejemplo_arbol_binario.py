@@ -1,20 +1,9 @@
 from impuestos_package.calculadora import CalculadoraDeuda
 
-# --- DummyAPI con las UFV reales 2025-01-01 → 2025-06-01 y 2025-06-01 → 2025-11-10 ---
-class DummyAPI:
-    def _parse_valor(self, item):
-        return float(item["valor"]) if float(item["valor"]) > 0 else None
-
-    def consumir_endpoint(self, fi, ff, timeout=10):
-        # UFV simulados para las fechas solicitadas
-        if fi == "2025-01-01" and ff == "2025-06-01":
-            return [{"valor": "2.73596"}, {"valor": "2.96361"}]
-        elif fi == "2025-06-01" and ff == "2025-11-10":
-            return [{"valor": "2.96361"}, {"valor": "3.04512"}]
-        return [{"valor": "2.73596"}, {"valor": "2.96361"}]  # Default if not specified
-
-import impuestos_package.calculadora as calc_mod
-calc_mod.BCBAPIUFV = DummyAPI
+from impuestos_package.ufv_local import UFVArchivo
+
+# --- UFV reales 2025-01-01, 2025-06-01 y 2025-11-10, sin consultar la red ---
+ufv_local = UFVArchivo([("2025-01-01", 2.73596), ("2025-06-01", 2.96361), ("2025-11-10", 3.04512)])
 # -------------------------------------------------------------
 
 # Nodo para el árbol binario
@@ -70,7 +59,8 @@ class ArbolDeuda:
             fecha_fin=nodo.valor['fecha_fin'],
             tasa=nodo.valor['tasa'],
             dias=nodo.valor['dias'],
-            porcentaje=nodo.valor['porcentaje']
+            porcentaje=nodo.valor['porcentaje'],
+            api=ufv_local
         )
         # Ejecutar cálculo
         resultado = calc.calcular()
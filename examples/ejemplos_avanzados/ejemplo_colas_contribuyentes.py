@@ -1,20 +1,10 @@
 from datetime import datetime
 
-# --- DummyAPI con las UFV reales 2025-01-01 → 2025-06-01 y 2025-06-01 → 2025-11-10 ---
-class DummyAPI:
-    def _parse_valor(self, item):
-        return float(item["valor"]) if float(item["valor"]) > 0 else None
-
-    def consumir_endpoint(self, fi, ff, timeout=10):
-        # UFV simulados para las fechas solicitadas
-        if fi == "2025-01-01" and ff == "2025-06-01":
-            return [{"valor": "2.73596"}, {"valor": "2.96361"}]
-        elif fi == "2025-06-01" and ff == "2025-11-10":
-            return [{"valor": "2.96361"}, {"valor": "3.04512"}]
-        return [{"valor": "2.73596"}, {"valor": "2.96361"}]  # Default if not specified
-
-import impuestos_package.calculadora as calc_mod
-calc_mod.BCBAPIUFV = DummyAPI
+from impuestos_package.calculadora import CalculadoraDeuda
+from impuestos_package.ufv_local import UFVArchivo
+
+# --- UFV reales 2025-01-01, 2025-06-01 y 2025-11-10, sin consultar la red ---
+ufv_local = UFVArchivo([("2025-01-01", 2.73596), ("2025-06-01", 2.96361), ("2025-11-10", 3.04512)])
 # -------------------------------------------------------------
 
 # --- Estructuras de Datos ---
@@ -127,7 +117,8 @@ class ArbolDeuda:
             fecha_fin=nodo.contribuyente['fecha_fin'],
             tasa=nodo.contribuyente['tasa'],
             dias=nodo.contribuyente['dias'],
-            porcentaje=nodo.contribuyente['porcentaje']
+            porcentaje=nodo.contribuyente['porcentaje'],
+            api=ufv_local
         )
         
         # Realizar el cálculo
@@ -157,24 +148,6 @@ class ArbolDeuda:
                 if nodo.der:
                     self.mostrar_arbol(nodo.der, prefijo + ("    " if es_izquierdo else "│   "), False)
 
-# --- CalculadoraDeuda --- (Ejemplo básico)
-class CalculadoraDeuda:
-    def __init__(self, TO, fecha_inicio, fecha_fin, tasa, dias, porcentaje):
-        self.TO = TO
-        self.fecha_inicio = fecha_inicio
-        self.fecha_fin = fecha_fin
-        self.tasa = tasa
-        self.dias = dias
-        self.porcentaje = porcentaje
-
-    def calcular(self):
-        # Cálculos básicos de deuda tributaria
-        mv = self.TO * 0.05  # Mantenimiento de Valor (simulado)
-        i = self.TO * 0.03  # Interés (simulado)
-        s = self.TO * 0.1   # Sanción (simulado)
-        dt = self.TO + mv + i + s  # Deuda Total
-        return {"TO": self.TO, "MV": mv, "I": i, "S": s, "DT": dt}
-
 # --- Función principal para realizar los cálculos ---
 def main():
     # Lista de contribuyentes con sus datos personalizados
@@ -191,7 +164,8 @@ def main():
         fecha_fin="2025-06-01",
         tasa=6,
         dias=180,
-        porcentaje=15
+        porcentaje=15,
+        api=ufv_local
     )
 
     # Crear una cola para almacenar las tareas
@@ -1,9 +1,31 @@
 # src/impuestos_package/__init__.py
-from .calculadora import CalculadoraDeuda
-from .mv import MantenimientoValor
-from .interes import Interes
-from .sancion import Sancion
-from .ufv import BCBAPIUFV
+"""
+Los nombres públicos se importan recién al usarlos (PEP 562), así que
+``import impuestos_package`` no carga la pila HTTP (requests/urllib3) ni
+asyncio; eso ocurre sólo cuando se usa un proveedor de UFV por red.
+"""
+
+from importlib import import_module
+
+_EXPORTADOS = {
+    "CalculadoraDeuda": ".calculadora",
+    "MantenimientoValor": ".mv",
+    "Interes": ".interes",
+    "Sancion": ".sancion",
+    "BCBAPIUFV": ".ufv",
+}
 
 __all__ = ["CalculadoraDeuda", "MantenimientoValor", "Interes", "Sancion", "BCBAPIUFV"]
 
+
+def __getattr__(nombre):
+    modulo = _EXPORTADOS.get(nombre)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    valor = getattr(import_module(modulo, __name__), nombre)
+    globals()[nombre] = valor  # las siguientes consultas no pasan por __getattr__
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
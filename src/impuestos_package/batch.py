@@ -0,0 +1,203 @@
+"""
+Procesamiento en flujo de archivos de obligaciones tributarias.
+
+Lee el archivo de entrada fila por fila, calcula MV, I, S y DT por bloques
+(con una sola resolución de UFV por fecha distinta en cada bloque) y escribe
+cada bloque apenas termina, de modo que la memoria usada no depende del
+tamaño del archivo.
+
+Formato de entrada: CSV con encabezado y, al menos, las columnas
+TO, fecha_inicio, fecha_fin, tasa, dias y porcentaje. Las demás columnas
+(NIT, nombre, ...) se copian tal cual a la salida.
+"""
+
+from __future__ import annotations
+
+import csv
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from .calculadora import CAMPOS_CALCULO
+from .lote import _calcular_arreglos, np
+from .motor import MotorDeuda
+from .ufv import BCBAPIUFV, UFVFetchError, _resolver_ufvs
+
+COLUMNAS_RESULTADO = ("MV", "I", "S", "DT", "error")
+
+
+def leer_filas(ruta: str, delimitador: str = ",") -> Iterator[Dict[str, str]]:
+    """Itera las filas del CSV de forma perezosa."""
+    with open(ruta, newline="", encoding="utf-8") as f:
+        yield from csv.DictReader(f, delimiter=delimitador)
+
+
+def bloques(filas: Iterable[Dict], tamano: int) -> Iterator[List[Dict]]:
+    """Agrupa un iterable de filas en listas de hasta `tamano` elementos."""
+    it = iter(filas)
+    while True:
+        bloque = list(islice(it, tamano))
+        if not bloque:
+            return
+        yield bloque
+
+
+def _fecha_iso(valor) -> str:
+    """Normaliza una fecha de la fila a AAAA-MM-DD; ValueError si no es válida."""
+    try:
+        return date.fromisoformat(str(valor).strip()).isoformat()
+    except ValueError:
+        raise ValueError(f"Fecha inválida: {valor!r} (se espera AAAA-MM-DD).") from None
+
+
+def _ufvs_del_bloque(api, bloque: List[Dict]) -> Dict[str, float]:
+    """
+    UFV de las fechas del bloque, indexadas por la fecha tal como viene en la
+    fila: cada texto distinto se normaliza una sola vez. Si la consulta
+    conjunta falla, las fechas se resuelven una por una.
+    """
+    iso = {}
+    for cruda in {fila.get(campo) for fila in bloque for campo in ("fecha_inicio", "fecha_fin")}:
+        try:
+            iso[cruda] = _fecha_iso(cruda)
+        except ValueError:
+            pass  # la fila se reporta con error en `_leer_fila`
+    fechas = sorted(set(iso.values()))
+    try:
+        valores = _resolver_ufvs(api, fechas)
+    except UFVFetchError:
+        valores = {}
+        for f in fechas:
+            try:
+                valores.update(_resolver_ufvs(api, [f]))
+            except UFVFetchError:
+                pass  # las filas con esta fecha se reportan con error
+    return {cruda: valores[f] for cruda, f in iso.items() if f in valores}
+
+
+def _leer_fila(fila: Dict, ufvs: Dict[str, float]) -> Tuple[float, float, float, float, int, float]:
+    """``(TO, ufv_venc, ufv_pago, tasa, dias, porcentaje)`` de una fila; lanza el error que se reporta."""
+    TO = float(fila["TO"])
+    ufv_venc, ufv_pago = ufvs.get(fila["fecha_inicio"]), ufvs.get(fila["fecha_fin"])
+    if ufv_venc is None or ufv_pago is None:
+        for campo in ("fecha_inicio", "fecha_fin"):
+            _fecha_iso(fila[campo])  # una fecha mal escrita se informa como tal
+        raise UFVFetchError("No se pudieron obtener los valores de UFV correctamente.")
+    tasa, dias, porcentaje = float(fila["tasa"]), int(fila["dias"]), float(fila["porcentaje"])
+    if TO < 0 or tasa < 0 or dias < 0 or porcentaje < 0:
+        raise ValueError("Los parámetros no pueden ser negativos.")
+    return TO, ufv_venc, ufv_pago, tasa, dias, porcentaje
+
+
+def _con_error(salida: Dict, error: Exception) -> None:
+    salida.update(MV="", I="", S="", DT="", error=str(error) or type(error).__name__)
+
+
+def _calcular_filas(api, bloque: List[Dict], ufvs: Dict[str, float]) -> List[Dict]:
+    """
+    Calcula las filas de un bloque con las UFV ya resueltas; los errores quedan
+    en la columna `error`.
+
+    Las filas válidas se evalúan juntas con las fórmulas de `calcular_lote`
+    si NumPy está instalado, o con `MotorDeuda.calcular_con_ufvs`; en ambos
+    casos sin crear un objeto por cálculo.
+    """
+    salidas = [dict(fila) for fila in bloque]
+    validas, columnas = [], []
+    for n, fila in enumerate(bloque):
+        try:
+            columnas.append(_leer_fila(fila, ufvs))
+            validas.append(n)
+        except (KeyError, TypeError, ValueError, UFVFetchError) as e:
+            # TypeError: fila con menos campos que el encabezado (valores None)
+            _con_error(salidas[n], e)
+    if not validas:
+        return salidas
+
+    if np is None:
+        motor = MotorDeuda(api)
+        for n, valores in zip(validas, columnas):
+            try:
+                r = motor.calcular_con_ufvs(*valores)
+            except ValueError as e:
+                _con_error(salidas[n], e)
+            else:
+                salidas[n].update(MV=r.MV, I=r.I, S=r.S, DT=r.DT, error="")
+        return salidas
+
+    res = _calcular_arreglos(*np.array(columnas, dtype=np.float64).T)
+    rechazadas = set(res["errores"].tolist())
+    filas = zip(validas, res["MV"].tolist(), res["I"].tolist(), res["S"].tolist(), res["DT"].tolist())
+    for k, (n, mv, i, s, dt) in enumerate(filas):
+        if k in rechazadas:  # UFV en baja, como en MotorDeuda
+            _con_error(salidas[n], ValueError("Ningún valor puede ser negativo."))
+        else:
+            salidas[n].update(MV=mv, I=i, S=s, DT=dt, error="")
+    return salidas
+
+
+def _calcular_bloque(api, bloque: List[Dict], latencias=None) -> List[Dict]:
+    inicio = time.perf_counter()
+    resultado = _calcular_filas(api, bloque, _ufvs_del_bloque(api, bloque))
+    if latencias is not None:
+        # El bloque se calcula de una vez: su costo se reparte entre sus filas
+        costo = (time.perf_counter() - inicio) / len(bloque)
+        latencias.extend([costo] * len(bloque))
+    return resultado
+
+
+def procesar_filas(filas: Iterable[Dict], api=None, tamano_bloque: int = 1000, workers: int = 1,
+                   latencias=None) -> Iterator[Dict]:
+    """
+    Genera las filas de resultado en el mismo orden de entrada.
+
+    Con `workers` > 1 varios bloques se calculan a la vez (útil mientras se
+    esperan UFV de la red), manteniendo como máximo ``2 * workers`` bloques
+    en memoria. Si se pasa `latencias` (una lista o ``array('d')``), se
+    agrega la latencia en segundos de cada fila.
+    """
+    api = api if api is not None else BCBAPIUFV()
+    if workers <= 1:
+        for bloque in bloques(filas, tamano_bloque):
+            yield from _calcular_bloque(api, bloque, latencias)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        pendientes = deque()
+        for bloque in bloques(filas, tamano_bloque):
+            pendientes.append(ex.submit(_calcular_bloque, api, bloque, latencias))
+            if len(pendientes) >= 2 * workers:
+                yield from pendientes.popleft().result()
+        while pendientes:
+            yield from pendientes.popleft().result()
+
+
+def procesar_archivo(entrada: str, salida: str, api=None, tamano_bloque: int = 1000,
+                     delimitador: str = ",", workers: int = 1, latencias=None) -> Dict[str, int]:
+    """
+    Procesa `entrada` y escribe el CSV de resultados en `salida`, bloque por bloque.
+
+    Las columnas se validan con el encabezado, antes de calcular o de abrir
+    `salida`. Devuelve un resumen con la cantidad de filas procesadas y con error.
+    """
+    resumen = {"filas": 0, "errores": 0}
+    with open(entrada, newline="", encoding="utf-8") as f_entrada:
+        lector = csv.DictReader(f_entrada, delimiter=delimitador)
+        columnas = [c for c in lector.fieldnames or () if c not in COLUMNAS_RESULTADO]
+        faltantes = [c for c in CAMPOS_CALCULO if c not in columnas]
+        if faltantes:
+            raise ValueError(f"Faltan columnas en el archivo de entrada: {', '.join(faltantes)}")
+        with open(salida, "w", newline="", encoding="utf-8") as f:
+            escritor = csv.DictWriter(f, fieldnames=columnas + list(COLUMNAS_RESULTADO),
+                                      delimiter=delimitador)
+            escritor.writeheader()
+            for bloque in bloques(procesar_filas(lector, api, tamano_bloque, workers, latencias),
+                                  tamano_bloque):
+                escritor.writerows(bloque)
+                f.flush()
+                resumen["filas"] += len(bloque)
+                resumen["errores"] += sum(1 for fila in bloque if fila["error"])
+    return resumen
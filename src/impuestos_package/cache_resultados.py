@@ -0,0 +1,99 @@
+"""
+Caché de resultados de `CalculadoraDeuda` (memoización).
+
+En un servicio, los mismos parámetros (TO, fechas, tasa, días, porcentaje)
+se piden una y otra vez, por ejemplo cada vez que el contribuyente refresca
+la pantalla de su deuda. `CacheResultados` guarda los resultados ya
+calculados para no repetir la consulta de UFV ni las fórmulas.
+
+- La clave son los parámetros normalizados (``1000``, ``1000.0`` y
+  ``Decimal("1000.00")`` son la misma clave), el modo exacto, la política
+  de redondeo y la versión de la serie UFV del proveedor (atributo
+  ``version``, si lo tiene). Al cambiar de instantánea UFV, los resultados
+  anteriores dejan de coincidir.
+- Acotada a `capacidad` resultados, con desalojo LRU.
+- Los resultados cuya fecha de pago es hoy o posterior dependen de una UFV
+  que el BCB puede no haber publicado todavía: expiran a los `ttl_hoy`
+  segundos. Los demás no expiran.
+
+Uso:
+    cache = CacheResultados(capacidad=50000)
+    CalculadoraDeuda(..., api=api, cache_resultados=cache).calcular()
+    cache.estadisticas()
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, Hashable, Optional, Tuple
+
+from . import metricas
+from .motor import ResultadoDeuda
+from .redondeo import REDONDEO_POR_DEFECTO, a_decimal
+
+
+class CacheResultados:
+    def __init__(self, capacidad: int = 10000, ttl_hoy: float = 300.0) -> None:
+        self.capacidad = capacidad
+        self.ttl_hoy = ttl_hoy
+        self.aciertos = 0
+        self.fallos = 0
+        self._datos: "OrderedDict[Hashable, Tuple[ResultadoDeuda, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def clave(parametros: Dict, version=None) -> Tuple:
+        """Clave normalizada a partir de los parámetros de un cálculo."""
+        return (
+            a_decimal(parametros["TO"]).normalize(),
+            str(parametros["fecha_inicio"])[:10],
+            str(parametros["fecha_fin"])[:10],
+            a_decimal(parametros["tasa"]).normalize(),
+            int(parametros["dias"]),
+            a_decimal(parametros["porcentaje"]).normalize(),
+            bool(parametros.get("exacto", False)),
+            parametros.get("redondeo", REDONDEO_POR_DEFECTO),
+            version,
+        )
+
+    def obtener(self, clave: Tuple) -> Optional[ResultadoDeuda]:
+        """El resultado guardado para `clave`, o None si no está o venció."""
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is not None and entrada[1] is not None and entrada[1] <= time.monotonic():
+                del self._datos[clave]
+                entrada = None
+            if entrada is None:
+                self.fallos += 1
+            else:
+                self._datos.move_to_end(clave)
+                self.aciertos += 1
+        metricas.contar("cache.resultados.aciertos" if entrada is not None else "cache.resultados.fallos")
+        return entrada[0] if entrada is not None else None
+
+    def guardar(self, clave: Tuple, resultado: ResultadoDeuda) -> None:
+        # Posiciones 1 y 2 de la clave: fecha de vencimiento y de pago
+        vence = time.monotonic() + self.ttl_hoy if max(clave[1], clave[2]) >= date.today().isoformat() else None
+        with self._lock:
+            self._datos[clave] = (resultado, vence)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.capacidad:
+                self._datos.popitem(last=False)
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._datos.clear()
+
+    def tasa_aciertos(self) -> float:
+        total = self.aciertos + self.fallos
+        return self.aciertos / total if total else 0.0
+
+    def estadisticas(self) -> Dict[str, float]:
+        return {"aciertos": self.aciertos, "fallos": self.fallos, "tasa_aciertos": self.tasa_aciertos(),
+                "tamano": len(self), "capacidad": self.capacidad}
+
+    def __len__(self):
+        return len(self._datos)
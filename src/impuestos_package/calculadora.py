@@ -1,42 +1,126 @@
 import logging
+import os
+import threading
+import weakref
 from datetime import datetime  # Importamos datetime para trabajar con fechas
+from typing import Any, NamedTuple, Optional
 from .mv import MantenimientoValor
 from .interes import Interes
 from .sancion import Sancion
+from . import metricas
+from .redondeo import REDONDEO_POR_DEFECTO, a_decimal, redondear
 from .ufv import BCBAPIUFV, UFVFetchError
-from .estructuras import Pila, Cola, ArbolDeuda, Nodo
+from .estructuras import Pila, Cola, ColaPrioridad, ArbolDeuda, Nodo
+from .motor import ResultadoDeuda
 
 logger = logging.getLogger(__name__)
 
+CAMPOS_CALCULO = ("TO", "fecha_inicio", "fecha_fin", "tasa", "dias", "porcentaje")
+CAPACIDAD_HISTORIAL = 100
+
+
+# Cliente BCB que comparten las calculadoras creadas sin `api`: una sola sesión
+# keep-alive por proceso en lugar de una (con su handshake TLS) por cálculo.
+_cliente_compartido = None
+_cliente_pid = None
+_lock_cliente = threading.Lock()
+
+
+def _cliente_por_defecto():
+    global _cliente_compartido, _cliente_pid
+    with _lock_cliente:
+        # Se recrea en un proceso hijo (la sesión no se hereda) o si `BCBAPIUFV`
+        # fue reemplazado, p. ej. en pruebas
+        if type(_cliente_compartido) is not BCBAPIUFV or _cliente_pid != os.getpid():
+            _cliente_compartido, _cliente_pid = BCBAPIUFV(), os.getpid()
+        return _cliente_compartido
+
+
+# Cliente asíncrono por defecto, uno por event loop: así los cálculos que
+# comparten un loop también comparten su límite de concurrencia y la unión
+# de consultas en curso.
+_clientes_async = weakref.WeakKeyDictionary()
+
+
+def _cliente_async_por_defecto():
+    """`AsyncBCBAPIUFV` compartido del event loop actual; None si falta httpx."""
+    import asyncio
+
+    from . import ufv_async  # httpx sólo si se usa el cliente asíncrono por defecto
+
+    if ufv_async.httpx is None:
+        return None
+    loop = asyncio.get_running_loop()
+    cliente = _clientes_async.get(loop)
+    if cliente is None:
+        cliente = _clientes_async[loop] = ufv_async.AsyncBCBAPIUFV()
+    return cliente
+
+
+class PasoHistorial(NamedTuple):
+    """Un paso del historial de cálculo; el texto se arma recién al mostrarlo."""
+    tipo: str       # "Inicio", "Resultado" o "Final"
+    concepto: str   # "TO", "MV", "I", "S" o "DT"
+    valor: Any
+    fecha: str
+
+    def __str__(self):
+        if self.tipo == "Inicio":
+            return f"[Inicio] Cálculo inicializado con TO={self.valor} en {self.fecha}"
+        if self.tipo == "Final":
+            return f"[Final] Deuda Total (DT) = {self.valor} en {self.fecha}"
+        return f"[{self.tipo}] {self.concepto} = {self.valor} en {self.fecha}"
+
+
 class CalculadoraDeuda:
-    def __init__(self, TO: float, fecha_inicio: str, fecha_fin: str, tasa: float, dias: int, porcentaje: float):
+    def __init__(self, TO: float, fecha_inicio: str, fecha_fin: str, tasa: float, dias: int, porcentaje: float,
+                 api=None, exacto: bool = False, redondeo: str = REDONDEO_POR_DEFECTO,
+                 capacidad_historial: Optional[int] = CAPACIDAD_HISTORIAL, cache_resultados=None,
+                 cola_prioridad: bool = False):
         self.TO = TO
         self.fecha_inicio = fecha_inicio
         self.fecha_fin = fecha_fin
         self.tasa = tasa
         self.dias = dias
         self.porcentaje = porcentaje
+        # Cliente UFV compartible entre calculadoras (p. ej. con caché en disco)
+        self.api = api
+        # Modo exacto: MV, I, S y DT como Decimal redondeados con `redondeo`
+        self.exacto = exacto
+        self.redondeo = redondeo
+        # `CacheResultados` opcional, compartible entre calculadoras
+        self.cache_resultados = cache_resultados
 
         # Validaciones básicas
         if TO < 0 or dias < 0 or porcentaje < 0:
             raise ValueError("Los parámetros no pueden ser negativos.")
         
-        # Estructuras de datos
-        self.historial = Pila()
-        self.cola_calculos = Cola()
+        # Estructuras de datos. El historial guarda los últimos
+        # `capacidad_historial` pasos (None = sin límite, 0 = desactivado).
+        self.historial = Pila(capacidad_historial)
+        self._con_historial = capacidad_historial != 0
+        # Con `cola_prioridad` los trabajos salen por prioridad (menor = más urgente)
+        self.cola_calculos = ColaPrioridad() if cola_prioridad else Cola()
         self.arbol_deuda = ArbolDeuda()
 
         # Fecha actual para registrar el cálculo
         self.fecha_calculo = datetime.now().strftime('%Y-%m-%d %H:%M:%S')  # Fecha y hora actual
-        self.historial.push(f"[Inicio] Cálculo inicializado con TO={TO} en {self.fecha_calculo}")
+        if self._con_historial:
+            self.historial.push(PasoHistorial("Inicio", "TO", TO, self.fecha_calculo))
 
     def _obtener_ufvs(self):
         """Obtiene los valores UFV para el rango de fechas."""
-        api = BCBAPIUFV()
+        api = self.api if self.api is not None else _cliente_por_defecto()
         try:
-            datos = api.consumir_endpoint(self.fecha_inicio, self.fecha_fin)
-            ufv_venc = api._parse_valor(datos[0])
-            ufv_pago = api._parse_valor(datos[-1])
+            valores_en = getattr(api, "valores_en", None)
+            if valores_en is not None:
+                # Consulta puntual: sólo las dos fechas que usa la fórmula
+                valores = valores_en([self.fecha_inicio, self.fecha_fin])
+                ufv_venc, ufv_pago = valores[str(self.fecha_inicio)], valores[str(self.fecha_fin)]
+            else:
+                datos = api.consumir_endpoint(self.fecha_inicio, self.fecha_fin)
+                ufv_venc = api._parse_valor(datos[0])
+                ufv_pago = api._parse_valor(datos[-1])
             if not ufv_venc or not ufv_pago:
                 raise UFVFetchError("Valores UFV inválidos para las fechas especificadas.")
             return ufv_venc, ufv_pago
@@ -44,33 +128,126 @@ class CalculadoraDeuda:
             logger.error(f"Error al obtener UFVs: {str(e)}")
             return None, None
 
-    def calcular(self):
-        """Ejecuta el cálculo completo e integra las estructuras de datos."""
+    async def _obtener_ufvs_async(self):
+        """Igual que `_obtener_ufvs`, esperando a un cliente asíncrono."""
+        import asyncio  # ya cargado por quien corre el event loop
+        import inspect
+
+        api = self.api if self.api is not None else _cliente_async_por_defecto()
+        valores_en = getattr(api, "valores_en", None)
+        if not inspect.iscoroutinefunction(valores_en):
+            # Cliente síncrono (o sin httpx, el compartido de `calcular`): se
+            # ejecuta en un hilo para no bloquear el event loop
+            return await asyncio.get_running_loop().run_in_executor(None, self._obtener_ufvs)
         try:
-            ufv_venc, ufv_pago = self._obtener_ufvs()
-            if ufv_venc is None or ufv_pago is None:
-                return {"error": "No se pudieron obtener los valores de UFV correctamente."}
-            
-            # Cálculos
-            mv = MantenimientoValor(self.TO, ufv_pago, ufv_venc).calcular()
-            i = Interes(self.TO, mv, self.tasa, self.dias).calcular()
-            s = Sancion(self.TO, self.porcentaje).calcular()
+            valores = await valores_en([self.fecha_inicio, self.fecha_fin])
+            ufv_venc, ufv_pago = valores[str(self.fecha_inicio)], valores[str(self.fecha_fin)]
+            if not ufv_venc or not ufv_pago:
+                raise UFVFetchError("Valores UFV inválidos para las fechas especificadas.")
+            return ufv_venc, ufv_pago
+        except UFVFetchError as e:
+            logger.error(f"Error al obtener UFVs: {str(e)}")
+            return None, None
+
+    def calcular(self, compacto: bool = False):
+        """
+        Ejecuta el cálculo completo e integra las estructuras de datos.
+
+        Devuelve un dict (TO, MV, I, S, DT y "Fecha de Cálculo"), o
+        ``{"error": ...}`` si algo falla. Con ``compacto=True`` devuelve un
+        `ResultadoDeuda` (ocupa mucho menos si se guardan millones; su
+        ``to_dict()`` da el dict) y los errores se lanzan como excepción.
+        """
+        crono = metricas.cronometro()
+        clave, resultado = self._buscar_resultado()
+        if resultado is None:
+            try:
+                ufvs = self._obtener_ufvs()
+                crono.marcar("ufv.consulta")
+                resultado = self._calcular_con_ufvs(*ufvs, crono=crono)
+            except Exception as e:
+                return self._fallo(e, crono, compacto)
+            self._guardar_resultado(clave, resultado)
+        crono.total("calculo.total")
+        return resultado if compacto else resultado.to_dict(self.fecha_calculo)
+
+    async def calcular_async(self, compacto: bool = False):
+        """Versión asíncrona de `calcular`; espera las UFV sin bloquear el event loop."""
+        crono = metricas.cronometro()
+        clave, resultado = self._buscar_resultado()
+        if resultado is None:
+            try:
+                ufvs = await self._obtener_ufvs_async()
+                crono.marcar("ufv.consulta")
+                resultado = self._calcular_con_ufvs(*ufvs, crono=crono)
+            except Exception as e:
+                return self._fallo(e, crono, compacto)
+            self._guardar_resultado(clave, resultado)
+        crono.total("calculo.total")
+        return resultado if compacto else resultado.to_dict(self.fecha_calculo)
+
+    @staticmethod
+    def _fallo(error, crono, compacto):
+        logger.error(f"Error en el cálculo: {str(error)}")
+        crono.total("calculo.total")
+        metricas.contar("calculo.errores")
+        if compacto:
+            raise error
+        return {"error": str(error)}
+
+    def _buscar_resultado(self):
+        """Consulta la caché de resultados (si hay); devuelve ``(clave, ResultadoDeuda o None)``."""
+        cache = self.cache_resultados
+        if cache is None:
+            return None, None
+        clave = cache.clave(self._parametros_de(None), getattr(self.api, "version", None))
+        guardado = cache.obtener(clave)
+        if guardado is not None:
+            self._registrar_resultado(guardado.MV, guardado.I, guardado.S, guardado.DT)
+        return clave, guardado
+
+    def _guardar_resultado(self, clave, resultado):
+        if clave is not None:
+            self.cache_resultados.guardar(clave, resultado)
+
+    def _calcular_con_ufvs(self, ufv_venc, ufv_pago, crono=None) -> ResultadoDeuda:
+        """Aplica las fórmulas con las UFV ya obtenidas y registra el resultado."""
+        if ufv_venc is None or ufv_pago is None:
+            raise UFVFetchError("No se pudieron obtener los valores de UFV correctamente.")
+        crono = crono or metricas.cronometro()
+
+        # Cálculos
+        opciones = {"exacto": self.exacto, "redondeo": self.redondeo}
+        mv = MantenimientoValor(self.TO, ufv_pago, ufv_venc, **opciones).calcular()
+        crono.marcar("calculo.mv")
+        i = Interes(self.TO, mv, self.tasa, self.dias, **opciones).calcular()
+        crono.marcar("calculo.interes")
+        s = Sancion(self.TO, self.porcentaje, **opciones).calcular()
+        crono.marcar("calculo.sancion")
+        if self.exacto:
+            to = redondear(a_decimal(self.TO), self.redondeo)
+            dt = to + mv + i + s
+        else:
+            to = round(self.TO, 2)
             dt = self.TO + mv + i + s
 
-            # Registrar en el historial con la fecha del cálculo
-            self.historial.push(f"[Resultado] MV = {mv} en {self.fecha_calculo}")
-            self.historial.push(f"[Resultado] I = {i} en {self.fecha_calculo}")
-            self.historial.push(f"[Resultado] S = {s} en {self.fecha_calculo}")
-            self.historial.push(f"[Final] Deuda Total (DT) = {dt} en {self.fecha_calculo}")
+        self._registrar_resultado(mv, i, s, dt)
 
-            # Construcción jerárquica con árbol de deuda
-            self._construir_arbol_deuda()
+        if not self.exacto:
+            dt = round(dt, 2)
+        return ResultadoDeuda(to, mv, i, s, dt)
 
-            return {"TO": round(self.TO, 2), "MV": mv, "I": i, "S": s, "DT": round(dt, 2), "Fecha de Cálculo": self.fecha_calculo}
-        
-        except Exception as e:
-            logger.error(f"Error en el cálculo: {str(e)}")
-            return {"error": str(e)}
+    def _registrar_resultado(self, mv, i, s, dt):
+        # Registrar en el historial con la fecha del cálculo
+        if self._con_historial:
+            fecha, push = self.fecha_calculo, self.historial.push
+            push(PasoHistorial("Resultado", "MV", mv, fecha))
+            push(PasoHistorial("Resultado", "I", i, fecha))
+            push(PasoHistorial("Resultado", "S", s, fecha))
+            push(PasoHistorial("Final", "DT", dt, fecha))
+
+        # Construcción jerárquica con árbol de deuda
+        self._construir_arbol_deuda()
 
     def _construir_arbol_deuda(self):
         """Construye el árbol de jerarquía tributaria (TO → MV → Interés → Sanción)."""
@@ -88,21 +265,89 @@ class CalculadoraDeuda:
     def mostrar_historial(self):
         """Muestra los pasos guardados en la pila (historial de cálculo)."""
         print("\nHistorial de cálculo:")
+        if not self._con_historial:
+            print(" (historial desactivado)")
         for paso in self.historial.items:
             print(" -", paso)
 
-    def agregar_a_cola(self, descripcion):
-        """Agrega una tarea de cálculo pendiente a la cola."""
-        self.cola_calculos.encolar(descripcion)
-        print(f"Cálculo agregado a la cola: {descripcion}")
+    def agregar_a_cola(self, tarea, mostrar: bool = True, prioridad=None):
+        """
+        Agrega un cálculo pendiente a la cola.
+
+        `tarea` puede ser un diccionario con sus propios parámetros (TO,
+        fecha_inicio, fecha_fin, tasa, dias, porcentaje); los que falten se
+        toman de esta calculadora. Cualquier otro valor se trata como una
+        descripción y se calcula con los parámetros de la instancia.
+
+        `prioridad` (sólo con ``cola_prioridad=True``): menor = más urgente,
+        por ejemplo ``-TO`` o la fecha límite de cobranza; sin ella, 0. Con
+        cola de prioridad devuelve la clave del trabajo, que sirve para
+        ``cola_calculos.actualizar(clave, prioridad)``.
+        """
+        entrada = (tarea, self._parametros_de(tarea))
+        if isinstance(self.cola_calculos, ColaPrioridad):
+            clave = self.cola_calculos.encolar(entrada, 0 if prioridad is None else prioridad)
+        elif prioridad is not None:
+            raise ValueError("Para encolar con prioridad, crear la calculadora con cola_prioridad=True.")
+        else:
+            clave = None
+            self.cola_calculos.encolar(entrada)
+        if mostrar:
+            print(f"Cálculo agregado a la cola: {tarea}")
+        return clave
+
+    def _parametros_de(self, tarea):
+        if isinstance(tarea, dict):
+            parametros = {c: tarea.get(c, getattr(self, c)) for c in CAMPOS_CALCULO}
+        else:
+            parametros = {c: getattr(self, c) for c in CAMPOS_CALCULO}
+        if self.exacto:
+            parametros.update(exacto=True, redondeo=self.redondeo)
+        return parametros
+
+    def procesar_cola(self, workers: int = 1, modo: str = "hilos", mostrar: bool = True):
+        """
+        Procesa todos los cálculos pendientes en la cola.
 
-    def procesar_cola(self):
-        """Procesa todos los cálculos pendientes en la cola."""
-        print("\nProcesando cálculos pendientes...")
+        workers: cantidad de trabajos en paralelo (1 = secuencial).
+        modo: "hilos" (comparte el cliente UFV y su sesión) o "procesos".
+        Devuelve los resultados en el orden en que salen de la cola (el de
+        llegada o, con `cola_prioridad`, el de prioridad; los trabajos se
+        inician en ese orden); un trabajo que falla devuelve
+        {"error": ...} sin detener a los demás.
+        """
+        if modo not in ("hilos", "procesos"):
+            raise ValueError("modo debe ser 'hilos' o 'procesos'.")
+        tareas = []
         while not self.cola_calculos.esta_vacia():
-            tarea = self.cola_calculos.desencolar()
-            print(f"Procesado: {tarea}")
-            resultado = self.calcular()  # Llamamos al método de cálculo
-            print("Resultado del cálculo:")
-            for k, v in resultado.items():
-                print(f"{k}: {v}")
+            tareas.append(self.cola_calculos.desencolar())
+
+        if mostrar:
+            print("\nProcesando cálculos pendientes...")
+        parametros = [p for _, p in tareas]
+        if workers <= 1 or len(tareas) <= 1:
+            resultados = [_ejecutar_trabajo(p, self.api) for p in parametros]
+        else:
+            from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+            Executor = ThreadPoolExecutor if modo == "hilos" else ProcessPoolExecutor
+            with Executor(max_workers=workers) as ex:
+                resultados = list(ex.map(_ejecutar_trabajo, parametros, [self.api] * len(parametros)))
+
+        if mostrar:
+            for (tarea, _), resultado in zip(tareas, resultados):
+                print(f"Procesado: {tarea}")
+                print("Resultado del cálculo:")
+                for k, v in resultado.items():
+                    print(f"{k}: {v}")
+        return resultados
+
+
+def _ejecutar_trabajo(parametros, api=None):
+    """Calcula un trabajo de la cola; a nivel de módulo para poder enviarlo a otros procesos."""
+    try:
+        # Nadie lee el historial de estas calculadoras temporales
+        return CalculadoraDeuda(**parametros, api=api, capacidad_historial=0).calcular()
+    except Exception as e:
+        logger.error(f"Error en el trabajo {parametros}: {str(e)}")
+        return {"error": str(e)}
@@ -0,0 +1,101 @@
+"""
+Línea de comandos de `impuestos_package`.
+
+Ejemplo:
+    impuestos calcular --input obligaciones.csv --output resultados.csv --workers 4 --cache ufv.sqlite3
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import sys
+import time
+from array import array
+from typing import List, Optional, Sequence
+
+from .batch import procesar_archivo
+from .ufv import BCBAPIUFV
+from .ufv_cache import CacheUFV
+from .ufv_local import UFVArchivo
+
+
+def _percentil(valores: Sequence[float], p: float) -> float:
+    """Percentil por rango más cercano sobre valores ya ordenados."""
+    if not valores:
+        return 0.0
+    rango = math.ceil(p / 100.0 * len(valores))
+    return valores[min(len(valores), max(1, rango)) - 1]
+
+
+def _crear_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="impuestos", description="Cálculo de deuda tributaria (MV, I, S, DT).")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    calc = sub.add_parser("calcular", help="Recalcula un archivo CSV de obligaciones.")
+    calc.add_argument("--input", "-i", required=True, help="CSV de entrada.")
+    calc.add_argument("--output", "-o", required=True, help="CSV de resultados.")
+    calc.add_argument("--workers", "-w", type=int, default=1, help="Bloques calculados en paralelo.")
+    calc.add_argument("--bloque", type=int, default=1000, help="Filas por bloque.")
+    calc.add_argument("--cache", help="Archivo SQLite del caché de UFV.")
+    calc.add_argument("--offline", action="store_true", help="No consultar la red; sólo usar el caché.")
+    calc.add_argument("--ufv-archivo", help="Instantánea UFV (CSV/JSON/.bin) local; nunca consulta la red.")
+    calc.add_argument("--delimitador", default=",", help="Separador del CSV.")
+
+    inst = sub.add_parser("instantanea", help="Convierte una instantánea UFV CSV/JSON al formato binario (mmap).")
+    inst.add_argument("--entrada", "-i", required=True, help="Instantánea UFV CSV o JSON.")
+    inst.add_argument("--salida", "-o", required=True, help="Archivo .bin de salida.")
+    return parser
+
+
+def _instantanea(args) -> int:
+    serie = UFVArchivo.desde_archivo(args.entrada).serie
+    serie.guardar_binario(args.salida)
+    print(f"Serie UFV {serie.fecha_inicio} a {serie.fecha_fin} ({len(serie)} días) guardada en {args.salida}")
+    return 0
+
+
+def _calcular(args) -> int:
+    # Con una instantánea local nunca se consulta la red: --offline no necesita caché
+    if args.offline and not args.cache and not args.ufv_archivo:
+        print("error: --offline requiere --cache o --ufv-archivo", file=sys.stderr)
+        return 2
+
+    cache = CacheUFV(args.cache) if args.cache and not args.ufv_archivo else None
+    if args.ufv_archivo:
+        api = UFVArchivo.desde_archivo(args.ufv_archivo)
+    else:
+        api = BCBAPIUFV(cache=cache, offline=args.offline, pool_maxsize=max(10, args.workers))
+    latencias = array("d")
+
+    inicio = time.perf_counter()
+    resumen = procesar_archivo(args.input, args.output, api=api, tamano_bloque=args.bloque,
+                               delimitador=args.delimitador, workers=args.workers, latencias=latencias)
+    total = time.perf_counter() - inicio
+    if isinstance(api, BCBAPIUFV):
+        api.cerrar()
+
+    ordenadas = sorted(latencias)
+    print(f"Filas procesadas: {resumen['filas']} (con error: {resumen['errores']})")
+    print(f"Tiempo total: {total:.2f} s ({resumen['filas'] / total if total else 0:.0f} filas/s)")
+    if cache is not None:
+        print(f"Aciertos del caché UFV: {cache.tasa_aciertos():.1%} "
+              f"({cache.aciertos} aciertos, {cache.fallos} fallos)")
+    else:
+        print("Aciertos del caché UFV: sin caché")
+    print(f"Latencia por fila: p50 = {_percentil(ordenadas, 50) * 1000:.3f} ms, "
+          f"p99 = {_percentil(ordenadas, 99) * 1000:.3f} ms")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _crear_parser().parse_args(argv)
+    if args.comando == "calcular":
+        return _calcular(args)
+    if args.comando == "instantanea":
+        return _instantanea(args)
+    return 1  # pragma: no cover - argparse exige un subcomando
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
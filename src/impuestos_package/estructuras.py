@@ -5,9 +5,13 @@ Descripción:
 Este módulo extiende la funcionalidad de la librería `impuestos_package`
 implementando estructuras de datos clásicas (Pila, Cola y Árbol Binario)
 para optimizar cálculos, auditorías y gestión de operaciones tributarias.
+`ArbolDeudaBalanceado` (AVL) sirve como índice de cientos de miles de
+registros de contribuyentes.
 """
 
+import heapq
 from collections import deque
+from itertools import count, islice
 
 # =====================================================
 # 🔹 Clase PILA (Stack)
@@ -17,10 +21,16 @@ class Pila:
     """
     Implementación de una pila (estructura LIFO).
     Se utiliza para registrar el historial de operaciones o cálculos.
+
+    Con `capacidad` la pila queda acotada (búfer circular): al llenarse,
+    cada `push` descarta el elemento más antiguo. ``capacidad=0`` no guarda nada.
     """
 
-    def __init__(self):
-        self.items = []
+    __slots__ = ("items", "capacidad")
+
+    def __init__(self, capacidad=None):
+        self.capacidad = capacidad
+        self.items = [] if capacidad is None else deque(maxlen=capacidad)
 
     def push(self, item):
         """Agrega un elemento a la pila."""
@@ -43,7 +53,7 @@ class Pila:
         return len(self.items)
 
     def __repr__(self):
-        return f"Pila({self.items})"
+        return f"Pila({list(self.items)})"
 
 
 # =====================================================
@@ -56,6 +66,8 @@ class Cola:
     Ideal para gestionar cálculos pendientes o tareas tributarias.
     """
 
+    __slots__ = ("items",)
+
     def __init__(self):
         self.items = deque()
 
@@ -83,12 +95,119 @@ class Cola:
         return f"Cola({list(self.items)})"
 
 
+# =====================================================
+# 🔹 Cola de PRIORIDAD (montículo binario)
+# =====================================================
+
+_ELIMINADA = object()  # marca de las entradas reemplazadas o eliminadas
+_AUTOMATICA = object()  # las claves generadas son (_AUTOMATICA, n): no chocan con las del usuario
+
+
+class ColaPrioridad:
+    """
+    Cola de prioridad sobre un montículo (`heapq`): sale primero el elemento
+    de menor prioridad, por ejemplo ``-DT`` para atender las deudas más
+    grandes o la fecha límite de cobranza para las más urgentes. Con igual
+    prioridad se respeta el orden de llegada.
+
+    `encolar` y `desencolar` cuestan O(log n). Cada elemento tiene una
+    clave (la indicada o una generada, distinta de cualquier clave del
+    usuario) para cambiar su prioridad
+    con `actualizar` o quitarlo con `eliminar`: la entrada vieja queda
+    marcada en el montículo y se descarta al llegar a la cima.
+    """
+
+    __slots__ = ("_monticulo", "_entradas", "_orden")
+
+    def __init__(self):
+        self._monticulo = []
+        # clave -> [prioridad, llegada, secuencia, clave, item]; `secuencia` es
+        # única, así el montículo nunca compara claves ni elementos
+        self._entradas = {}
+        self._orden = count()
+
+    def encolar(self, item, prioridad=0, clave=None):
+        """
+        Agrega `item` con `prioridad` y devuelve su clave. Si `clave` ya está
+        en la cola, sólo se actualizan su elemento y su prioridad.
+        """
+        secuencia = next(self._orden)
+        if clave is not None and clave in self._entradas:
+            llegada = self._quitar(clave)[1]  # conserva su lugar entre iguales
+        else:
+            llegada = secuencia
+            clave = (_AUTOMATICA, secuencia) if clave is None else clave
+        entrada = [prioridad, llegada, secuencia, clave, item]
+        self._entradas[clave] = entrada
+        heapq.heappush(self._monticulo, entrada)
+        return clave
+
+    def actualizar(self, clave, prioridad):
+        """Cambia la prioridad de un elemento pendiente (KeyError si no está)."""
+        entrada = self._entradas[clave]
+        self.encolar(entrada[4], prioridad, clave)
+
+    def eliminar(self, clave):
+        """Quita un elemento pendiente y lo devuelve (KeyError si no está)."""
+        return self._quitar(clave)[4]
+
+    def desencolar(self):
+        """Elimina y devuelve el elemento más prioritario."""
+        entrada = self._cima()
+        if entrada is None:
+            return None
+        heapq.heappop(self._monticulo)
+        del self._entradas[entrada[3]]
+        return entrada[4]
+
+    def frente(self):
+        """Devuelve el elemento más prioritario sin eliminarlo."""
+        entrada = self._cima()
+        return entrada[4] if entrada is not None else None
+
+    def prioridad(self, clave):
+        return self._entradas[clave][0]
+
+    def esta_vacia(self):
+        return not self._entradas
+
+    def tamano(self):
+        return len(self._entradas)
+
+    def __contains__(self, clave):
+        return clave in self._entradas
+
+    def _quitar(self, clave):
+        entrada = self._entradas.pop(clave)
+        anterior = list(entrada)
+        entrada[4] = _ELIMINADA
+        return anterior
+
+    def _cima(self):
+        monticulo = self._monticulo
+        while monticulo and monticulo[0][4] is _ELIMINADA:
+            heapq.heappop(monticulo)
+        return monticulo[0] if monticulo else None
+
+    def __repr__(self):
+        pendientes = sorted(self._entradas.values())
+        return f"ColaPrioridad({[(e[0], e[4]) for e in pendientes]})"
+
+
 # =====================================================
 # 🔹 Árbol Binario (Binary Tree)
 # =====================================================
 
 class Nodo:
-    """Nodo de un árbol binario simple."""
+    """
+    Nodo de un árbol binario simple.
+
+    Usa ``__slots__`` (sin ``__dict__`` por instancia) para que los índices
+    con millones de nodos ocupen menos memoria. Las subclases deben declarar
+    sus propios ``__slots__`` (como `NodoAVL`); si no, vuelven a tener ``__dict__``.
+    """
+
+    __slots__ = ("valor", "izq", "der")
 
     def __init__(self, valor):
         self.valor = valor
@@ -112,50 +231,63 @@ class ArbolDeuda:
         self.raiz = None
 
     def insertar(self, valor):
-        """Inserta un nuevo nodo en el árbol."""
+        """Inserta un nuevo nodo en el árbol (por orden alfabético o numérico)."""
         if self.raiz is None:
             self.raiz = Nodo(valor)
-        else:
-            self._insertar_rec(self.raiz, valor)
-
-    def _insertar_rec(self, nodo, valor):
-        """Inserción recursiva (por orden alfabético o numérico)."""
-        if valor < nodo.valor:
-            if nodo.izq is None:
-                nodo.izq = Nodo(valor)
+            return
+        # Iterativo: un árbol degenerado no choca con el límite de recursión
+        nodo = self.raiz
+        while True:
+            if valor < nodo.valor:
+                if nodo.izq is None:
+                    nodo.izq = Nodo(valor)
+                    return
+                nodo = nodo.izq
             else:
-                self._insertar_rec(nodo.izq, valor)
-        else:
-            if nodo.der is None:
-                nodo.der = Nodo(valor)
-            else:
-                self._insertar_rec(nodo.der, valor)
+                if nodo.der is None:
+                    nodo.der = Nodo(valor)
+                    return
+                nodo = nodo.der
 
     def preorden(self, nodo=None):
         """Recorrido en preorden (raíz → izquierda → derecha)."""
         if nodo is None:
             nodo = self.raiz
-        if nodo is None:
-            return  # Árbol vacío, salir
-        print(nodo.valor)
-        if nodo.izq:
-            self.preorden(nodo.izq)
-        if nodo.der:
-            self.preorden(nodo.der)
+        # Con pila explícita, como `en_orden`: un árbol degenerado no choca
+        # con el límite de recursión
+        pila = [nodo] if nodo is not None else []
+        while pila:
+            nodo = pila.pop()
+            print(nodo.valor)
+            if nodo.der:
+                pila.append(nodo.der)
+            if nodo.izq:
+                pila.append(nodo.izq)
+
+    def en_orden(self, inverso=False):
+        """Genera los valores en orden (de menor a mayor, o al revés con `inverso`)."""
+        pila = []
+        nodo = self.raiz
+        while pila or nodo is not None:
+            if nodo is not None:
+                pila.append(nodo)
+                nodo = nodo.der if inverso else nodo.izq
+            else:
+                nodo = pila.pop()
+                yield nodo.valor
+                nodo = nodo.izq if inverso else nodo.der
+
+    def __iter__(self):
+        return self.en_orden()
 
     def buscar(self, valor):
         """Busca un valor dentro del árbol."""
-        return self._buscar_rec(self.raiz, valor)
-
-    def _buscar_rec(self, nodo, valor):
-        if nodo is None:
-            return False
-        if nodo.valor == valor:
-            return True
-        elif valor < nodo.valor:
-            return self._buscar_rec(nodo.izq, valor)
-        else:
-            return self._buscar_rec(nodo.der, valor)
+        nodo = self.raiz
+        while nodo is not None:
+            if nodo.valor == valor:
+                return True
+            nodo = nodo.izq if valor < nodo.valor else nodo.der
+        return False
 
     def mostrar_arbol(self, nodo=None, prefijo="", es_izquierdo=True):
         """
@@ -167,13 +299,284 @@ class ArbolDeuda:
         """
         if nodo is None:
             nodo = self.raiz
-        if nodo is not None:
+        pila = [(nodo, prefijo, es_izquierdo)] if nodo is not None else []
+        while pila:
+            nodo, prefijo, es_izquierdo = pila.pop()
             print(prefijo + ("└── " if es_izquierdo else "├── ") + str(nodo.valor))
-            if nodo.izq or nodo.der:
-                if nodo.izq:
-                    self.mostrar_arbol(nodo.izq, prefijo + ("    " if es_izquierdo else "│   "), True)
-                if nodo.der:
-                    self.mostrar_arbol(nodo.der, prefijo + ("    " if es_izquierdo else "│   "), False)
+            prefijo_hijos = prefijo + ("    " if es_izquierdo else "│   ")
+            # El derecho entra primero para que el izquierdo se muestre antes
+            if nodo.der:
+                pila.append((nodo.der, prefijo_hijos, False))
+            if nodo.izq:
+                pila.append((nodo.izq, prefijo_hijos, True))
+
+
+# =====================================================
+# 🔹 Árbol AVL (auto-balanceado)
+# =====================================================
+
+class NodoAVL(Nodo):
+    """
+    Nodo de `ArbolDeudaBalanceado`: guarda la clave de orden, la altura y la
+    cantidad de nodos de su subárbol (para consultas por posición).
+    """
+
+    __slots__ = ("clave", "altura", "tamano")
+
+    def __init__(self, valor, clave):
+        super().__init__(valor)
+        self.clave = clave
+        self.altura = 1
+        self.tamano = 1
+
+
+def _altura(nodo):
+    return nodo.altura if nodo is not None else 0
+
+
+def _tamano(nodo):
+    return nodo.tamano if nodo is not None else 0
+
+
+def _actualizar(nodo):
+    izq, der = nodo.izq, nodo.der
+    nodo.altura = 1 + max(_altura(izq), _altura(der))
+    nodo.tamano = 1 + _tamano(izq) + _tamano(der)
+
+
+def _rotar_derecha(y):
+    x = y.izq
+    y.izq, x.der = x.der, y
+    _actualizar(y)
+    _actualizar(x)
+    return x
+
+
+def _rotar_izquierda(x):
+    y = x.der
+    x.der, y.izq = y.izq, x
+    _actualizar(x)
+    _actualizar(y)
+    return y
+
+
+def _balancear(nodo):
+    """Recalcula la altura de `nodo` y lo rota si quedó desbalanceado; devuelve la nueva raíz."""
+    _actualizar(nodo)
+    balance = _altura(nodo.izq) - _altura(nodo.der)
+    if balance > 1:
+        if _altura(nodo.izq.izq) < _altura(nodo.izq.der):
+            nodo.izq = _rotar_izquierda(nodo.izq)
+        return _rotar_derecha(nodo)
+    if balance < -1:
+        if _altura(nodo.der.der) < _altura(nodo.der.izq):
+            nodo.der = _rotar_derecha(nodo.der)
+        return _rotar_izquierda(nodo)
+    return nodo
+
+
+class ArbolDeudaBalanceado(ArbolDeuda):
+    """
+    Árbol AVL: se mantiene balanceado, así que insertar, buscar y eliminar
+    cuestan O(log n) aunque los valores lleguen ordenados (p. ej. NIT
+    correlativos). Todas las operaciones son iterativas, sin riesgo de
+    llegar al límite de recursión.
+
+    clave: función opcional que extrae la clave de orden de cada valor, por
+           ejemplo ``lambda c: c["nit"]`` para indexar contribuyentes.
+           Sin ella se ordena por el valor mismo. Se admiten claves repetidas.
+
+    Cada nodo conoce el tamaño de su subárbol, así que las consultas por
+    posición (`k_esimo`, `posicion`, `contar`) también son O(log n); `rango`
+    y `top_k` cuestan O(log n + k) para k resultados.
+
+    Ejemplo:
+        indice = ArbolDeudaBalanceado(clave=lambda c: c["nit"])
+        indice.insertar({"nit": 1020304, "nombre": "Empresa A", "DT": 1250.0})
+        indice.obtener(1020304)
+
+        por_deuda = ArbolDeudaBalanceado(clave=lambda c: c["DT"])
+        list(por_deuda.rango(1000, 5000))   # deudas con DT entre 1000 y 5000
+        por_deuda.top_k(10)                 # los 10 mayores deudores
+    """
+
+    def __init__(self, clave=None):
+        super().__init__()
+        self.clave = clave
+
+    def __len__(self):
+        return _tamano(self.raiz)
+
+    def __contains__(self, clave):
+        return self._nodo(clave) is not None
+
+    @property
+    def altura(self):
+        return _altura(self.raiz)
+
+    def insertar(self, valor):
+        """Inserta `valor`; con clave repetida, queda después de los existentes."""
+        clave = valor if self.clave is None else self.clave(valor)
+        nuevo = NodoAVL(valor, clave)
+        if self.raiz is None:
+            self.raiz = nuevo
+            return
+        camino = []
+        nodo = self.raiz
+        while nodo is not None:
+            camino.append(nodo)
+            nodo = nodo.izq if clave < nodo.clave else nodo.der
+        padre = camino[-1]
+        if clave < padre.clave:
+            padre.izq = nuevo
+        else:
+            padre.der = nuevo
+        self._rebalancear(camino)
+
+    def buscar(self, clave):
+        """True si hay algún valor con esa clave."""
+        return self._nodo(clave) is not None
+
+    def obtener(self, clave, default=None):
+        """Devuelve un valor con esa clave, o `default` si no hay ninguno."""
+        nodo = self._nodo(clave)
+        return nodo.valor if nodo is not None else default
+
+    def eliminar(self, clave):
+        """Elimina un valor con esa clave; devuelve False si no existía."""
+        camino = []
+        nodo = self.raiz
+        while nodo is not None and nodo.clave != clave:
+            camino.append(nodo)
+            nodo = nodo.izq if clave < nodo.clave else nodo.der
+        if nodo is None:
+            return False
+
+        if nodo.izq is not None and nodo.der is not None:
+            # Con dos hijos se reemplaza por el sucesor y se elimina el nodo de éste
+            camino.append(nodo)
+            sucesor = nodo.der
+            while sucesor.izq is not None:
+                camino.append(sucesor)
+                sucesor = sucesor.izq
+            nodo.valor, nodo.clave = sucesor.valor, sucesor.clave
+            nodo = sucesor
+
+        hijo = nodo.izq if nodo.izq is not None else nodo.der
+        if not camino:
+            self.raiz = hijo
+        elif camino[-1].izq is nodo:
+            camino[-1].izq = hijo
+        else:
+            camino[-1].der = hijo
+        self._rebalancear(camino)
+        return True
+
+    # --- Consultas ordenadas --------------------------------------------------
+    def rango(self, desde, hasta):
+        """Genera, en orden, los valores con ``desde <= clave <= hasta``."""
+        pila = []
+        nodo = self.raiz
+        while pila or nodo is not None:
+            if nodo is not None:
+                if nodo.clave < desde:
+                    nodo = nodo.der  # todo su subárbol izquierdo queda fuera
+                    continue
+                pila.append(nodo)
+                nodo = nodo.izq
+            else:
+                nodo = pila.pop()
+                if hasta < nodo.clave:
+                    return
+                yield nodo.valor
+                nodo = nodo.der
+
+    def piso(self, clave, default=None):
+        """Valor con la mayor clave ``<= clave``."""
+        mejor = None
+        nodo = self.raiz
+        while nodo is not None:
+            if nodo.clave <= clave:
+                mejor, nodo = nodo, nodo.der
+            else:
+                nodo = nodo.izq
+        return mejor.valor if mejor is not None else default
+
+    def techo(self, clave, default=None):
+        """Valor con la menor clave ``>= clave``."""
+        mejor = None
+        nodo = self.raiz
+        while nodo is not None:
+            if nodo.clave >= clave:
+                mejor, nodo = nodo, nodo.izq
+            else:
+                nodo = nodo.der
+        return mejor.valor if mejor is not None else default
+
+    def k_esimo(self, k):
+        """Valor en la posición `k` del orden (0 = el menor; negativos desde el final)."""
+        n = len(self)
+        if k < 0:
+            k += n
+        if not 0 <= k < n:
+            raise IndexError("Posición fuera del árbol.")
+        nodo = self.raiz
+        while True:
+            izq = _tamano(nodo.izq)
+            if k < izq:
+                nodo = nodo.izq
+            elif k == izq:
+                return nodo.valor
+            else:
+                k -= izq + 1
+                nodo = nodo.der
+
+    def posicion(self, clave):
+        """Cantidad de valores con clave estrictamente menor que `clave`."""
+        return self._menores(clave, inclusive=False)
+
+    def contar(self, desde, hasta):
+        """Cantidad de valores con ``desde <= clave <= hasta``, sin recorrerlos."""
+        if hasta < desde:
+            return 0
+        return self._menores(hasta, inclusive=True) - self._menores(desde, inclusive=False)
+
+    def top_k(self, k):
+        """Los `k` valores de mayor clave, de mayor a menor."""
+        return list(islice(self.en_orden(inverso=True), k))
+
+    def _menores(self, clave, inclusive):
+        cantidad = 0
+        nodo = self.raiz
+        while nodo is not None:
+            if nodo.clave < clave or (inclusive and nodo.clave == clave):
+                cantidad += _tamano(nodo.izq) + 1
+                nodo = nodo.der
+            else:
+                nodo = nodo.izq
+        return cantidad
+
+    def _nodo(self, clave):
+        nodo = self.raiz
+        while nodo is not None:
+            if nodo.clave == clave:
+                return nodo
+            nodo = nodo.izq if clave < nodo.clave else nodo.der
+        return None
+
+    def _rebalancear(self, camino):
+        """Sube desde el último nodo del camino hasta la raíz, rotando donde haga falta."""
+        for k in range(len(camino) - 1, -1, -1):
+            nodo = camino[k]
+            nuevo = _balancear(nodo)
+            if nuevo is nodo:
+                continue
+            if k == 0:
+                self.raiz = nuevo
+            elif camino[k - 1].izq is nodo:
+                camino[k - 1].izq = nuevo
+            else:
+                camino[k - 1].der = nuevo
 
 
 # =====================================================
@@ -1,21 +1,34 @@
+from .redondeo import REDONDEO_POR_DEFECTO, a_decimal, redondear
+
 class Interes:
-    def __init__(self, TO: float, MV: float, tasa: float, dias: int):
+    def __init__(self, TO: float, MV: float, tasa: float, dias: int,
+                 exacto: bool = False, redondeo: str = REDONDEO_POR_DEFECTO):
         """
         TO: Total Original
         MV: Mantenimiento de Valor
         tasa: Tasa anual en porcentaje (ej. 3.5 para 3.5%)
         dias: días para el cálculo
+        exacto: si es True, calcula con Decimal y devuelve un Decimal
+        redondeo: política de redondeo a centavos en modo exacto
         """
         if TO < 0 or MV < 0 or tasa < 0 or dias < 0:
             raise ValueError("Ningún valor puede ser negativo.")
+        self.exacto = exacto
+        self.redondeo = redondeo
+        if exacto:
+            TO, MV, tasa, dias = a_decimal(TO), a_decimal(MV), a_decimal(tasa), a_decimal(dias)
         self.TO = TO
         self.MV = MV
         self.tasa = tasa
         self.dias = dias
 
-    def calcular(self) -> float:
+    def calcular(self):
         """
         I = (TO + MV) * (tasa% / 100) * (dias / 360)
         """
+        if self.exacto:
+            # Se divide una sola vez al final para no acumular redondeos intermedios
+            interes = (self.TO + self.MV) * self.tasa * self.dias / 36000
+            return redondear(interes, self.redondeo)
         interes = (self.TO + self.MV) * (self.tasa / 100.0) * (self.dias / 360.0)
         return round(interes, 2)
@@ -0,0 +1,137 @@
+"""
+Cálculo de deuda tributaria por lotes.
+
+`calcular_lote` recibe los datos en columnas (una secuencia por parámetro),
+resuelve cada UFV una sola vez por fecha distinta y evalúa las fórmulas de
+MV, Interés y Sanción como operaciones vectoriales de NumPy.
+
+Requiere el extra opcional ``lote``: ``pip install impuestos-package[lote]``.
+El modo exacto (``exacto=True``) no usa NumPy: calcula con `decimal.Decimal`
+en un solo recorrido, con las UFV de cada fecha convertidas una única vez.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+from .redondeo import CENTAVO, REDONDEO_POR_DEFECTO, a_decimal
+from .ufv import BCBAPIUFV, UFVFetchError, _resolver_ufvs
+
+
+def calcular_lote(TO: Sequence[float], fecha_inicio: Sequence[str], fecha_fin: Sequence[str],
+                  tasa: Sequence[float], dias: Sequence[int], porcentaje: Sequence[float],
+                  api=None, exacto: bool = False,
+                  redondeo: str = REDONDEO_POR_DEFECTO) -> Dict[str, "np.ndarray"]:
+    """
+    Calcula MV, I, S y DT para todas las obligaciones a la vez.
+
+    Todas las columnas deben tener la misma longitud. Devuelve un diccionario
+    con los arreglos ``TO``, ``MV``, ``I``, ``S`` y ``DT`` en el mismo orden de
+    entrada, con los mismos centavos que `CalculadoraDeuda`, y ``errores``:
+    los índices de las filas que la calculadora rechazaría (MV negativo por
+    una UFV en baja). Esas filas quedan con NaN en MV, I, S y DT; el resto
+    del lote se calcula igual.
+
+    Con ``exacto=True`` devuelve listas de `Decimal` redondeadas con
+    `redondeo`, idénticas a las de `CalculadoraDeuda(..., exacto=True)`; las
+    filas rechazadas quedan con None y sus índices en ``errores``.
+    """
+    if exacto:
+        return _calcular_lote_exacto(TO, fecha_inicio, fecha_fin, tasa, dias, porcentaje, api, redondeo)
+    if np is None:
+        raise ImportError("calcular_lote requiere NumPy: pip install impuestos-package[lote]")
+
+    to = np.asarray(TO, dtype=np.float64)
+    tasa_arr = np.asarray(tasa, dtype=np.float64)
+    dias_arr = np.asarray(dias, dtype=np.float64)
+    porc = np.asarray(porcentaje, dtype=np.float64)
+    fi = np.asarray(fecha_inicio, dtype=str)
+    ff = np.asarray(fecha_fin, dtype=str)
+
+    n = to.shape[0]
+    if any(a.shape != (n,) for a in (tasa_arr, dias_arr, porc, fi, ff)):
+        raise ValueError("Todas las columnas deben ser unidimensionales y de la misma longitud.")
+    if (to < 0).any() or (dias_arr < 0).any() or (porc < 0).any() or (tasa_arr < 0).any():
+        raise ValueError("Los parámetros no pueden ser negativos.")
+
+    # Una sola resolución por fecha distinta; luego se reindexa a cada fila
+    fechas, inversa = np.unique(np.concatenate([fi, ff]), return_inverse=True)
+    valores = _resolver_ufvs(api if api is not None else BCBAPIUFV(), fechas.tolist())
+    ufv = np.array([valores[f] for f in fechas.tolist()], dtype=np.float64)
+    if (ufv <= 0).any():
+        raise UFVFetchError("Valores UFV inválidos para las fechas especificadas.")
+    return _calcular_arreglos(to, ufv[inversa[:n]], ufv[inversa[n:]], tasa_arr, dias_arr, porc)
+
+
+def _calcular_arreglos(to, ufv_venc, ufv_pago, tasa, dias, porc) -> Dict[str, "np.ndarray"]:
+    """Las fórmulas de `calcular_lote` sobre columnas ya validadas y con las UFV resueltas."""
+    mv = _centavos(to * ((ufv_pago / ufv_venc) - 1.0))
+    # UFV en baja: Interes rechaza un MV negativo; sólo esas filas quedan en NaN
+    errores = np.flatnonzero(mv < 0)
+    mv[errores] = np.nan
+    i = _centavos((to + mv) * (tasa / 100.0) * (dias / 360.0))
+    s = _centavos(to * (porc / 100.0))
+    s[errores] = np.nan
+    dt = _centavos(to + mv + i + s)
+    return {"TO": _centavos(to), "MV": mv, "I": i, "S": s, "DT": dt, "errores": errores}
+
+
+def _centavos(x: "np.ndarray") -> "np.ndarray":
+    """Redondea a 2 decimales con el mismo resultado que ``round(x, 2)`` en cada fila."""
+    y = x * 100.0
+    r = np.rint(y) / 100.0
+    # `y` ya trae el error de representación de x * 100: cerca de medio
+    # centavo np.rint puede caer del otro lado que round(x, 2), que decide
+    # con el valor exacto de x. Esas pocas filas se redondean con Python.
+    with np.errstate(invalid="ignore"):
+        dudosas = np.flatnonzero(np.abs(np.abs(y - np.trunc(y)) - 0.5) <= 8 * np.spacing(np.abs(y)))
+    for k in dudosas.tolist():
+        r[k] = round(float(x[k]), 2)
+    return r
+
+
+def _calcular_lote_exacto(TO, fecha_inicio, fecha_fin, tasa, dias, porcentaje, api,
+                          redondeo) -> Dict[str, List]:
+    columnas = [list(c) for c in (TO, fecha_inicio, fecha_fin, tasa, dias, porcentaje)]
+    n = len(columnas[0])
+    if any(len(c) != n for c in columnas):
+        raise ValueError("Todas las columnas deben ser unidimensionales y de la misma longitud.")
+    to_c, fi, ff, tasa_c, dias_c, porc_c = columnas
+    if any(v < 0 for c in (to_c, tasa_c, dias_c, porc_c) for v in c):
+        raise ValueError("Los parámetros no pueden ser negativos.")
+
+    fechas = sorted({str(f) for f in fi} | {str(f) for f in ff})
+    valores = _resolver_ufvs(api if api is not None else BCBAPIUFV(), fechas)
+    ufv = {f: a_decimal(valores[f]) for f in fechas}
+    if any(v <= 0 for v in ufv.values()):
+        raise UFVFetchError("Valores UFV inválidos para las fechas especificadas.")
+
+    # Mismas fórmulas que MantenimientoValor, Interes y Sancion en modo exacto,
+    # sin crear un objeto por fila
+    resultado = {"TO": [], "MV": [], "I": [], "S": [], "DT": [], "errores": []}
+    col_to, col_mv, col_i, col_s, col_dt = (resultado[k] for k in ("TO", "MV", "I", "S", "DT"))
+    for fila, (to, venc, pago, t, d, p) in enumerate(zip(to_c, fi, ff, tasa_c, dias_c, porc_c)):
+        to = a_decimal(to)
+        u_venc, u_pago = ufv[str(venc)], ufv[str(pago)]
+        mv = (to * (u_pago - u_venc) / u_venc).quantize(CENTAVO, rounding=redondeo)
+        if mv < 0:  # como en calcular_lote: la fila queda sin resultado
+            to = to.quantize(CENTAVO, rounding=redondeo)
+            col_to.append(to)
+            for col in (col_mv, col_i, col_s, col_dt):
+                col.append(None)
+            resultado["errores"].append(fila)
+            continue
+        i = ((to + mv) * a_decimal(t) * a_decimal(d) / 36000).quantize(CENTAVO, rounding=redondeo)
+        s = (to * a_decimal(p) / 100).quantize(CENTAVO, rounding=redondeo)
+        to = to.quantize(CENTAVO, rounding=redondeo)
+        col_to.append(to)
+        col_mv.append(mv)
+        col_i.append(i)
+        col_s.append(s)
+        col_dt.append(to + mv + i + s)
+    return resultado
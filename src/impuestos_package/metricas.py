@@ -0,0 +1,155 @@
+"""
+Instrumentación del camino de cálculo y de la consulta de UFV.
+
+Los módulos del paquete reportan dos tipos de eventos:
+
+- tiempos (en segundos) de cada etapa: ``ufv.consulta``, ``ufv.descarga``,
+  ``ufv.parse``, ``calculo.mv``, ``calculo.interes``, ``calculo.sancion`` y
+  ``calculo.total``;
+- contadores: ``cache.disco.aciertos`` / ``cache.disco.fallos``,
+  ``cache.memoria.aciertos`` / ``cache.memoria.fallos``, ``ufv.reintentos``,
+  ``ufv.errores`` y ``calculo.errores``.
+
+Los eventos se entregan a los receptores registrados con `registrar`:
+cualquier objeto con ``tiempo(nombre, segundos)`` y ``contar(nombre, n)``
+sirve (por ejemplo, un adaptador a Prometheus o StatsD). `Metricas` es un
+receptor en memoria con percentiles.
+
+Sin receptores registrados la instrumentación no mide nada: `cronometro`
+devuelve un objeto nulo y `contar` retorna de inmediato, así que el costo
+es de una llamada vacía por etapa.
+
+Ejemplo:
+    from impuestos_package import metricas
+
+    registro = metricas.registrar(metricas.Metricas())
+    calc.calcular()
+    print(registro.resumen())
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from array import array
+from typing import Dict, List
+
+_receptores: List = []
+
+
+def registrar(receptor):
+    """Agrega un receptor de métricas y lo devuelve."""
+    global _receptores
+    if receptor not in _receptores:
+        # Se reemplaza la lista (no se modifica) para no cortar a quien la está recorriendo
+        _receptores = _receptores + [receptor]
+    return receptor
+
+
+def quitar(receptor) -> None:
+    """Deja de enviar eventos a `receptor`."""
+    global _receptores
+    _receptores = [r for r in _receptores if r is not receptor]
+
+
+def activa() -> bool:
+    """True si hay al menos un receptor registrado."""
+    return bool(_receptores)
+
+
+def tiempo(nombre: str, segundos: float) -> None:
+    for receptor in _receptores:
+        receptor.tiempo(nombre, segundos)
+
+
+def contar(nombre: str, n: int = 1) -> None:
+    for receptor in _receptores:
+        receptor.contar(nombre, n)
+
+
+class _CronometroNulo:
+    __slots__ = ()
+
+    def marcar(self, nombre: str) -> None:
+        pass
+
+    def total(self, nombre: str) -> None:
+        pass
+
+
+_NULO = _CronometroNulo()
+
+
+class Cronometro:
+    """Mide etapas consecutivas: cada `marcar` reporta el tiempo desde la marca anterior."""
+
+    __slots__ = ("_inicio", "_ultimo")
+
+    def __init__(self) -> None:
+        self._inicio = self._ultimo = time.perf_counter()
+
+    def marcar(self, nombre: str) -> None:
+        ahora = time.perf_counter()
+        tiempo(nombre, ahora - self._ultimo)
+        self._ultimo = ahora
+
+    def total(self, nombre: str) -> None:
+        """Reporta el tiempo desde que se creó el cronómetro."""
+        tiempo(nombre, time.perf_counter() - self._inicio)
+
+
+def cronometro():
+    """Un `Cronometro` si la instrumentación está activa; si no, uno que no hace nada."""
+    return Cronometro() if _receptores else _NULO
+
+
+class Metricas:
+    """
+    Receptor en memoria: guarda cada duración y suma los contadores.
+
+    Pensado para diagnóstico; en producción conviene un receptor que
+    agregue (histogramas) en lugar de guardar cada muestra.
+    """
+
+    def __init__(self) -> None:
+        self._tiempos: Dict[str, array] = {}
+        self.contadores: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def tiempo(self, nombre: str, segundos: float) -> None:
+        with self._lock:
+            muestras = self._tiempos.get(nombre)
+            if muestras is None:
+                muestras = self._tiempos[nombre] = array("d")
+            muestras.append(segundos)
+
+    def contar(self, nombre: str, n: int = 1) -> None:
+        with self._lock:
+            self.contadores[nombre] = self.contadores.get(nombre, 0) + n
+
+    def tiempos(self, nombre: str) -> List[float]:
+        with self._lock:
+            return list(self._tiempos.get(nombre, ()))
+
+    def resumen(self) -> Dict[str, Dict[str, float]]:
+        """Por cada etapa: cantidad, total, p50 y p99 (en ms); más los contadores."""
+        with self._lock:
+            copia = {k: sorted(v) for k, v in self._tiempos.items()}
+            contadores = dict(self.contadores)
+        datos: Dict[str, Dict[str, float]] = {}
+        for nombre, muestras in copia.items():
+            n = len(muestras)
+            datos[nombre] = {
+                "n": n,
+                "total_ms": sum(muestras) * 1000,
+                "p50_ms": muestras[max(math.ceil(0.50 * n), 1) - 1] * 1000,
+                "p99_ms": muestras[max(math.ceil(0.99 * n), 1) - 1] * 1000,
+            }
+        datos["contadores"] = contadores
+        return datos
+
+    def reiniciar(self) -> None:
+        with self._lock:
+            self._tiempos.clear()
+            self.contadores.clear()
@@ -0,0 +1,103 @@
+"""
+Motor de cálculo sin estado.
+
+`CalculadoraDeuda` está pensada para un cálculo con seguimiento: al crearla
+arma una `Pila`, una `Cola` y un `ArbolDeuda`, formatea la fecha y hora, y
+en cada `calcular()` reconstruye el árbol. Para grandes volúmenes, `MotorDeuda`
+hace sólo la consulta de UFV y la aritmética:
+
+- no guarda nada entre llamadas, así que una misma instancia se comparte
+  entre hilos sin bloqueos (el proveedor de UFV debe serlo también, como
+  `BCBAPIUFV`, `UFVArchivo` o `CadenaUFV`);
+- devuelve un `ResultadoDeuda` (una tupla con nombre) en lugar de un dict;
+- los errores se lanzan como excepciones (`ValueError`, `UFVFetchError`) en
+  lugar de devolverse como ``{"error": ...}``.
+
+Los resultados son idénticos a los de `CalculadoraDeuda` con las mismas
+opciones.
+
+Ejemplo:
+    motor = MotorDeuda(api=UFVArchivo.desde_archivo("ufv.bin"))
+    r = motor.calcular(1500, "2025-01-01", "2025-06-01", tasa=6, dias=150, porcentaje=20)
+    r.DT
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, NamedTuple, Optional
+
+from .interes import Interes
+from .mv import MantenimientoValor
+from .redondeo import REDONDEO_POR_DEFECTO, a_decimal, redondear
+from .sancion import Sancion
+from .ufv import BCBAPIUFV, UFVFetchError, _resolver_ufvs
+
+
+class ResultadoDeuda(NamedTuple):
+    """
+    Resultado compacto de un cálculo: floats, o `Decimal` en modo exacto.
+
+    Es una tupla (sin ``__dict__``), así que ocupa una fracción de lo que
+    ocupa el dict que devuelve `CalculadoraDeuda.calcular()`.
+    """
+    TO: Any
+    MV: Any
+    I: Any
+    S: Any
+    DT: Any
+
+    def to_dict(self, fecha_calculo: Optional[str] = None) -> Dict[str, Any]:
+        """El dict de `CalculadoraDeuda.calcular()`; con `fecha_calculo` incluye "Fecha de Cálculo"."""
+        datos = {"TO": self.TO, "MV": self.MV, "I": self.I, "S": self.S, "DT": self.DT}
+        if fecha_calculo is not None:
+            datos["Fecha de Cálculo"] = fecha_calculo
+        return datos
+
+
+class MotorDeuda:
+    __slots__ = ("api", "exacto", "redondeo")
+
+    def __init__(self, api=None, exacto: bool = False, redondeo: str = REDONDEO_POR_DEFECTO) -> None:
+        """
+        api: proveedor de UFV compartido por todos los cálculos (por defecto, un `BCBAPIUFV`).
+        exacto / redondeo: como en `CalculadoraDeuda`.
+        """
+        self.api = api if api is not None else BCBAPIUFV()
+        self.exacto = exacto
+        self.redondeo = redondeo
+
+    def calcular(self, TO: float, fecha_inicio: str, fecha_fin: str, tasa: float, dias: int,
+                 porcentaje: float) -> ResultadoDeuda:
+        """Consulta las dos UFV y aplica las fórmulas."""
+        valores = _resolver_ufvs(self.api, (str(fecha_inicio), str(fecha_fin)))
+        ufv_venc, ufv_pago = valores.get(str(fecha_inicio)), valores.get(str(fecha_fin))
+        if not ufv_venc or not ufv_pago:
+            raise UFVFetchError("Valores UFV inválidos para las fechas especificadas.")
+        return self.calcular_con_ufvs(TO, ufv_venc, ufv_pago, tasa, dias, porcentaje)
+
+    def calcular_con_ufvs(self, TO: float, ufv_venc: float, ufv_pago: float, tasa: float, dias: int,
+                          porcentaje: float) -> ResultadoDeuda:
+        """Sólo la aritmética, con las UFV ya conocidas."""
+        if self.exacto:
+            mv = MantenimientoValor(TO, ufv_pago, ufv_venc, exacto=True, redondeo=self.redondeo).calcular()
+            i = Interes(TO, mv, tasa, dias, exacto=True, redondeo=self.redondeo).calcular()
+            s = Sancion(TO, porcentaje, exacto=True, redondeo=self.redondeo).calcular()
+            to = redondear(a_decimal(TO), self.redondeo)
+            return ResultadoDeuda(to, mv, i, s, to + mv + i + s)
+
+        # Mismas fórmulas y redondeos que MantenimientoValor, Interes y Sancion,
+        # sin crear los tres objetos en cada llamada
+        if TO < 0 or tasa < 0 or dias < 0 or porcentaje < 0:
+            raise ValueError("Los parámetros no pueden ser negativos.")
+        if ufv_pago <= 0 or ufv_venc <= 0:
+            raise ValueError("Los valores UFV deben ser mayores que cero.")
+        TO = float(TO)
+        mv = round(TO * ((float(ufv_pago) / float(ufv_venc)) - 1.0), 2)
+        if mv < 0:  # UFV en baja: Interes rechaza un MV negativo
+            raise ValueError("Ningún valor puede ser negativo.")
+        i = round((TO + mv) * (tasa / 100.0) * (dias / 360.0), 2)
+        s = round(TO * (float(porcentaje) / 100.0), 2)
+        return ResultadoDeuda(round(TO, 2), mv, i, s, round(TO + mv + i + s, 2))
+
+    def __repr__(self):
+        return f"MotorDeuda(api={self.api!r}, exacto={self.exacto})"
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from .redondeo import REDONDEO_POR_DEFECTO, a_decimal, redondear
+
 class MantenimientoValor:
     """
     Calcula el Mantenimiento de Valor (MV) usando UFV.
@@ -15,21 +17,37 @@ class MantenimientoValor:
         Valor de la UFV en la fecha de pago.
     ufv_venc : float
         Valor de la UFV en la fecha de vencimiento.
+    exacto : bool
+        Si es True, calcula con Decimal y devuelve un Decimal.
+    redondeo : str
+        Política de redondeo a centavos en modo exacto (ROUND_HALF_UP por defecto).
 
     Reglas:
     - TO no puede ser negativo.
     - UFV_pago y UFV_venc deben ser > 0.
     """
-    def __init__(self, TO: float, ufv_pago: float, ufv_venc: float) -> None:
+    def __init__(self, TO: float, ufv_pago: float, ufv_venc: float,
+                 exacto: bool = False, redondeo: str = REDONDEO_POR_DEFECTO) -> None:
         if TO < 0:
             raise ValueError("El monto TO no puede ser negativo.")
         if ufv_pago <= 0 or ufv_venc <= 0:
             raise ValueError("Los valores UFV deben ser mayores que cero.")
 
-        self.TO = float(TO)
-        self.ufv_pago = float(ufv_pago)
-        self.ufv_venc = float(ufv_venc)
+        self.exacto = exacto
+        self.redondeo = redondeo
+        if exacto:
+            self.TO = a_decimal(TO)
+            self.ufv_pago = a_decimal(ufv_pago)
+            self.ufv_venc = a_decimal(ufv_venc)
+        else:
+            self.TO = float(TO)
+            self.ufv_pago = float(ufv_pago)
+            self.ufv_venc = float(ufv_venc)
 
-    def calcular(self) -> float:
+    def calcular(self):
+        if self.exacto:
+            # TO * (pago - venc) / venc: una sola división
+            mv = self.TO * (self.ufv_pago - self.ufv_venc) / self.ufv_venc
+            return redondear(mv, self.redondeo)
         mv = self.TO * ((self.ufv_pago / self.ufv_venc) - 1.0)
         return round(mv, 2)
@@ -0,0 +1,172 @@
+"""
+Interfaz de proveedores de UFV y caché por niveles.
+
+Cualquier objeto con ``valores_en(fechas)`` y ``valor_en(fecha)`` sirve como
+proveedor de UFV (`BCBAPIUFV`, `UFVArchivo`, `CadenaUFV`, ...) y puede
+inyectarse en `CalculadoraDeuda` mediante ``api=``.
+
+`CadenaUFV` compone niveles de caché delante de un proveedor de origen:
+
+    memoria (LRU acotada) → disco (CacheUFV) → API del BCB
+
+Cada consulta baja por la cadena sólo con las fechas que el nivel anterior
+no tenía, y lo obtenido más abajo se copia a los niveles superiores. Cada
+nivel lleva sus propios contadores de aciertos y fallos.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Protocol, Sequence, Tuple, runtime_checkable
+
+from . import metricas
+from .ufv import BCBAPIUFV, UFVFetchError
+from .ufv_cache import CacheUFV
+
+
+@runtime_checkable
+class ProveedorUFV(Protocol):
+    """Lo mínimo que `CalculadoraDeuda` necesita de un proveedor de UFV."""
+
+    def valores_en(self, fechas: List[str]) -> Dict[str, float]: ...
+
+    def valor_en(self, fecha: str) -> float: ...
+
+
+class NivelMemoria:
+    """
+    Caché LRU en memoria, acotada a `capacidad` fechas.
+
+    Los valores de hoy o de fechas futuras expiran a los `ttl_hoy` segundos,
+    por si el BCB todavía no los publicó o los corrige; los pasados no expiran.
+    """
+
+    nombre = "memoria"
+
+    def __init__(self, capacidad: int = 10000, ttl_hoy: float = 3600.0) -> None:
+        self.capacidad = capacidad
+        self.ttl_hoy = ttl_hoy
+        self.aciertos = 0
+        self.fallos = 0
+        self._datos: "OrderedDict[str, Tuple[float, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def buscar(self, fechas: Sequence[str]) -> Dict[str, float]:
+        encontrados = {}
+        ahora = time.monotonic()
+        with self._lock:
+            for f in fechas:
+                entrada = self._datos.get(f)
+                if entrada is not None and (entrada[1] is None or entrada[1] > ahora):
+                    self._datos.move_to_end(f)
+                    encontrados[f] = entrada[0]
+                elif entrada is not None:
+                    del self._datos[f]  # vencida
+            self.aciertos += len(encontrados)
+            self.fallos += len(fechas) - len(encontrados)
+        metricas.contar("cache.memoria.aciertos", len(encontrados))
+        metricas.contar("cache.memoria.fallos", len(fechas) - len(encontrados))
+        return encontrados
+
+    def guardar(self, pares: Iterable[Tuple[str, float]]) -> None:
+        hoy = date.today().isoformat()
+        vence = time.monotonic() + self.ttl_hoy
+        with self._lock:
+            for f, v in pares:
+                self._datos[f] = (v, vence if f >= hoy else None)
+                self._datos.move_to_end(f)
+            while len(self._datos) > self.capacidad:
+                self._datos.popitem(last=False)
+
+    def __len__(self):
+        return len(self._datos)
+
+
+class NivelDisco:
+    """Adaptador de `CacheUFV` (SQLite) como nivel de la cadena."""
+
+    nombre = "disco"
+
+    def __init__(self, cache: CacheUFV) -> None:
+        self.cache = cache
+        self.aciertos = 0
+        self.fallos = 0
+
+    def buscar(self, fechas: Sequence[str]) -> Dict[str, float]:
+        encontrados = self.cache.obtener(fechas)
+        self.aciertos += len(encontrados)
+        self.fallos += len(fechas) - len(encontrados)
+        return encontrados
+
+    def guardar(self, pares: Iterable[Tuple[str, float]]) -> None:
+        self.cache.guardar(pares)
+
+
+class CadenaUFV:
+    """
+    Proveedor compuesto: consulta los `niveles` en orden y, al final, el `origen`.
+
+    niveles: objetos con ``buscar(fechas)`` y ``guardar(pares)``
+             (`NivelMemoria`, `NivelDisco`, ...).
+    origen: proveedor final (`BCBAPIUFV`, `UFVArchivo`, ...).
+    """
+
+    def __init__(self, niveles: Sequence, origen) -> None:
+        self.niveles = list(niveles)
+        self.origen = origen
+        self.consultas_origen = 0
+
+    @property
+    def version(self):
+        """La versión de la serie del origen, si la tiene."""
+        return getattr(self.origen, "version", None)
+
+    def valores_en(self, fechas: List[str], timeout: int = 10) -> Dict[str, float]:
+        pedidas = sorted({str(f) for f in fechas})
+        valores: Dict[str, float] = {}
+        faltantes = pedidas
+        consultados = []
+        for nivel in self.niveles:
+            if not faltantes:
+                break
+            encontrados = nivel.buscar(faltantes)
+            if encontrados:
+                # Sube a los niveles más rápidos lo que estaba más abajo
+                for superior in consultados:
+                    superior.guardar(encontrados.items())
+                valores.update(encontrados)
+                faltantes = [f for f in faltantes if f not in encontrados]
+            consultados.append(nivel)
+
+        if faltantes:
+            self.consultas_origen += 1
+            obtenidos = self.origen.valores_en(faltantes)
+            for nivel in self.niveles:
+                nivel.guardar(obtenidos.items())
+            valores.update(obtenidos)
+
+        sin_valor = [f for f in pedidas if f not in valores]
+        if sin_valor:
+            raise UFVFetchError(f"No hay valores UFV para las fechas: {', '.join(sin_valor)}")
+        return {f: valores[f] for f in pedidas}
+
+    def valor_en(self, fecha: str, timeout: int = 10) -> float:
+        return self.valores_en([fecha], timeout)[str(fecha)]
+
+    def estadisticas(self) -> Dict[str, Dict[str, int]]:
+        """Aciertos y fallos de cada nivel, más las consultas al origen."""
+        datos = {n.nombre: {"aciertos": n.aciertos, "fallos": n.fallos} for n in self.niveles}
+        datos["origen"] = {"consultas": self.consultas_origen}
+        return datos
+
+
+def crear_cadena(ruta_cache: Optional[str] = None, capacidad: int = 10000, ttl_hoy: float = 3600.0,
+                 origen=None) -> CadenaUFV:
+    """Cadena habitual: memoria → disco (si se indica `ruta_cache`) → API del BCB."""
+    niveles = [NivelMemoria(capacidad, ttl_hoy)]
+    if ruta_cache:
+        niveles.append(NivelDisco(CacheUFV(ruta_cache)))
+    return CadenaUFV(niveles, origen if origen is not None else BCBAPIUFV())
@@ -0,0 +1,33 @@
+"""
+Aritmética decimal exacta y política de redondeo.
+
+En modo exacto, los importes se calculan con `decimal.Decimal` y se redondean
+a centavos con una política explícita, por defecto ``ROUND_HALF_UP``: 0.005
+sube a 0.01, como en las liquidaciones del SIN. Con ``float`` y ``round(x, 2)``,
+un valor como 590.625 puede quedar representado como 590.62499... y
+redondearse hacia abajo.
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal, ROUND_HALF_UP
+
+CENTAVO = Decimal("0.01")
+REDONDEO_POR_DEFECTO = ROUND_HALF_UP
+
+
+def a_decimal(valor) -> Decimal:
+    """
+    Convierte a Decimal sin arrastrar el error binario de los float:
+    ``2.73596`` pasa a ``Decimal("2.73596")`` y no a su expansión binaria.
+    """
+    if isinstance(valor, Decimal):
+        return valor
+    if isinstance(valor, float):
+        return Decimal(repr(valor))
+    return Decimal(valor)
+
+
+def redondear(valor: Decimal, redondeo: str = REDONDEO_POR_DEFECTO) -> Decimal:
+    """Redondea a centavos con la política indicada (constantes de `decimal`)."""
+    return valor.quantize(CENTAVO, rounding=redondeo)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from .redondeo import REDONDEO_POR_DEFECTO, a_decimal, redondear
+
 class Sancion:
     """
     Calcula la Sanción (S) como un porcentaje del Total Original.
@@ -13,20 +15,33 @@ class Sancion:
         Total Original (monto base).
     porcentaje : float
         Porcentaje de sanción (ej. 20 para 20%).
+    exacto : bool
+        Si es True, calcula con Decimal y devuelve un Decimal.
+    redondeo : str
+        Política de redondeo a centavos en modo exacto (ROUND_HALF_UP por defecto).
 
     Reglas:
     - TO no puede ser negativo.
     - porcentaje no puede ser negativo.
     """
-    def __init__(self, TO: float, porcentaje: float) -> None:
+    def __init__(self, TO: float, porcentaje: float,
+                 exacto: bool = False, redondeo: str = REDONDEO_POR_DEFECTO) -> None:
         if TO < 0:
             raise ValueError("El monto TO no puede ser negativo.")
         if porcentaje < 0:
             raise ValueError("El porcentaje no puede ser negativo.")
 
-        self.TO = float(TO)
-        self.porcentaje = float(porcentaje)
+        self.exacto = exacto
+        self.redondeo = redondeo
+        if exacto:
+            self.TO = a_decimal(TO)
+            self.porcentaje = a_decimal(porcentaje)
+        else:
+            self.TO = float(TO)
+            self.porcentaje = float(porcentaje)
 
-    def calcular(self) -> float:
+    def calcular(self):
+        if self.exacto:
+            return redondear(self.TO * self.porcentaje / 100, self.redondeo)
         sancion = self.TO * (self.porcentaje / 100.0)
         return round(sancion, 2)
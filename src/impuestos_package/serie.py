@@ -0,0 +1,196 @@
+"""
+Serie UFV compacta indexada por día.
+
+`SerieUFV` guarda un valor ``float64`` por día calendario a partir de una
+fecha inicial, en memoria contigua (``array('d')``). La posición de cada
+fecha se calcula directamente desde su ordinal, así que la consulta de una
+fecha es O(1) y un rango es un simple corte. Los cortes son vistas
+(``memoryview``) sobre el mismo buffer, sin copiar datos. Los días sin
+publicación quedan como NaN.
+
+Una serie de 20 años ocupa unos 58 KB, frente a varios MB como lista de
+diccionarios.
+
+Formato binario (`guardar_binario` / `desde_binario`): una cabecera de 16
+bytes (``b"UFV1"``, 4 bytes reservados y el ordinal del primer día como
+int64 little-endian) seguida de un float64 little-endian por día. El
+archivo se abre con ``mmap``, de modo que varios procesos comparten la
+misma copia en la caché de páginas del sistema y no hay nada que parsear.
+"""
+
+from __future__ import annotations
+
+import math
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from datetime import date, timedelta
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+from .ufv import UFVFetchError
+
+Fecha = Union[str, date]
+
+MAGICO = b"UFV1"
+CABECERA = struct.Struct("<4s4xq")  # 16 bytes: mantiene alineados los float64
+
+
+def _ordinal(fecha: Fecha) -> int:
+    if isinstance(fecha, date):
+        return fecha.toordinal()
+    return date.fromisoformat(str(fecha)[:10]).toordinal()
+
+
+class SerieUFV:
+    def __init__(self, inicio: Fecha, valores) -> None:
+        """
+        inicio: fecha del primer valor.
+        valores: buffer de float64 (``array('d')``, ``memoryview``, ...), un
+                 valor por día; NaN marca los días sin dato.
+        """
+        self._inicio = _ordinal(inicio)
+        vista = memoryview(valores)
+        self._valores = vista if vista.format == "d" else vista.cast("B").cast("d")
+        self._ruta: Optional[str] = None  # archivo binario mapeado, si lo hay
+        self._mmap = None
+        self._version: Optional[str] = None
+
+    @classmethod
+    def desde_pares(cls, pares: Iterable[Tuple[Fecha, float]]) -> "SerieUFV":
+        """Construye la serie a partir de pares ``(fecha, valor)`` en cualquier orden."""
+        datos = {_ordinal(f): float(v) for f, v in pares}
+        if not datos:
+            raise UFVFetchError("La serie UFV está vacía.")
+        inicio = min(datos)
+        valores = array("d", [math.nan]) * (max(datos) - inicio + 1)
+        for ordinal, valor in datos.items():
+            valores[ordinal - inicio] = valor
+        return cls(date.fromordinal(inicio), valores)
+
+    # --- Formato binario ---------------------------------------------------------
+    def guardar_binario(self, ruta: str) -> None:
+        """Escribe la serie en el formato binario mapeable (ver docstring del módulo)."""
+        valores = array("d")
+        valores.frombytes(self._valores.tobytes())
+        if sys.byteorder != "little":
+            valores.byteswap()
+        with open(ruta, "wb") as f:
+            f.write(CABECERA.pack(MAGICO, self._inicio))
+            valores.tofile(f)
+
+    @classmethod
+    def desde_binario(cls, ruta: str) -> "SerieUFV":
+        """Mapea un archivo binario en memoria, sin copiar ni parsear los valores."""
+        with open(ruta, "rb") as f:
+            tamano = os.fstat(f.fileno()).st_size
+            if tamano < CABECERA.size or (tamano - CABECERA.size) % 8:
+                raise UFVFetchError(f"El archivo {ruta} no es una serie UFV binaria válida.")
+            mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magico, inicio = CABECERA.unpack_from(mapa)
+        if magico != MAGICO:
+            mapa.close()
+            raise UFVFetchError(f"El archivo {ruta} no es una serie UFV binaria válida.")
+
+        if sys.byteorder == "little":
+            serie = cls(date.fromordinal(inicio), memoryview(mapa)[CABECERA.size:])
+            serie._mmap = mapa
+        else:  # pragma: no cover - plataformas big-endian: se copia y se invierte
+            valores = array("d")
+            valores.frombytes(mapa[CABECERA.size:])
+            valores.byteswap()
+            mapa.close()
+            serie = cls(date.fromordinal(inicio), valores)
+        serie._ruta = ruta
+        return serie
+
+    def __reduce__(self):
+        # Una serie mapeada viaja a otros procesos como ruta: cada uno la vuelve a mapear
+        if self._ruta is not None:
+            return (SerieUFV.desde_binario, (self._ruta,))
+        valores = array("d")
+        valores.frombytes(self._valores.tobytes())
+        return (SerieUFV, (self.fecha_inicio, valores))
+
+    # --- Información general -------------------------------------------------
+    @property
+    def fecha_inicio(self) -> str:
+        return date.fromordinal(self._inicio).isoformat()
+
+    @property
+    def fecha_fin(self) -> str:
+        return date.fromordinal(self._inicio + len(self._valores) - 1).isoformat()
+
+    @property
+    def valores(self) -> memoryview:
+        """Vista de sólo lectura sobre los valores diarios (NaN = sin dato)."""
+        return self._valores.toreadonly()
+
+    @property
+    def version(self) -> str:
+        """Huella del contenido (CRC32 de los valores y la fecha inicial); cambia si cambia algún dato."""
+        if self._version is None:
+            crc = zlib.crc32(self._valores.cast("B"), self._inicio & 0xFFFFFFFF)
+            self._version = f"{self.fecha_inicio}:{len(self._valores)}:{crc:08x}"
+        return self._version
+
+    def __len__(self) -> int:
+        """Cantidad de días cubiertos (con o sin dato)."""
+        return len(self._valores)
+
+    def dias_con_valor(self) -> int:
+        return sum(1 for v in self._valores if v == v)
+
+    # --- Consultas puntuales ---------------------------------------------------
+    def _indice(self, fecha: Fecha) -> Optional[int]:
+        try:
+            indice = _ordinal(fecha) - self._inicio
+        except ValueError:
+            return None
+        return indice if 0 <= indice < len(self._valores) else None
+
+    def get(self, fecha: Fecha, default: Optional[float] = None) -> Optional[float]:
+        indice = self._indice(fecha)
+        if indice is None:
+            return default
+        valor = self._valores[indice]
+        return default if valor != valor else valor
+
+    def valor(self, fecha: Fecha) -> float:
+        """Valor UFV de `fecha`; lanza `UFVFetchError` si no hay dato."""
+        valor = self.get(fecha)
+        if valor is None:
+            raise UFVFetchError(f"No hay valores UFV para las fechas: {fecha}")
+        return valor
+
+    __getitem__ = valor
+
+    def __contains__(self, fecha) -> bool:
+        return self.get(fecha) is not None
+
+    def ratio(self, pago: Fecha, venc: Fecha) -> float:
+        """``UFV(pago) / UFV(venc)``, el factor que usa `MantenimientoValor`."""
+        return self.valor(pago) / self.valor(venc)
+
+    # --- Rangos ------------------------------------------------------------------
+    def rango(self, fecha_inicio: Fecha, fecha_fin: Fecha) -> "SerieUFV":
+        """
+        Sub-serie entre ambas fechas (inclusive), recortada a lo disponible.
+        Comparte el buffer con la serie original (no copia datos).
+        """
+        desde = max(_ordinal(fecha_inicio) - self._inicio, 0)
+        hasta = min(_ordinal(fecha_fin) - self._inicio + 1, len(self._valores))
+        if desde >= hasta:
+            raise UFVFetchError(f"No hay valores UFV entre {fecha_inicio} y {fecha_fin}.")
+        return SerieUFV(date.fromordinal(self._inicio + desde), self._valores[desde:hasta])
+
+    def items(self) -> Iterator[Tuple[str, float]]:
+        """Pares ``(fecha, valor)`` de los días con dato, en orden."""
+        for n, valor in enumerate(self._valores):
+            if valor == valor:
+                yield (date.fromordinal(self._inicio) + timedelta(days=n)).isoformat(), valor
+
+    def __repr__(self):
+        return f"SerieUFV({self.fecha_inicio} a {self.fecha_fin}, {len(self)} días)"
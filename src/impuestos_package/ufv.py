@@ -1,15 +1,106 @@
-import requests
-from typing import List, Dict, Optional
+import math
+import threading
+from array import array
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
+
+from . import metricas
+
+# requests (y con él urllib3) se importa recién al crear la primera sesión
+# HTTP: los procesos que sólo usan UFV locales no pagan ese costo al arrancar.
+if TYPE_CHECKING:  # pragma: no cover
+    import requests
 
 class UFVFetchError(Exception):
     pass
 
-class BCBAPIUFV:
+class _ConsultasEnCurso:
+    """
+    Une las consultas idénticas que ocurren al mismo tiempo ("single-flight"):
+    el primer hilo hace la descarga y los demás esperan y reciben su resultado
+    (o su error). Al terminar, la clave se libera para la próxima consulta.
+
+    Cada solicitante, incluido el primero, recibe ``copiar(resultado)``: así
+    ninguno ve lo que otro modifique. Quienes esperan lo hacen como máximo
+    `timeout` segundos; después lanzan UFVFetchError aunque la descarga siga.
+    """
+
+    class _Llamada:
+        def __init__(self):
+            self.evento = threading.Event()
+            self.resultado = None
+            self.error: Optional[BaseException] = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._en_curso: Dict[object, "_ConsultasEnCurso._Llamada"] = {}
+
+    def ejecutar(self, clave, funcion, timeout: Optional[float] = None, copiar=lambda r: r):
+        with self._lock:
+            llamada = self._en_curso.get(clave)
+            es_lider = llamada is None
+            if es_lider:
+                llamada = self._en_curso[clave] = self._Llamada()
+
+        if not es_lider:
+            if not llamada.evento.wait(timeout):
+                raise UFVFetchError(f"Tiempo de espera agotado ({timeout} s) esperando la consulta UFV en curso.")
+            if llamada.error is not None:
+                raise llamada.error
+            return copiar(llamada.resultado)
+
+        try:
+            llamada.resultado = funcion()
+            return copiar(llamada.resultado)
+        except BaseException as e:
+            llamada.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._en_curso[clave]
+            llamada.evento.set()
+
+
+# Compartido por todos los clientes del proceso: la clave es la URL consultada
+_consultas_en_curso = _ConsultasEnCurso()
+
+
+_retry_contado = None
+
+
+def _clase_retry():
+    """`Retry` de urllib3 que reporta cada reintento a `metricas` (se define al primer uso)."""
+    global _retry_contado
+    if _retry_contado is None:
+        from urllib3.util.retry import Retry
+
+        class _RetryContado(Retry):
+            def increment(self, *args, **kwargs):
+                metricas.contar("ufv.reintentos")
+                return super().increment(*args, **kwargs)
+
+        _retry_contado = _RetryContado
+    return _retry_contado
+
+
+def _fecha_payload(valor) -> Optional[str]:
+    """Fecha ISO (AAAA-MM-DD) de una fila del payload, o None si viene en otro formato."""
+    try:
+        return date.fromisoformat(str(valor).strip()[:10]).isoformat()
+    except ValueError:
+        return None
+
+
+class _BaseUFV:
+    """Lectura y validación del payload UFV, común a los clientes síncrono y asíncrono."""
     BASE_URL = "https://www.bcb.gob.bo/librerias/charts/ufv.php"
+    CLAVES_FECHA = ("fecha", "Fecha", "date", "Fec_UFV")
+    CLAVES_VALOR = ("valor", "dato", "ufv", "UFV", "value", "Val_UFV")
+    USER_AGENT = "impuestos_package/1.0 (+https://pypi.org/)"
 
     def _parse_valor(self, item: Dict) -> Optional[float]:
         # Intenta múltiples claves comunes
-        for key in ("valor", "dato", "ufv", "UFV", "value", "Val_UFV"):
+        for key in self.CLAVES_VALOR:
             if key in item:
                 raw = str(item[key]).strip()
                 raw = raw.replace(",", ".")  # por si viene con coma decimal
@@ -21,23 +112,273 @@ class BCBAPIUFV:
                     continue
         return None
 
+    def _parse_payload(self, data: List[Dict]) -> Tuple[Optional[List[str]], array]:
+        """
+        Convierte todo el payload de una vez. El esquema (claves de valor y de
+        fecha) se detecta en la primera fila y la columna de valores se
+        convierte en bloque a un ``array('d')``. Si alguna fila no sigue ese
+        esquema, se vuelve a la lectura fila por fila con `_parse_valor`.
+
+        El formato de fecha también se valida una sola vez, en la primera y
+        la última fila; el resto solo se recorta a ``AAAA-MM-DD`` con una
+        comprobación barata de los separadores.
+
+        Devuelve ``(fechas, valores)``; `fechas` es None si el payload no trae
+        fechas ISO (p. ej. "15/03/2023"): quien llama asocia entonces los
+        valores por posición o por consulta puntual. Las filas sin valor
+        válido quedan como NaN.
+        """
+        if not data:
+            return None, array("d")
+        primera = data[0]
+        clave_valor = next((k for k in self.CLAVES_VALOR if k in primera), None)
+        clave_fecha = next((k for k in self.CLAVES_FECHA if k in primera), None)
+        try:
+            crudos = [item[clave_valor] for item in data]
+            if isinstance(crudos[0], str):
+                valores = array("d", map(float, [c.replace(",", ".") for c in crudos]))
+            else:
+                valores = array("d", crudos)
+            # Un NaN fuera de la primera fila no detiene min(); quien llama lo
+            # detecta al sumar, igual que los NaN de la lectura fila a fila
+            if not min(valores) > 0:
+                raise ValueError("valores no positivos")
+            return (self._fechas_en_bloque(data, clave_fecha) if clave_fecha else None), valores
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return self._parse_payload_por_fila(data)
+
+    @staticmethod
+    def _fechas_en_bloque(data: List[Dict], clave_fecha: str) -> Optional[List[str]]:
+        fechas = [str(item[clave_fecha])[:10] for item in data]
+        if _fecha_payload(fechas[0]) != fechas[0] or _fecha_payload(fechas[-1]) != fechas[-1]:
+            return None  # el payload no trae fechas ISO
+        if all(f[4:5] == "-" == f[7:8] for f in fechas):
+            return fechas
+        # Alguna fila con otro formato (espacios, separadores): se valida una por una
+        fechas = [_fecha_payload(item[clave_fecha]) for item in data]
+        return None if None in fechas else fechas
+
+    def _parse_payload_por_fila(self, data: List[Dict]) -> Tuple[Optional[List[str]], array]:
+        valores = array("d")
+        fechas: Optional[List[str]] = []
+        for item in data:
+            valor = self._parse_valor(item)
+            valores.append(math.nan if valor is None else valor)
+            if fechas is not None:
+                fecha = next((_fecha_payload(item[k]) for k in self.CLAVES_FECHA if k in item), None)
+                if fecha is None:
+                    fechas = None
+                else:
+                    fechas.append(fecha)
+        return fechas, valores
+
+    def _asociar_fechas(self, data: List[Dict], fecha_inicio: str, fecha_fin: str) -> Optional[List[Tuple[str, float]]]:
+        """
+        Empareja cada fila con su fecha. Usa la fecha de la fila si viene en el
+        payload; si no, asume una fila por día desde `fecha_inicio`.
+        Devuelve None si no se puede asociar con seguridad.
+        """
+        crono = metricas.cronometro()
+        fechas, valores = self._parse_payload(data)
+        crono.marcar("ufv.parse")
+        total = sum(valores)
+        if total != total:  # alguna fila sin valor válido (NaN)
+            return None
+        if fechas is None:
+            ini = date.fromisoformat(fecha_inicio)
+            if len(valores) != (date.fromisoformat(fecha_fin) - ini).days + 1:
+                return None
+            fechas = [(ini + timedelta(days=n)).isoformat() for n in range(len(valores))]
+        return list(zip(fechas, valores))
+
+    def _agrupar(self, fechas: List[str]) -> List[Tuple[str, str]]:
+        """Agrupa fechas ordenadas en rangos cuyos saltos no superan `max_hueco` días."""
+        grupos: List[Tuple[str, str]] = []
+        previa = None
+        for f in fechas:
+            dia = date.fromisoformat(f)
+            if previa is not None and (dia - previa).days <= self.max_hueco:
+                grupos[-1] = (grupos[-1][0], f)
+            else:
+                grupos.append((f, f))
+            previa = dia
+        return grupos
+
+    def _url(self, fecha_inicio: str, fecha_fin: str) -> str:
+        return f"{self.BASE_URL}?cFecIni={fecha_inicio}&cFecFin={fecha_fin}"
+
+    def _validar_datos(self, data) -> List[Dict]:
+        if not isinstance(data, list) or not data:
+            raise UFVFetchError("La API UFV devolvió un formato inesperado o vacío.")
+        # Valida que al menos las puntas tengan valor parseable
+        if self._parse_valor(data[0]) is None or self._parse_valor(data[-1]) is None:
+            raise UFVFetchError("No se pudieron leer valores UFV válidos para las fechas.")
+        return data
+
+class BCBAPIUFV(_BaseUFV):
+
+    def __init__(self, cache=None, max_hueco: int = 31, session: Optional["requests.Session"] = None,
+                 pool_maxsize: int = 10, reintentos: int = 3, backoff: float = 0.5, offline: bool = False):
+        """
+        cache: almacén opcional (p. ej. `CacheUFV`) para no volver a pedir
+               a la API días ya consultados.
+        max_hueco: en `valores_en`, fechas separadas por hasta esta cantidad
+                   de días se piden en una sola consulta de rango.
+        session: sesión HTTP propia; si no se indica, se crea una con
+                 conexiones persistentes (keep-alive) al primer uso.
+        pool_maxsize: conexiones reutilizables por host.
+        reintentos / backoff: reintentos con espera exponencial ante 5xx.
+        offline: nunca consulta la red; sólo responde lo que haya en `cache`.
+
+        Una misma instancia puede compartirse entre hilos y entre todas las
+        `CalculadoraDeuda` del proceso.
+        """
+        self.cache = cache
+        self.max_hueco = max_hueco
+        self.pool_maxsize = pool_maxsize
+        self.reintentos = reintentos
+        self.backoff = backoff
+        self.offline = offline
+        self._session = session
+        self._lock = threading.Lock()
+
+    def _sesion(self) -> "requests.Session":
+        """Sesión HTTP compartida; se crea una sola vez aunque la pidan varios hilos."""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    retry = _clase_retry()(total=self.reintentos, backoff_factor=self.backoff,
+                                           status_forcelist=(500, 502, 503, 504), raise_on_status=False)
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize, max_retries=retry)
+                    session = requests.Session()
+                    session.headers["User-Agent"] = self.USER_AGENT
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def cerrar(self) -> None:
+        """Cierra las conexiones abiertas de la sesión."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    # La sesión y el candado no viajan a otros procesos; se recrean allá.
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        estado["_session"] = None
+        del estado["_lock"]
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._lock = threading.Lock()
+
     def consumir_endpoint(self, fecha_inicio: str, fecha_fin: Optional[str] = None, timeout: int = 10) -> List[Dict]:
         if not fecha_fin:
             fecha_fin = fecha_inicio
+        if self.cache is None:
+            return self._consultar_api(fecha_inicio, fecha_fin, timeout)
+
+        # Sólo se piden a la API los tramos que faltan en el caché
+        for ini, fin in self.cache.huecos(fecha_inicio, fecha_fin):
+            data = self._consultar_api(ini, fin, timeout)
+            pares = self._asociar_fechas(data, ini, fin)
+            if pares is None:
+                # Sin fechas confiables no se guarda nada; se responde directo de la API
+                if (ini, fin) == (fecha_inicio, fecha_fin):
+                    return data
+                return self._consultar_api(fecha_inicio, fecha_fin, timeout)
+            self.cache.guardar(pares)
+
+        valores = self.cache.obtener_rango(fecha_inicio, fecha_fin)
+        if not valores:
+            raise UFVFetchError("No hay valores UFV para las fechas solicitadas.")
+        return [{"fecha": f, "valor": v} for f, v in valores.items()]
+
+    def valor_en(self, fecha: str, timeout: int = 10) -> float:
+        """Valor UFV de una sola fecha."""
+        return self.valores_en([fecha], timeout)[str(fecha)]
+
+    def serie(self, fecha_inicio: str, fecha_fin: str, timeout: int = 10):
+        """Descarga el rango y lo devuelve como `SerieUFV` compacta."""
+        from .serie import SerieUFV  # serie.py importa este módulo
+
+        data = self.consumir_endpoint(fecha_inicio, fecha_fin, timeout)
+        pares = self._asociar_fechas(data, fecha_inicio, fecha_fin)
+        if pares is None:
+            raise UFVFetchError("No se pudo asociar cada valor UFV con su fecha.")
+        return SerieUFV.desde_pares(pares)
+
+    def valores_en(self, fechas: List[str], timeout: int = 10) -> Dict[str, float]:
+        """
+        Valores UFV de fechas puntuales, sin descargar todo el rango entre ellas.
+        Las fechas cercanas se agrupan para hacer la menor cantidad de consultas.
+        """
+        pedidas = sorted({str(f) for f in fechas})
+        valores = self.cache.obtener(pedidas) if self.cache is not None else {}
+        faltantes = [f for f in pedidas if f not in valores]
 
-        url = f"{self.BASE_URL}?cFecIni={fecha_inicio}&cFecFin={fecha_fin}"
+        for ini, fin in self._agrupar(faltantes):
+            data = self._consultar_api(ini, fin, timeout)
+            pares = self._asociar_fechas(data, ini, fin)
+            if pares is None:
+                if ini != fin:
+                    # Sin fechas confiables en el rango: consulta puntual por fecha
+                    grupo = [f for f in faltantes if ini <= f <= fin]
+                    pares = [(f, self._parse_valor(self._consultar_api(f, f, timeout)[0])) for f in grupo]
+                else:
+                    pares = [(ini, self._parse_valor(data[0]))]
+            if self.cache is not None:
+                self.cache.guardar(pares)
+            valores.update(pares)
+
+        sin_valor = [f for f in pedidas if f not in valores]
+        if sin_valor:
+            raise UFVFetchError(f"No hay valores UFV para las fechas: {', '.join(sin_valor)}")
+        return {f: valores[f] for f in pedidas}
+
+    def _consultar_api(self, fecha_inicio: str, fecha_fin: str, timeout: int = 10) -> List[Dict]:
+        """Consulta la API; las consultas idénticas simultáneas comparten una sola descarga."""
+        if self.offline:
+            raise UFVFetchError(f"Modo sin conexión: no hay UFV guardadas para {fecha_inicio} a {fecha_fin}.")
+        url = self._url(fecha_inicio, fecha_fin)
+        return _consultas_en_curso.ejecutar(url, lambda: self._descargar(url, timeout), timeout,
+                                            copiar=lambda filas: [dict(fila) for fila in filas])
+
+    def _descargar(self, url: str, timeout: int) -> List[Dict]:
+        import requests
+
+        crono = metricas.cronometro()
         try:
-            headers = {"User-Agent": "impuestos_package/1.0 (+https://pypi.org/)"}
-            r = requests.get(url, timeout=timeout, headers=headers)
+            r = self._sesion().get(url, timeout=timeout)
             r.raise_for_status()
-            data = r.json()
-            if not isinstance(data, list) or not data:
-                raise UFVFetchError("La API UFV devolvió un formato inesperado o vacío.")
-            # Valida que al menos las puntas tengan valor parseable
-            if self._parse_valor(data[0]) is None or self._parse_valor(data[-1]) is None:
-                raise UFVFetchError("No se pudieron leer valores UFV válidos para las fechas.")
-            return data
+            return self._validar_datos(r.json())
         except requests.RequestException as e:
+            metricas.contar("ufv.errores")
             raise UFVFetchError(f"Error de red al consultar UFV: {e}") from e
         except ValueError as e:
+            metricas.contar("ufv.errores")
             raise UFVFetchError(f"Respuesta no JSON o inválida: {e}") from e
+        except UFVFetchError:
+            metricas.contar("ufv.errores")
+            raise
+        finally:
+            crono.total("ufv.descarga")
+
+
+def _resolver_ufvs(api, fechas) -> Dict[str, float]:
+    """Obtiene el valor UFV de cada fecha distinta con la menor cantidad de consultas."""
+    if hasattr(api, "valores_en"):
+        return api.valores_en(list(fechas))
+    # Clientes que sólo exponen consumir_endpoint: una consulta por fecha distinta
+    valores = {}
+    for f in fechas:
+        valor = api._parse_valor(api.consumir_endpoint(f, f)[0])
+        if not valor:
+            raise UFVFetchError(f"Valor UFV inválido para la fecha {f}.")
+        valores[f] = valor
+    return valores
@@ -0,0 +1,144 @@
+"""
+Cliente UFV asíncrono (asyncio).
+
+`AsyncBCBAPIUFV` ofrece la misma lectura, validación y errores que
+`BCBAPIUFV`, pero sus consultas se esperan con ``await`` para que muchos
+cálculos compartan un mismo event loop. Limita la concurrencia hacia el BCB
+y une las consultas idénticas que están en curso en una sola.
+
+Requiere el extra opcional ``async``: ``pip install impuestos-package[async]``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - depende del entorno
+    httpx = None
+
+from . import metricas
+from .ufv import _BaseUFV, UFVFetchError
+
+
+class AsyncBCBAPIUFV(_BaseUFV):
+    def __init__(self, cache=None, max_hueco: int = 31, max_concurrencia: int = 10,
+                 base_url: Optional[str] = None, client=None):
+        """
+        cache: almacén opcional (p. ej. `CacheUFV`), igual que en `BCBAPIUFV`.
+        max_hueco: agrupación de fechas cercanas en `valores_en`.
+        max_concurrencia: consultas simultáneas como máximo hacia la API.
+        base_url: permite apuntar a otro servidor (p. ej. uno local de pruebas).
+        client: `httpx.AsyncClient` propio; si no, se crea al primer uso.
+        """
+        if httpx is None and client is None:
+            raise ImportError("AsyncBCBAPIUFV requiere httpx: pip install impuestos-package[async]")
+        self.cache = cache
+        self.max_hueco = max_hueco
+        self.max_concurrencia = max_concurrencia
+        if base_url:
+            self.BASE_URL = base_url
+        self._client = client
+        self._semaforo: Optional[asyncio.Semaphore] = None
+        self._en_curso: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    def _cliente(self):
+        if self._client is None:
+            limites = httpx.Limits(max_connections=self.max_concurrencia,
+                                   max_keepalive_connections=self.max_concurrencia)
+            self._client = httpx.AsyncClient(limits=limites, headers={"User-Agent": self.USER_AGENT})
+        return self._client
+
+    async def cerrar(self) -> None:
+        """Cierra las conexiones del cliente HTTP."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def consumir_endpoint(self, fecha_inicio: str, fecha_fin: Optional[str] = None, timeout: int = 10) -> List[Dict]:
+        if not fecha_fin:
+            fecha_fin = fecha_inicio
+        if self.cache is None:
+            return await self._consultar_api(fecha_inicio, fecha_fin, timeout)
+
+        for ini, fin in self.cache.huecos(fecha_inicio, fecha_fin):
+            data = await self._consultar_api(ini, fin, timeout)
+            pares = self._asociar_fechas(data, ini, fin)
+            if pares is None:
+                if (ini, fin) == (fecha_inicio, fecha_fin):
+                    return data
+                return await self._consultar_api(fecha_inicio, fecha_fin, timeout)
+            self.cache.guardar(pares)
+
+        valores = self.cache.obtener_rango(fecha_inicio, fecha_fin)
+        if not valores:
+            raise UFVFetchError("No hay valores UFV para las fechas solicitadas.")
+        return [{"fecha": f, "valor": v} for f, v in valores.items()]
+
+    async def valor_en(self, fecha: str, timeout: int = 10) -> float:
+        """Valor UFV de una sola fecha."""
+        return (await self.valores_en([fecha], timeout))[str(fecha)]
+
+    async def valores_en(self, fechas: List[str], timeout: int = 10) -> Dict[str, float]:
+        """Versión asíncrona de `BCBAPIUFV.valores_en`; los grupos se piden en paralelo."""
+        pedidas = sorted({str(f) for f in fechas})
+        valores = self.cache.obtener(pedidas) if self.cache is not None else {}
+        faltantes = [f for f in pedidas if f not in valores]
+
+        grupos = self._agrupar(faltantes)
+        respuestas = await asyncio.gather(*(self._consultar_api(ini, fin, timeout) for ini, fin in grupos))
+        for (ini, fin), data in zip(grupos, respuestas):
+            pares = self._asociar_fechas(data, ini, fin)
+            if pares is None:
+                grupo = [f for f in faltantes if ini <= f <= fin]
+                if ini != fin:
+                    puntuales = await asyncio.gather(*(self._consultar_api(f, f, timeout) for f in grupo))
+                else:
+                    puntuales = [data]
+                pares = [(f, self._parse_valor(d[0])) for f, d in zip(grupo, puntuales)]
+            if self.cache is not None:
+                self.cache.guardar(pares)
+            valores.update(pares)
+
+        sin_valor = [f for f in pedidas if f not in valores]
+        if sin_valor:
+            raise UFVFetchError(f"No hay valores UFV para las fechas: {', '.join(sin_valor)}")
+        return {f: valores[f] for f in pedidas}
+
+    async def _consultar_api(self, fecha_inicio: str, fecha_fin: str, timeout: int = 10) -> List[Dict]:
+        """
+        Une las consultas idénticas en curso: todas esperan la misma descarga
+        y cada una recibe su propia copia de las filas.
+        """
+        clave = (fecha_inicio, fecha_fin)
+        futuro = self._en_curso.get(clave)
+        if futuro is None:
+            futuro = asyncio.ensure_future(self._descargar(fecha_inicio, fecha_fin, timeout))
+            self._en_curso[clave] = futuro
+            futuro.add_done_callback(lambda _: self._en_curso.pop(clave, None))
+        # shield: si un solicitante se cancela, la descarga sigue para los demás
+        filas = await asyncio.shield(futuro)
+        return [dict(fila) for fila in filas]
+
+    async def _descargar(self, fecha_inicio: str, fecha_fin: str, timeout: int) -> List[Dict]:
+        if self._semaforo is None:
+            self._semaforo = asyncio.Semaphore(self.max_concurrencia)
+        async with self._semaforo:
+            crono = metricas.cronometro()
+            try:
+                r = await self._cliente().get(self._url(fecha_inicio, fecha_fin), timeout=timeout)
+                r.raise_for_status()
+                return self._validar_datos(r.json())
+            except httpx.HTTPError as e:
+                metricas.contar("ufv.errores")
+                raise UFVFetchError(f"Error de red al consultar UFV: {e}") from e
+            except ValueError as e:
+                metricas.contar("ufv.errores")
+                raise UFVFetchError(f"Respuesta no JSON o inválida: {e}") from e
+            except UFVFetchError:
+                metricas.contar("ufv.errores")
+                raise
+            finally:
+                crono.total("ufv.descarga")
@@ -0,0 +1,128 @@
+"""
+Almacén persistente en disco para la serie UFV.
+
+Los valores UFV de fechas ya publicadas no cambian, por lo que se guardan en
+una base SQLite indexada por fecha. `BCBAPIUFV` consulta primero este almacén
+y sólo pide a la API del BCB los días que faltan.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from . import metricas
+
+
+def _a_fecha(valor) -> date:
+    if isinstance(valor, date):
+        return valor
+    return date.fromisoformat(str(valor).strip())
+
+
+class CacheUFV:
+    """
+    Caché de UFV en SQLite (una fila por día).
+
+    Parámetros
+    ----------
+    ruta : str
+        Archivo de la base de datos. ``":memory:"`` crea un almacén volátil.
+
+    Lleva contadores de ``aciertos`` (días servidos desde disco) y ``fallos``
+    (días que hubo que pedir a la API).
+    """
+
+    def __init__(self, ruta: str = "ufv_cache.sqlite3") -> None:
+        self.ruta = ruta
+        self.aciertos = 0
+        self.fallos = 0
+        self._abrir()
+
+    def _abrir(self) -> None:
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.ruta, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS ufv (fecha TEXT PRIMARY KEY, valor REAL NOT NULL)"
+            )
+
+    def obtener_rango(self, fecha_inicio, fecha_fin) -> Dict[str, float]:
+        """Devuelve ``{fecha: valor}`` con los días guardados dentro del rango."""
+        ini, fin = _a_fecha(fecha_inicio).isoformat(), _a_fecha(fecha_fin).isoformat()
+        with self._lock:
+            filas = self._conn.execute(
+                "SELECT fecha, valor FROM ufv WHERE fecha BETWEEN ? AND ? ORDER BY fecha",
+                (ini, fin),
+            ).fetchall()
+        return dict(filas)
+
+    def obtener(self, fechas: Iterable) -> Dict[str, float]:
+        """Devuelve ``{fecha: valor}`` sólo para las fechas puntuales guardadas."""
+        claves = sorted({_a_fecha(f).isoformat() for f in fechas})
+        encontrados: Dict[str, float] = {}
+        with self._lock:
+            # SQLite limita la cantidad de parámetros por consulta
+            for i in range(0, len(claves), 500):
+                bloque = claves[i:i + 500]
+                marcas = ",".join("?" * len(bloque))
+                encontrados.update(self._conn.execute(
+                    f"SELECT fecha, valor FROM ufv WHERE fecha IN ({marcas})", bloque
+                ).fetchall())
+        self._contar(len(encontrados), len(claves) - len(encontrados))
+        return encontrados
+
+    def huecos(self, fecha_inicio, fecha_fin) -> List[Tuple[str, str]]:
+        """Rangos contiguos ``(inicio, fin)`` que no están en el almacén."""
+        ini, fin = _a_fecha(fecha_inicio), _a_fecha(fecha_fin)
+        guardados = self.obtener_rango(ini, fin)
+        faltantes: List[Tuple[str, str]] = []
+        hueco_ini = None
+        dia = ini
+        while dia <= fin:
+            clave = dia.isoformat()
+            if clave in guardados:
+                if hueco_ini is not None:
+                    faltantes.append((hueco_ini.isoformat(), (dia - timedelta(days=1)).isoformat()))
+                    hueco_ini = None
+            else:
+                if hueco_ini is None:
+                    hueco_ini = dia
+            dia += timedelta(days=1)
+        if hueco_ini is not None:
+            faltantes.append((hueco_ini.isoformat(), fin.isoformat()))
+        dias = (fin - ini).days + 1 if fin >= ini else 0
+        self._contar(len(guardados), dias - len(guardados))
+        return faltantes
+
+    def _contar(self, aciertos: int, fallos: int) -> None:
+        self.aciertos += aciertos
+        self.fallos += fallos
+        metricas.contar("cache.disco.aciertos", aciertos)
+        metricas.contar("cache.disco.fallos", fallos)
+
+    def guardar(self, pares: Iterable[Tuple[str, float]]) -> None:
+        """Guarda pares ``(fecha, valor)``; una fecha ya guardada se sobrescribe."""
+        filas = [(_a_fecha(f).isoformat(), float(v)) for f, v in pares]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO ufv (fecha, valor) VALUES (?, ?)", filas)
+
+    def tasa_aciertos(self) -> float:
+        total = self.aciertos + self.fallos
+        return self.aciertos / total if total else 0.0
+
+    def cerrar(self) -> None:
+        self._conn.close()
+
+    # Permite enviar el caché a otros procesos: sólo viaja la ruta.
+    def __getstate__(self):
+        return {"ruta": self.ruta, "aciertos": self.aciertos, "fallos": self.fallos}
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._abrir()
+
+    def __repr__(self):
+        return f"CacheUFV({self.ruta!r})"
@@ -0,0 +1,95 @@
+"""
+Proveedor de UFV a partir de un archivo local (sin red).
+
+`UFVArchivo` carga la serie UFV completa desde una instantánea CSV o JSON y
+responde las consultas desde una `SerieUFV` en memoria (indexada por día,
+con acceso O(1)). Tiene la misma interfaz que `BCBAPIUFV` (`consumir_endpoint`,
+`valor_en`, `valores_en`), así que puede inyectarse en `CalculadoraDeuda`,
+`calcular_lote` o `procesar_archivo` para recálculos reproducibles o en
+nodos sin acceso a internet.
+
+Formatos admitidos:
+- CSV con encabezado, una columna de fecha (``fecha``, ``date``, ...) y una
+  de valor (``valor``, ``ufv``, ...).
+- JSON con una lista de objetos como los que devuelve la API del BCB (con
+  fecha), o un objeto ``{"AAAA-MM-DD": valor, ...}``.
+- Binario ``.bin`` de `SerieUFV.guardar_binario`, mapeado con ``mmap`` (sin
+  parseo; ideal para muchos procesos en un mismo equipo).
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import math
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .serie import SerieUFV
+from .ufv import _BaseUFV, UFVFetchError
+
+
+class UFVArchivo(_BaseUFV):
+    def __init__(self, pares: Union[Iterable[Tuple[str, float]], SerieUFV]):
+        """Construye el proveedor desde una `SerieUFV` o desde pares ``(fecha, valor)``."""
+        self.serie = pares if isinstance(pares, SerieUFV) else SerieUFV.desde_pares(pares)
+
+    @classmethod
+    def desde_archivo(cls, ruta: str) -> "UFVArchivo":
+        """Carga una instantánea CSV, JSON o binaria ``.bin`` (según la extensión del archivo)."""
+        if ruta.lower().endswith(".bin"):
+            return cls(SerieUFV.desde_binario(ruta))
+        if ruta.lower().endswith(".json"):
+            with open(ruta, encoding="utf-8") as f:
+                contenido = json.load(f)
+            filas = ([{"fecha": k, "valor": v} for k, v in contenido.items()]
+                     if isinstance(contenido, dict) else contenido)
+        else:
+            with open(ruta, newline="", encoding="utf-8") as f:
+                filas = list(csv.DictReader(f))
+
+        fechas, valores = _BaseUFV()._parse_payload(filas)
+        if fechas is None:
+            raise UFVFetchError(f"La instantánea UFV {ruta} no tiene columna de fecha.")
+        invalidas = [n for n, v in enumerate(valores, start=1) if math.isnan(v)]
+        if invalidas:
+            raise UFVFetchError(f"Fila {invalidas[0]} inválida en la instantánea UFV {ruta}.")
+        return cls(zip(fechas, valores))
+
+    @property
+    def version(self) -> str:
+        """Versión de la instantánea; forma parte de la clave de `CacheResultados`."""
+        return self.serie.version
+
+    @property
+    def fecha_minima(self) -> str:
+        return self.serie.fecha_inicio
+
+    @property
+    def fecha_maxima(self) -> str:
+        return self.serie.fecha_fin
+
+    def valor_en(self, fecha: str, timeout: int = 10) -> float:
+        return self.serie.valor(fecha)
+
+    def valores_en(self, fechas: List[str], timeout: int = 10) -> Dict[str, float]:
+        valores = {str(f): self.serie.get(f) for f in fechas}
+        sin_valor = sorted(f for f, v in valores.items() if v is None)
+        if sin_valor:
+            raise UFVFetchError(f"No hay valores UFV para las fechas: {', '.join(sin_valor)}")
+        return valores
+
+    def consumir_endpoint(self, fecha_inicio: str, fecha_fin: Optional[str] = None, timeout: int = 10) -> List[Dict]:
+        if not fecha_fin:
+            fecha_fin = fecha_inicio
+        try:
+            tramo = self.serie.rango(fecha_inicio, fecha_fin)
+        except UFVFetchError:
+            tramo = None
+        filas = [{"fecha": f, "valor": v} for f, v in tramo.items()] if tramo is not None else []
+        return self._validar_datos(filas)
+
+    def __len__(self):
+        return self.serie.dias_con_valor()
+
+    def __repr__(self):
+        return f"UFVArchivo({self.fecha_minima} a {self.fecha_maxima}, {len(self)} días)"
@@ -0,0 +1,130 @@
+"""
+Piezas compartidas por las pruebas: un proveedor UFV en memoria y un
+servidor HTTP local que reemplaza al endpoint del BCB.
+"""
+
+import json
+import threading
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from impuestos_package.ufv import UFVFetchError
+
+UFVS = {"2024-01-01": 2.0, "2024-02-01": 2.1, "2024-03-01": 2.2}
+
+
+class ProveedorFalso:
+    """
+    Proveedor UFV (``valores_en`` / ``valor_en``) con valores fijos.
+
+    Registra cada consulta en `consultas`. Rechaza las fechas que no son
+    ISO con ValueError, como `BCBAPIUFV` y `CacheUFV`. Sin `por_defecto`,
+    las fechas que no están en `valores` dan UFVFetchError; con
+    ``falla=True`` falla toda consulta.
+    """
+
+    def __init__(self, valores=None, por_defecto=None, falla=False):
+        self.valores = dict(UFVS if valores is None else valores)
+        self.por_defecto = por_defecto
+        self.falla = falla
+        self.consultas = []
+
+    def valores_en(self, fechas):
+        fechas = [str(f) for f in fechas]
+        self.consultas.append(fechas)
+        for f in fechas:
+            date.fromisoformat(f)
+        if self.falla:
+            raise UFVFetchError("sin datos")
+        faltan = [f for f in fechas if f not in self.valores] if self.por_defecto is None else []
+        if faltan:
+            raise UFVFetchError(f"No hay valores UFV para las fechas: {', '.join(faltan)}")
+        return {f: self.valores.get(f, self.por_defecto) for f in fechas}
+
+    def valor_en(self, fecha):
+        return self.valores_en([fecha])[str(fecha)]
+
+
+@pytest.fixture
+def proveedor_falso():
+    """Fábrica de `ProveedorFalso`: ``proveedor_falso()``, ``proveedor_falso({...}, falla=True)``..."""
+    return ProveedorFalso
+
+
+class ServidorBCB:
+    """
+    Servidor HTTP en 127.0.0.1 con la forma del endpoint UFV del BCB.
+
+    Responde las consultas de un solo día con ``[{"valor": "2.00000"}]``
+    tomado de `valores`, y con 500 los rangos y las fechas desconocidas.
+    Con `estado_http` responde ese código a todo. Registra las consultas
+    (`consultas`) y el máximo de consultas atendidas a la vez.
+    """
+
+    def __init__(self, valores=None, latencia=0.0):
+        self.valores = dict(UFVS if valores is None else valores)
+        self.latencia = latencia
+        self.estado_http = None
+        self.consultas = []
+        self.max_simultaneas = 0
+        self._simultaneas = 0
+        self._candado = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}/ufv.php"
+
+    def _responder(self, ini, fin):
+        if self.estado_http is not None:
+            return self.estado_http, None
+        if ini != fin or ini not in self.valores:
+            return 500, None
+        return 200, [{"valor": f"{self.valores[ini]:.5f}"}]
+
+    def _handler(self):
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                q = parse_qs(urlparse(self.path).query)
+                ini, fin = q["cFecIni"][0], q["cFecFin"][0]
+                with servidor._candado:
+                    servidor.consultas.append((ini, fin))
+                    servidor._simultaneas += 1
+                    servidor.max_simultaneas = max(servidor.max_simultaneas, servidor._simultaneas)
+                time.sleep(servidor.latencia)
+                with servidor._candado:
+                    servidor._simultaneas -= 1
+                estado, filas = servidor._responder(ini, fin)
+                cuerpo = json.dumps(filas).encode() if filas is not None else b""
+                self.send_response(estado)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def iniciar(self):
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def detener(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def servidor_bcb():
+    # La latencia hace que las consultas simultáneas realmente se solapen
+    servidor = ServidorBCB(latencia=0.05).iniciar()
+    yield servidor
+    servidor.detener()
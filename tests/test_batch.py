@@ -0,0 +1,103 @@
+import csv
+
+import pytest
+
+from impuestos_package import batch
+from impuestos_package.batch import procesar_archivo, procesar_filas
+
+def _escribir_csv(ruta, filas):
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.DictWriter(f, fieldnames=list(filas[0]))
+        escritor.writeheader()
+        escritor.writerows(filas)
+
+def test_procesar_archivo_por_bloques(tmp_path, proveedor_falso):
+    filas = [
+        {"nit": str(n), "TO": "1000", "fecha_inicio": "2024-01-01", "fecha_fin": "2024-02-01",
+         "tasa": "12", "dias": "30", "porcentaje": "10"}
+        for n in range(5)
+    ]
+    filas.append({"nit": "99", "TO": "abc", "fecha_inicio": "2024-01-01", "fecha_fin": "2024-03-01",
+                  "tasa": "12", "dias": "30", "porcentaje": "10"})
+    entrada, salida = tmp_path / "entrada.csv", tmp_path / "salida.csv"
+    _escribir_csv(entrada, filas)
+
+    api = proveedor_falso()
+    resumen = procesar_archivo(str(entrada), str(salida), api=api, tamano_bloque=2)
+    assert resumen == {"filas": 6, "errores": 1}
+    # Una resolución de UFV por bloque, no por fila
+    assert len(api.consultas) == 3
+
+    with open(salida, newline="", encoding="utf-8") as f:
+        resultado = list(csv.DictReader(f))
+    assert [r["nit"] for r in resultado] == ["0", "1", "2", "3", "4", "99"]
+    assert resultado[0]["DT"] == "1160.5"
+    assert resultado[-1]["error"] != ""
+
+def test_procesar_filas_fecha_sin_ufv(proveedor_falso):
+    filas = [
+        {"TO": "1000", "fecha_inicio": "2024-01-01", "fecha_fin": "2024-02-01",
+         "tasa": "12", "dias": "30", "porcentaje": "10"},
+        {"TO": "1000", "fecha_inicio": "2023-01-01", "fecha_fin": "2024-02-01",
+         "tasa": "12", "dias": "30", "porcentaje": "10"},
+    ]
+    res = list(procesar_filas(filas, api=proveedor_falso()))
+    assert res[0]["MV"] == 50.0 and res[0]["error"] == ""
+    assert "UFV" in res[1]["error"]
+
+def test_procesar_archivo_columnas_faltantes(tmp_path, proveedor_falso):
+    entrada, salida = tmp_path / "entrada.csv", tmp_path / "salida.csv"
+    _escribir_csv(entrada, [{"TO": "1000", "fecha_inicio": "2024-01-01", "fecha_fin": "2024-02-01"}])
+    api = proveedor_falso()
+    with pytest.raises(ValueError, match="tasa, dias, porcentaje"):
+        procesar_archivo(str(entrada), str(salida), api=api)
+    # Se valida con el encabezado: ni consultas de UFV ni archivo de salida
+    assert api.consultas == [] and not salida.exists()
+
+def test_procesar_archivo_solo_encabezado(tmp_path, proveedor_falso):
+    entrada, salida = tmp_path / "entrada.csv", tmp_path / "salida.csv"
+    entrada.write_text("nit,TO,fecha_inicio,fecha_fin,tasa,dias,porcentaje\n", encoding="utf-8")
+    resumen = procesar_archivo(str(entrada), str(salida), api=proveedor_falso())
+    assert resumen == {"filas": 0, "errores": 0}
+    assert salida.read_text(encoding="utf-8").splitlines() == [
+        "nit,TO,fecha_inicio,fecha_fin,tasa,dias,porcentaje,MV,I,S,DT,error"]
+
+def test_procesar_filas_sin_numpy_mismo_resultado(monkeypatch, proveedor_falso):
+    api = proveedor_falso({"2024-01-01": 2.0, "2024-02-01": 2.1, "2024-03-01": 1.9})
+    filas = [
+        {"TO": to, "fecha_inicio": "2024-01-01", "fecha_fin": fin, "tasa": "12", "dias": "30",
+         "porcentaje": porc}
+        for to, fin, porc in [("1786.45", "2024-02-01", "10"), ("1000", "2024-03-01", "10"),
+                              ("-1", "2024-02-01", "10"), ("250.5", "2024-01-01", "5")]
+    ]
+    vectorizado = list(procesar_filas(filas, api=api))
+    monkeypatch.setattr(batch, "np", None)
+    assert list(procesar_filas(filas, api=api)) == vectorizado
+    assert vectorizado[0]["S"] == 178.65 and vectorizado[0]["error"] == ""
+    assert vectorizado[1]["error"] == "Ningún valor puede ser negativo."
+    assert "negativos" in vectorizado[2]["error"]
+
+def test_procesar_filas_fecha_invalida_no_corta_el_bloque(proveedor_falso):
+    # El proveedor falso rechaza las fechas no ISO, como BCBAPIUFV y CacheUFV
+    filas = [
+        {"TO": "1000", "fecha_inicio": "01/01/2024", "fecha_fin": "2024-02-01",
+         "tasa": "12", "dias": "30", "porcentaje": "10"},
+        {"TO": "1000", "fecha_inicio": "2024-01-01", "fecha_fin": "2024-02-01",
+         "tasa": "12", "dias": "30", "porcentaje": "10"},
+    ]
+    api = proveedor_falso()
+    res = list(procesar_filas(filas, api=api))
+    assert "Fecha inválida" in res[0]["error"]
+    assert res[1]["DT"] == 1160.50 and res[1]["error"] == ""
+    assert api.consultas == [["2024-01-01", "2024-02-01"]]
+
+def test_procesar_archivo_fila_incompleta(tmp_path, proveedor_falso):
+    entrada, salida = tmp_path / "entrada.csv", tmp_path / "salida.csv"
+    entrada.write_text("TO,fecha_inicio,fecha_fin,tasa,dias,porcentaje\n"
+                       "1000,2024-01-01,2024-02-01\n"
+                       "1000,2024-01-01,2024-02-01,12,30,10\n", encoding="utf-8")
+    resumen = procesar_archivo(str(entrada), str(salida), api=proveedor_falso())
+    assert resumen == {"filas": 2, "errores": 1}
+    with open(salida, newline="", encoding="utf-8") as f:
+        resultado = list(csv.DictReader(f))
+    assert resultado[0]["error"] != "" and resultado[1]["DT"] == "1160.5"
@@ -0,0 +1,68 @@
+from datetime import date
+
+from impuestos_package.cache_resultados import CacheResultados
+from impuestos_package.calculadora import CalculadoraDeuda
+from impuestos_package.ufv_local import UFVArchivo
+
+HOY = date.today().isoformat()
+
+
+def _calcular(cache, api, TO=1000.0, fecha_fin="2024-02-01", **kwargs):
+    return CalculadoraDeuda(TO=TO, fecha_inicio="2024-01-01", fecha_fin=fecha_fin, tasa=12.0, dias=30,
+                            porcentaje=10.0, api=api, cache_resultados=cache, **kwargs).calcular()
+
+
+def test_acierto_evita_recalcular(proveedor_falso):
+    cache, api = CacheResultados(), proveedor_falso()
+    primero = _calcular(cache, api)
+    segundo = _calcular(cache, api, TO=1000)  # 1000 y 1000.0 son la misma clave
+    assert len(api.consultas) == 1
+    assert segundo["DT"] == primero["DT"] == 1160.50
+    assert "Fecha de Cálculo" in segundo
+    assert cache.estadisticas()["aciertos"] == 1
+    assert cache.tasa_aciertos() == 0.5
+
+
+def test_modo_exacto_es_otra_clave(proveedor_falso):
+    cache, api = CacheResultados(), proveedor_falso()
+    _calcular(cache, api)
+    _calcular(cache, api, exacto=True)
+    assert len(api.consultas) == 2
+
+
+def test_desalojo_lru(proveedor_falso):
+    cache, api = CacheResultados(capacidad=2), proveedor_falso()
+    for TO in (100, 200, 100, 300):  # 200 es el menos usado cuando entra 300
+        _calcular(cache, api, TO=TO)
+    assert len(cache) == 2
+    consultas = len(api.consultas)
+    _calcular(cache, api, TO=100)
+    assert len(api.consultas) == consultas
+    _calcular(cache, api, TO=200)
+    assert len(api.consultas) == consultas + 1
+
+
+def test_resultados_de_hoy_expiran(proveedor_falso):
+    cache, api = CacheResultados(ttl_hoy=0), proveedor_falso(por_defecto=2.1)
+    _calcular(cache, api, fecha_fin=HOY)
+    _calcular(cache, api, fecha_fin=HOY)
+    assert len(api.consultas) == 2
+    _calcular(cache, api)
+    _calcular(cache, api)
+    assert len(api.consultas) == 3  # las fechas pasadas no expiran
+
+
+def test_errores_no_se_guardan(proveedor_falso):
+    cache, api = CacheResultados(), proveedor_falso(falla=True)
+    assert "error" in _calcular(cache, api)
+    assert "error" in _calcular(cache, api)
+    assert len(api.consultas) == 2 and len(cache) == 0
+
+
+def test_otra_instantanea_ufv_no_reutiliza_resultados():
+    cache = CacheResultados()
+    v1 = UFVArchivo([("2024-01-01", 2.0), ("2024-02-01", 2.1)])
+    v2 = UFVArchivo([("2024-01-01", 2.0), ("2024-02-01", 2.2)])
+    assert v1.version != v2.version
+    assert _calcular(cache, v1)["MV"] == 50.0
+    assert _calcular(cache, v2)["MV"] == 100.0
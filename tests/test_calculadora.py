@@ -39,6 +39,18 @@ def test_calculadora_error_ufv(monkeypatch):
     res = calc.calcular()
     assert "error" in res
 
+def test_calculadora_sin_api_comparte_sesion(requests_mock):
+    from impuestos_package import calculadora as calc_mod
+    requests_mock.get("https://www.bcb.gob.bo/librerias/charts/ufv.php?cFecIni=2024-01-01&cFecFin=2024-02-01",
+                      json=[{"fecha": "2024-01-01", "valor": "2.0"}, {"fecha": "2024-02-01", "valor": "2.1"}])
+    args = dict(TO=1000.0, fecha_inicio="2024-01-01", fecha_fin="2024-02-01", tasa=12.0, dias=30, porcentaje=10.0)
+    assert CalculadoraDeuda(**args).calcular()["DT"] == 1160.50
+    cliente = calc_mod._cliente_por_defecto()
+    sesion = cliente._session
+    assert sesion is not None
+    assert CalculadoraDeuda(**args).calcular()["DT"] == 1160.50
+    assert calc_mod._cliente_por_defecto() is cliente and cliente._session is sesion
+
 @pytest.mark.parametrize("kwargs", [
     dict(TO=-1,  fecha_inicio="2024-01-01", fecha_fin="2024-01-02", tasa=10, dias=10, porcentaje=5),
     dict(TO=100, fecha_inicio="2024-01-01", fecha_fin="2024-01-02", tasa=10, dias=-1, porcentaje=5),
@@ -58,3 +70,111 @@ def test_calculadora_sin_interes_ni_sancion(monkeypatch):
     assert res["S"] == 0.00
     assert res["DT"] == 840.00
 
+def test_calculadora_usa_consulta_puntual(proveedor_falso):
+    api = proveedor_falso()
+    calc = CalculadoraDeuda(TO=1000.0, fecha_inicio="2024-01-01", fecha_fin="2024-02-01",
+                            tasa=12.0, dias=30, porcentaje=10.0, api=api)
+    res = calc.calcular()
+    assert api.consultas == [["2024-01-01", "2024-02-01"]]
+    assert res["DT"] == 1160.50
+
+def test_calculadora_async_con_cliente_sincrono(proveedor_falso):
+    import asyncio
+    calc = CalculadoraDeuda(TO=1000.0, fecha_inicio="2024-01-01", fecha_fin="2024-02-01",
+                            tasa=12.0, dias=30, porcentaje=10.0, api=proveedor_falso())
+    res = asyncio.run(calc.calcular_async())
+    assert res["DT"] == 1160.50
+
+def test_calculadora_async_sin_httpx_usa_cliente_sincrono(monkeypatch):
+    import asyncio
+    from impuestos_package import ufv_async
+    monkeypatch.setattr(ufv_async, "httpx", None)
+    monkeypatch.setattr("impuestos_package.calculadora.BCBAPIUFV", DummyAPI_OK)
+    calc = CalculadoraDeuda(TO=1000.0, fecha_inicio="2024-01-01", fecha_fin="2024-02-01",
+                            tasa=12.0, dias=30, porcentaje=10.0)
+    assert asyncio.run(calc.calcular_async())["DT"] == 1160.50
+
+@pytest.mark.parametrize("workers,modo", [(1, "hilos"), (4, "hilos"), (2, "procesos")])
+def test_procesar_cola_trabajos_propios(workers, modo, proveedor_falso):
+    calc = CalculadoraDeuda(TO=1000.0, fecha_inicio="2024-01-01", fecha_fin="2024-02-01",
+                            tasa=12.0, dias=30, porcentaje=10.0, api=proveedor_falso())
+    calc.agregar_a_cola({"TO": 500.0, "fecha_fin": "2024-03-01"}, mostrar=False)
+    calc.agregar_a_cola("Recalcular con los datos de la instancia", mostrar=False)
+    calc.agregar_a_cola({"TO": -1}, mostrar=False)
+    calc.agregar_a_cola({"TO": 2000.0, "porcentaje": 0}, mostrar=False)
+
+    res = calc.procesar_cola(workers=workers, modo=modo, mostrar=False)
+    assert calc.cola_calculos.esta_vacia()
+    assert [r.get("TO") for r in res] == [500.0, 1000.0, None, 2000.0]
+    assert res[0]["MV"] == 50.00        # 500 * ((2.2/2.0)-1)
+    assert res[1]["DT"] == 1160.50
+    assert "error" in res[2]
+    assert res[3]["S"] == 0.00
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_procesar_cola_por_prioridad(workers, proveedor_falso):
+    calc = CalculadoraDeuda(TO=1000.0, fecha_inicio="2024-01-01", fecha_fin="2024-02-01",
+                            tasa=12.0, dias=30, porcentaje=10.0, api=proveedor_falso(), cola_prioridad=True)
+    for TO in (100.0, 200.0, 300.0):
+        calc.agregar_a_cola({"TO": TO}, mostrar=False)               # trabajo masivo, prioridad 0
+    clave = calc.agregar_a_cola({"TO": 400.0}, mostrar=False, prioridad=5)
+    calc.agregar_a_cola({"TO": 9000.0}, mostrar=False, prioridad=-9000)  # deuda más grande primero
+    calc.cola_calculos.actualizar(clave, -1)
+
+    res = calc.procesar_cola(workers=workers, mostrar=False)
+    assert [r["TO"] for r in res] == [9000.0, 400.0, 100.0, 200.0, 300.0]
+
+def test_prioridad_requiere_cola_prioridad():
+    calc = CalculadoraDeuda(TO=1, fecha_inicio="2024-01-01", fecha_fin="2024-02-01",
+                            tasa=1, dias=1, porcentaje=1)
+    with pytest.raises(ValueError):
+        calc.agregar_a_cola("urgente", mostrar=False, prioridad=1)
+
+def test_procesar_cola_modo_invalido():
+    calc = CalculadoraDeuda(TO=1, fecha_inicio="2024-01-01", fecha_fin="2024-02-01",
+                            tasa=1, dias=1, porcentaje=1)
+    with pytest.raises(ValueError):
+        calc.procesar_cola(modo="gpu")
+
+def test_calculadora_modo_exacto(proveedor_falso):
+    from decimal import Decimal
+    calc = CalculadoraDeuda(TO=5906.25, fecha_inicio="2024-01-01", fecha_fin="2024-02-01",
+                            tasa=12.0, dias=30, porcentaje=10.0, api=proveedor_falso(), exacto=True)
+    res = calc.calcular()
+    assert res["MV"] == Decimal("295.31")     # 5906.25 * 0.05 = 295.3125
+    assert res["S"] == Decimal("590.63")      # 590.625 → mitad hacia arriba
+    assert res["DT"] == res["TO"] + res["MV"] + res["I"] + res["S"]
+    assert all(isinstance(res[k], Decimal) for k in ("TO", "MV", "I", "S", "DT"))
+
+def test_historial_estructurado_y_acotado(capsys, proveedor_falso):
+    calc = CalculadoraDeuda(TO=1000.0, fecha_inicio="2024-01-01", fecha_fin="2024-02-01",
+                            tasa=12.0, dias=30, porcentaje=10.0, api=proveedor_falso(), capacidad_historial=6)
+    calc.calcular()
+    calc.calcular()
+    pasos = list(calc.historial.items)
+    assert len(pasos) == 6
+    assert (pasos[-1].tipo, pasos[-1].concepto, pasos[-1].valor) == ("Final", "DT", 1160.5)
+    calc.mostrar_historial()
+    assert f"[Final] Deuda Total (DT) = 1160.5 en {calc.fecha_calculo}" in capsys.readouterr().out
+
+def test_historial_desactivado(proveedor_falso):
+    calc = CalculadoraDeuda(TO=1000.0, fecha_inicio="2024-01-01", fecha_fin="2024-02-01",
+                            tasa=12.0, dias=30, porcentaje=10.0, api=proveedor_falso(), capacidad_historial=0)
+    assert calc.calcular()["DT"] == 1160.50
+    assert calc.historial.esta_vacia()
+
+def test_calcular_compacto(proveedor_falso):
+    from impuestos_package.motor import ResultadoDeuda
+    from impuestos_package.ufv import UFVFetchError
+    calc = CalculadoraDeuda(TO=1000.0, fecha_inicio="2024-01-01", fecha_fin="2024-02-01",
+                            tasa=12.0, dias=30, porcentaje=10.0, api=proveedor_falso())
+    r = calc.calcular(compacto=True)
+    assert r == ResultadoDeuda(1000.0, 50.0, 10.5, 100.0, 1160.5)
+    assert r.to_dict(calc.fecha_calculo) == calc.calcular()
+    assert not hasattr(r, "__dict__")
+
+    calc = CalculadoraDeuda(TO=1000.0, fecha_inicio="2024-01-01", fecha_fin="2024-02-01",
+                            tasa=12.0, dias=30, porcentaje=10.0, api=proveedor_falso(falla=True))
+    assert "error" in calc.calcular()
+    with pytest.raises(UFVFetchError):
+        calc.calcular(compacto=True)
@@ -0,0 +1,68 @@
+import csv
+
+from impuestos_package.cli import main, _percentil
+from impuestos_package.ufv_cache import CacheUFV
+
+def _entrada(tmp_path):
+    ruta = tmp_path / "entrada.csv"
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.writer(f)
+        escritor.writerow(["nit", "TO", "fecha_inicio", "fecha_fin", "tasa", "dias", "porcentaje"])
+        for n in range(10):
+            escritor.writerow([n, 1000, "2024-01-01", "2024-01-02", 12, 30, 10])
+    return ruta
+
+def test_cli_offline_con_cache(tmp_path, capsys):
+    cache = tmp_path / "ufv.sqlite3"
+    CacheUFV(str(cache)).guardar([("2024-01-01", 2.0), ("2024-01-02", 2.1)])
+    salida = tmp_path / "salida.csv"
+
+    codigo = main(["calcular", "--input", str(_entrada(tmp_path)), "--output", str(salida),
+                   "--cache", str(cache), "--offline", "--workers", "2", "--bloque", "3"])
+    assert codigo == 0
+    with open(salida, newline="", encoding="utf-8") as f:
+        filas = list(csv.DictReader(f))
+    assert len(filas) == 10
+    assert all(fila["DT"] == "1160.5" for fila in filas)
+
+    out = capsys.readouterr().out
+    assert "Filas procesadas: 10 (con error: 0)" in out
+    assert "Aciertos del caché UFV: 100.0%" in out
+    assert "p99" in out
+
+def test_cli_offline_sin_cache(tmp_path, capsys):
+    codigo = main(["calcular", "--input", str(_entrada(tmp_path)), "--output", str(tmp_path / "s.csv"),
+                   "--offline"])
+    assert codigo == 2
+
+def test_percentil():
+    valores = sorted(float(n) for n in range(1, 101))
+    assert _percentil(valores, 50) == 50.0
+    assert _percentil(valores, 99) == 99.0
+    assert _percentil([], 50) == 0.0
+
+def test_cli_con_instantanea_ufv(tmp_path, capsys):
+    ufv = tmp_path / "ufv.csv"
+    ufv.write_text("fecha,valor\n2024-01-01,2.0\n2024-01-02,2.1\n", encoding="utf-8")
+    salida = tmp_path / "salida.csv"
+    codigo = main(["calcular", "-i", str(_entrada(tmp_path)), "-o", str(salida), "--ufv-archivo", str(ufv)])
+    assert codigo == 0
+    assert "Filas procesadas: 10 (con error: 0)" in capsys.readouterr().out
+
+def test_cli_offline_con_instantanea(tmp_path, capsys):
+    ufv = tmp_path / "ufv.csv"
+    ufv.write_text("fecha,valor\n2024-01-01,2.0\n2024-01-02,2.1\n", encoding="utf-8")
+    salida = tmp_path / "salida.csv"
+    codigo = main(["calcular", "-i", str(_entrada(tmp_path)), "-o", str(salida), "--ufv-archivo", str(ufv),
+                   "--offline"])
+    assert codigo == 0
+    assert "Filas procesadas: 10 (con error: 0)" in capsys.readouterr().out
+
+def test_cli_instantanea_binaria(tmp_path, capsys):
+    ufv = tmp_path / "ufv.csv"
+    ufv.write_text("fecha,valor\n2024-01-01,2.0\n2024-01-02,2.1\n", encoding="utf-8")
+    binaria = tmp_path / "ufv.bin"
+    assert main(["instantanea", "-i", str(ufv), "-o", str(binaria)]) == 0
+    salida = tmp_path / "salida.csv"
+    assert main(["calcular", "-i", str(_entrada(tmp_path)), "-o", str(salida), "--ufv-archivo", str(binaria)]) == 0
+    assert "Filas procesadas: 10 (con error: 0)" in capsys.readouterr().out
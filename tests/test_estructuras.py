@@ -5,7 +5,9 @@ Basado en los contenidos de la materia Estructura de Datos (2025)
 """
 
 import pytest
-from impuestos_package.estructuras import Pila, Cola, ArbolDeuda
+import random
+
+from impuestos_package.estructuras import Pila, Cola, ColaPrioridad, ArbolDeuda, ArbolDeudaBalanceado, Nodo, NodoAVL
 
 
 # =====================================================
@@ -29,6 +31,15 @@ def test_pila_pop_en_vacia():
     pila = Pila()
     assert pila.pop() is None
 
+def test_pila_acotada_descarta_lo_mas_antiguo():
+    pila = Pila(capacidad=2)
+    for paso in ("Cálculo 1", "Cálculo 2", "Cálculo 3"):
+        pila.push(paso)
+    assert pila.tamano() == 2
+    assert list(pila.items) == ["Cálculo 2", "Cálculo 3"]
+    assert pila.pop() == "Cálculo 3"
+    assert Pila(capacidad=0).cima() is None
+
 
 # =====================================================
 # 🔹 Pruebas para la clase COLA
@@ -78,3 +89,171 @@ def test_arbol_preorden(capsys):
     captured = capsys.readouterr()
     for v in valores:
         assert v in captured.out
+
+
+def test_arbol_insercion_ordenada_sin_recursion():
+    arbol = ArbolDeuda()
+    for nit in range(5000):  # degenera en lista; antes superaba el límite de recursión
+        arbol.insertar(nit)
+    assert arbol.buscar(4999) is True
+    assert arbol.buscar(5000) is False
+
+def test_arbol_recorridos_sin_recursion(capsys):
+    arbol = ArbolDeuda()
+    for v in [5, 3, 8, 1, 4]:
+        arbol.insertar(v)
+    arbol.preorden()
+    arbol.mostrar_arbol()
+    assert capsys.readouterr().out.splitlines() == [
+        "5", "3", "1", "4", "8",
+        "└── 5", "    └── 3", "        └── 1", "        ├── 4", "    ├── 8",
+    ]
+
+    arbol = ArbolDeuda()
+    for nit in range(3000):  # degenerado: la versión recursiva daba RecursionError
+        arbol.insertar(nit)
+    arbol.preorden()
+    arbol.mostrar_arbol()
+    lineas = capsys.readouterr().out.splitlines()
+    assert lineas[:3000] == [str(n) for n in range(3000)]
+    assert lineas[-1] == "    " + "│   " * 2998 + "├── 2999"
+
+
+# =====================================================
+# 🔹 Pruebas para ÁRBOL DEUDA BALANCEADO (AVL)
+# =====================================================
+def _en_orden(nodo, salida):
+    if nodo is not None:
+        _en_orden(nodo.izq, salida)
+        salida.append(nodo.clave)
+        _en_orden(nodo.der, salida)
+    return salida
+
+def _verificar_avl(nodo):
+    if nodo is None:
+        return 0
+    hi, hd = _verificar_avl(nodo.izq), _verificar_avl(nodo.der)
+    assert abs(hi - hd) <= 1
+    assert nodo.altura == 1 + max(hi, hd)
+    return nodo.altura
+
+def test_avl_insercion_ordenada_se_mantiene_balanceado():
+    arbol = ArbolDeudaBalanceado()
+    for nit in range(100000):
+        arbol.insertar(nit)
+    assert len(arbol) == 100000
+    assert arbol.altura <= 18  # ~1.44 * log2(n)
+    assert arbol.buscar(99999) and not arbol.buscar(100000)
+
+def test_avl_eliminar_y_duplicados():
+    azar = random.Random(7)
+    claves = [azar.randrange(500) for _ in range(2000)]  # con repetidas
+    arbol = ArbolDeudaBalanceado()
+    for c in claves:
+        arbol.insertar(c)
+    for c in claves[::2]:
+        assert arbol.eliminar(c) is True
+    restantes = sorted(claves[1::2])
+    assert _en_orden(arbol.raiz, []) == restantes
+    assert len(arbol) == len(restantes)
+    _verificar_avl(arbol.raiz)
+    assert arbol.eliminar(-1) is False
+
+def test_avl_con_funcion_clave():
+    indice = ArbolDeudaBalanceado(clave=lambda c: c["nit"])
+    for nit, nombre in [(3020, "C"), (1010, "A"), (2020, "B")]:
+        indice.insertar({"nit": nit, "nombre": nombre})
+    assert indice.obtener(2020)["nombre"] == "B"
+    assert 1010 in indice
+    assert indice.obtener(9999) is None
+    indice.eliminar(1010)
+    assert 1010 not in indice
+
+def test_arbol_en_orden_generador():
+    arbol = ArbolDeuda()
+    for v in [5, 2, 8, 1, 9]:
+        arbol.insertar(v)
+    assert list(arbol) == [1, 2, 5, 8, 9]
+    assert list(arbol.en_orden(inverso=True)) == [9, 8, 5, 2, 1]
+
+def test_avl_consultas_ordenadas_contra_lista():
+    azar = random.Random(11)
+    deudas = [{"nit": k, "DT": azar.randrange(10000)} for k in range(3000)]
+    indice = ArbolDeudaBalanceado(clave=lambda d: d["DT"])
+    for d in deudas:
+        indice.insertar(d)
+    claves = sorted(d["DT"] for d in deudas)
+
+    assert [d["DT"] for d in indice] == claves
+    assert [d["DT"] for d in indice.rango(2500, 4000)] == [c for c in claves if 2500 <= c <= 4000]
+    assert indice.contar(2500, 4000) == sum(1 for c in claves if 2500 <= c <= 4000)
+    assert indice.contar(10, 5) == 0
+    assert [d["DT"] for d in indice.top_k(5)] == claves[::-1][:5]
+    for k in (0, 1, 1500, len(claves) - 1, -1):
+        assert indice.k_esimo(k)["DT"] == claves[k]
+    with pytest.raises(IndexError):
+        indice.k_esimo(len(claves))
+    for x in (-1, 0, 5000, 5001, 20000):
+        assert indice.posicion(x) == sum(1 for c in claves if c < x)
+        menores = [c for c in claves if c <= x]
+        mayores = [c for c in claves if c >= x]
+        assert (indice.piso(x) or {}).get("DT") == (menores[-1] if menores else None)
+        assert (indice.techo(x) or {}).get("DT") == (mayores[0] if mayores else None)
+
+def test_avl_tamanos_tras_eliminar():
+    arbol = ArbolDeudaBalanceado()
+    for v in range(1000):
+        arbol.insertar(v)
+    for v in range(0, 1000, 3):
+        arbol.eliminar(v)
+    restantes = [v for v in range(1000) if v % 3]
+    assert len(arbol) == len(restantes)
+    assert arbol.k_esimo(100) == restantes[100]
+    assert list(arbol.rango(10, 20)) == [v for v in restantes if 10 <= v <= 20]
+
+def test_nodos_y_estructuras_sin_dict():
+    for objeto in (Nodo(1), NodoAVL(1, 1), Pila(), Pila(capacidad=3), Cola(), ColaPrioridad()):
+        assert not hasattr(objeto, "__dict__")
+
+def test_cola_prioridad_orden_y_estabilidad():
+    cola = ColaPrioridad()
+    for item, prioridad in [("a", 2), ("b", 1), ("c", 2), ("d", 0), ("e", 1)]:
+        cola.encolar(item, prioridad)
+    assert cola.tamano() == 5
+    assert cola.frente() == "d"
+    # Con igual prioridad, sale primero el que llegó antes
+    assert [cola.desencolar() for _ in range(5)] == ["d", "b", "e", "a", "c"]
+    assert cola.esta_vacia() and cola.desencolar() is None and cola.frente() is None
+
+def test_cola_prioridad_actualizar_y_eliminar():
+    cola = ColaPrioridad()
+    masivo = [cola.encolar(f"masivo{i}", 10) for i in range(3)]
+    urgente = cola.encolar({"TO": 5000}, 10, clave="urgente")
+    cola.actualizar("urgente", 1)
+    assert cola.prioridad("urgente") == 1
+    assert cola.eliminar(masivo[1]) == "masivo1"
+    assert masivo[1] not in cola and cola.tamano() == 3
+    cola.encolar("masivo0", 10, clave=masivo[0])  # reencolar con la misma clave no duplica
+    assert cola.tamano() == 3
+    assert cola.desencolar() == {"TO": 5000}
+    assert [cola.desencolar(), cola.desencolar()] == ["masivo0", "masivo2"]
+    with pytest.raises(KeyError):
+        cola.actualizar(urgente, 0)
+
+def test_cola_prioridad_claves_generadas_no_chocan():
+    cola = ColaPrioridad()
+    cola.encolar("A", 1, clave=1)
+    clave_b = cola.encolar("B", 0)
+    assert clave_b != 1 and cola.tamano() == 2
+    assert [cola.desencolar(), cola.desencolar()] == ["B", "A"]
+
+def test_cola_prioridad_contra_ordenamiento():
+    rnd = random.Random(3)
+    cola = ColaPrioridad()
+    esperado = {}
+    for i in range(500):
+        esperado[cola.encolar(i, rnd.randint(0, 20))] = i
+    for clave in rnd.sample(sorted(esperado), 100):
+        cola.actualizar(clave, rnd.randint(0, 20))
+    orden = sorted(esperado, key=lambda c: (cola.prioridad(c), c))
+    assert [cola.desencolar() for _ in range(len(orden))] == [esperado[c] for c in orden]
@@ -0,0 +1,50 @@
+import subprocess
+import sys
+
+import pytest
+
+# Se corre en un intérprete nuevo: en el proceso de pytest requests ya está cargado
+CODIGO = """
+import sys
+import impuestos_package
+from impuestos_package import CalculadoraDeuda
+from impuestos_package.ufv_local import UFVArchivo
+
+api = UFVArchivo([("2024-01-01", 2.0), ("2024-02-01", 2.1)])
+res = CalculadoraDeuda(TO=1000.0, fecha_inicio="2024-01-01", fecha_fin="2024-02-01",
+                       tasa=12.0, dias=30, porcentaje=10.0, api=api).calcular()
+assert res["DT"] == 1160.50, res
+cargados = [m for m in ("requests", "urllib3", "httpx", "asyncio", "numpy") if m in sys.modules]
+print(",".join(cargados))
+"""
+
+
+def _modulos_cargados(codigo):
+    salida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, check=True)
+    return salida.stdout.strip()
+
+
+def test_importar_y_calcular_offline_no_carga_la_pila_http():
+    assert _modulos_cargados(CODIGO) == ""
+
+
+def test_nombres_publicos_disponibles():
+    import impuestos_package
+
+    for nombre in impuestos_package.__all__:
+        assert getattr(impuestos_package, nombre).__name__ == nombre
+    assert "CalculadoraDeuda" in dir(impuestos_package)
+    with pytest.raises(AttributeError):
+        impuestos_package.NoExiste
+
+
+def test_cliente_de_red_carga_requests_al_usarse():
+    codigo = (
+        "import sys\n"
+        "from impuestos_package import BCBAPIUFV\n"
+        "api = BCBAPIUFV()\n"
+        "antes = 'requests' in sys.modules\n"
+        "api._sesion()\n"
+        "print(antes, 'requests' in sys.modules)\n"
+    )
+    assert _modulos_cargados(codigo) == "False True"
@@ -9,3 +9,9 @@ def test_interes_calculo_correcto():
 def test_interes_valores_negativos():
     with pytest.raises(ValueError):
         Interes(-1, 0, 10, 10)
+
+def test_interes_exacto():
+    from decimal import Decimal
+    i = Interes(1000, 50, 12, 30, exacto=True).calcular()
+    assert i == Decimal("10.50")
+    assert Interes(Decimal("0.1"), Decimal("0.2"), 100, 360, exacto=True).calcular() == Decimal("0.30")
@@ -0,0 +1,91 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from impuestos_package.lote import calcular_lote
+from impuestos_package.mv import MantenimientoValor
+from impuestos_package.interes import Interes
+from impuestos_package.sancion import Sancion
+
+def test_lote_igual_al_calculo_escalar(proveedor_falso):
+    filas = [
+        (1000.0, "2024-01-01", "2024-02-01", 12.0, 30, 10.0),
+        (500.0, "2024-01-01", "2024-03-01", 6.0, 60, 12.0),
+        (250.0, "2024-02-01", "2024-03-01", 3.5, 29, 0.0),
+    ]
+    api = proveedor_falso()
+    res = calcular_lote(*map(list, zip(*filas)), api=api)
+    ufvs = api.valores
+
+    assert api.consultas == [["2024-01-01", "2024-02-01", "2024-03-01"]]
+    for k, (to, fi, ff, tasa, dias, porc) in enumerate(filas):
+        mv = MantenimientoValor(to, ufvs[ff], ufvs[fi]).calcular()
+        i = Interes(to, mv, tasa, dias).calcular()
+        s = Sancion(to, porc).calcular()
+        assert res["MV"][k] == mv
+        assert res["I"][k] == i
+        assert res["S"][k] == s
+        assert res["DT"][k] == round(to + mv + i + s, 2)
+
+def test_lote_valores_negativos(proveedor_falso):
+    with pytest.raises(ValueError):
+        calcular_lote([-1.0], ["2024-01-01"], ["2024-02-01"], [12], [30], [10], api=proveedor_falso())
+
+def test_lote_ufv_en_baja_como_calculadora(proveedor_falso):
+    from decimal import Decimal
+    from impuestos_package.calculadora import CalculadoraDeuda
+
+    en_baja = proveedor_falso({"2024-01-01": 2.6, "2024-02-01": 2.5})
+    for exacto in (False, True):
+        assert "error" in CalculadoraDeuda(1000.0, "2024-01-01", "2024-02-01", 12, 30, 10,
+                                           api=en_baja, exacto=exacto).calcular()
+    # La fila rechazada queda sin resultado y el resto del lote se calcula
+    columnas = ([1000.0, 1000.0], ["2024-01-01", "2024-01-01"], ["2024-01-01", "2024-02-01"],
+                [12, 12], [30, 30], [10, 10])
+    res = calcular_lote(*columnas, api=en_baja)
+    assert res["errores"].tolist() == [1]
+    assert res["DT"][0] == 1110.0
+    assert all(np.isnan(res[campo][1]) for campo in ("MV", "I", "S", "DT"))
+    exacto = calcular_lote(*columnas, api=en_baja, exacto=True)
+    assert exacto["errores"] == [1]
+    assert exacto["DT"][0] == Decimal("1110.00")
+    assert [exacto[campo][1] for campo in ("MV", "I", "S", "DT")] == [None] * 4
+
+def test_lote_mismos_centavos_que_calculadora():
+    import random
+    from datetime import date, timedelta
+    from impuestos_package.calculadora import CalculadoraDeuda
+    from impuestos_package.ufv_local import UFVArchivo
+
+    inicio = date(2024, 1, 1)
+    fechas = [(inicio + timedelta(days=d)).isoformat() for d in range(366)]
+    api = UFVArchivo([(f, round(2.4 + d * 0.000137, 5)) for d, f in enumerate(fechas)])
+    rnd = random.Random(7)
+    filas = []
+    for _ in range(3000):
+        fi, ff = sorted(rnd.sample(fechas, 2))
+        filas.append((round(rnd.uniform(1, 50000), 2), fi, ff, rnd.choice([3, 5, 6, 12.5]),
+                      rnd.randint(0, 720), rnd.choice([0, 10, 12, 15, 20, 100])))
+    res = calcular_lote(*map(list, zip(*filas)), api=api)
+    assert res["errores"].size == 0
+    for k, fila in enumerate(filas):
+        esperado = CalculadoraDeuda(*fila, api=api, capacidad_historial=0).calcular()
+        assert [res[c][k] for c in ("TO", "MV", "I", "S", "DT")] == [esperado[c] for c in ("TO", "MV", "I", "S", "DT")], fila
+
+def test_lote_longitudes_distintas(proveedor_falso):
+    with pytest.raises(ValueError):
+        calcular_lote([1.0, 2.0], ["2024-01-01"], ["2024-02-01"], [12], [30], [10], api=proveedor_falso())
+
+def test_lote_exacto_igual_a_calculadora_exacta(proveedor_falso):
+    from decimal import Decimal
+    from impuestos_package.calculadora import CalculadoraDeuda
+    filas = [
+        (5906.25, "2024-01-01", "2024-02-01", 12.0, 30, 10.0),
+        (500.0, "2024-01-01", "2024-03-01", 6.0, 60, 12.0),
+    ]
+    res = calcular_lote(*map(list, zip(*filas)), api=proveedor_falso(), exacto=True)
+    for k, fila in enumerate(filas):
+        esperado = CalculadoraDeuda(*fila, api=proveedor_falso(), exacto=True).calcular()
+        for campo in ("TO", "MV", "I", "S", "DT"):
+            assert res[campo][k] == esperado[campo]
+    assert res["S"][0] == Decimal("590.63")
@@ -0,0 +1,59 @@
+import pytest
+
+from impuestos_package import metricas
+from impuestos_package.calculadora import CalculadoraDeuda
+from impuestos_package.ufv import BCBAPIUFV, UFVFetchError
+from impuestos_package.ufv_cache import CacheUFV
+
+
+@pytest.fixture
+def registro():
+    receptor = metricas.registrar(metricas.Metricas())
+    yield receptor
+    metricas.quitar(receptor)
+
+
+def _calculadora(api):
+    return CalculadoraDeuda(TO=1000.0, fecha_inicio="2024-01-01", fecha_fin="2024-02-01", tasa=12.0, dias=30,
+                            porcentaje=10.0, api=api)
+
+
+def test_sin_receptores_no_mide(proveedor_falso):
+    assert not metricas.activa()
+    assert metricas.cronometro() is metricas.cronometro()  # siempre el mismo objeto nulo
+    assert _calculadora(proveedor_falso()).calcular()["DT"] == 1160.50
+
+
+def test_etapas_del_calculo(registro, proveedor_falso):
+    _calculadora(proveedor_falso()).calcular()
+    resumen = registro.resumen()
+    for etapa in ("ufv.consulta", "calculo.mv", "calculo.interes", "calculo.sancion", "calculo.total"):
+        assert resumen[etapa]["n"] == 1
+    total = registro.tiempos("calculo.total")[0]
+    assert sum(registro.tiempos(e)[0] for e in ("ufv.consulta", "calculo.mv")) <= total
+    assert resumen["contadores"] == {}
+
+
+def test_cuenta_errores_de_calculo(registro, proveedor_falso):
+    assert "error" in _calculadora(proveedor_falso(falla=True)).calcular()
+    assert registro.contadores["calculo.errores"] == 1
+
+
+def test_aciertos_y_fallos_del_cache(registro, tmp_path):
+    cache = CacheUFV(str(tmp_path / "ufv.sqlite3"))
+    cache.guardar([("2024-01-01", 2.0)])
+    cache.obtener(["2024-01-01", "2024-01-02"])
+    cache.huecos("2024-01-01", "2024-01-03")
+    assert registro.contadores["cache.disco.aciertos"] == 2
+    assert registro.contadores["cache.disco.fallos"] == 3
+
+
+def test_reintentos_y_errores_de_red(registro, servidor_bcb):
+    servidor_bcb.estado_http = 503
+    api = BCBAPIUFV(reintentos=2, backoff=0)
+    api.BASE_URL = servidor_bcb.url
+    with pytest.raises(UFVFetchError):
+        api.valor_en("2024-01-01")
+    assert registro.contadores["ufv.reintentos"] >= 2
+    assert registro.contadores["ufv.errores"] == 1
+    assert registro.resumen()["ufv.descarga"]["n"] == 1
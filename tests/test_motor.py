@@ -0,0 +1,51 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from impuestos_package.calculadora import CalculadoraDeuda
+from impuestos_package.motor import MotorDeuda, ResultadoDeuda
+from impuestos_package.ufv import UFVFetchError
+from impuestos_package.ufv_local import UFVArchivo
+
+API = UFVArchivo([("2024-01-01", 2.0), ("2024-02-01", 2.1), ("2024-03-01", 2.23457)])
+FILAS = [
+    (1000.0, "2024-01-01", "2024-02-01", 12.0, 30, 10.0),
+    (5906.25, "2024-01-01", "2024-03-01", 6.0, 60, 10.0),
+    (250, "2024-02-01", "2024-03-01", 3.5, 29, 0),
+]
+
+
+@pytest.mark.parametrize("exacto", [False, True])
+def test_motor_igual_a_calculadora(exacto):
+    motor = MotorDeuda(api=API, exacto=exacto)
+    for fila in FILAS:
+        esperado = CalculadoraDeuda(*fila, api=API, exacto=exacto).calcular()
+        r = motor.calcular(*fila)
+        assert isinstance(r, ResultadoDeuda)
+        assert tuple(r) == tuple(esperado[k] for k in ("TO", "MV", "I", "S", "DT"))
+
+
+def test_motor_lanza_errores():
+    motor = MotorDeuda(api=API)
+    with pytest.raises(UFVFetchError):
+        motor.calcular(1000, "2023-01-01", "2024-02-01", 12, 30, 10)
+    with pytest.raises(ValueError):
+        motor.calcular(-1, "2024-01-01", "2024-02-01", 12, 30, 10)
+
+
+@pytest.mark.parametrize("exacto", [False, True])
+def test_motor_ufv_en_baja_igual_a_calculadora(exacto):
+    api = UFVArchivo([("2024-01-01", 2.6), ("2024-02-01", 2.5)])
+    fila = (1000.0, "2024-01-01", "2024-02-01", 12.0, 30, 10.0)
+    esperado = CalculadoraDeuda(*fila, api=api, exacto=exacto).calcular()
+    with pytest.raises(ValueError) as exc:
+        MotorDeuda(api=api, exacto=exacto).calcular(*fila)
+    assert esperado == {"error": str(exc.value)}
+
+
+def test_motor_sin_estado_compartido_entre_hilos():
+    motor = MotorDeuda(api=API)
+    assert not hasattr(motor, "__dict__")
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        resultados = list(ex.map(lambda fila: motor.calcular(*fila), FILAS * 200))
+    assert resultados == [motor.calcular(*fila) for fila in FILAS] * 200
@@ -14,3 +14,9 @@ def test_mv_ufv_cero():
         MantenimientoValor(1000, 0, 2.0)
     with pytest.raises(ValueError):
         MantenimientoValor(1000, 2.0, 0)
+
+def test_mv_exacto():
+    from decimal import Decimal
+    mv = MantenimientoValor(1000, 2.1, 2.0, exacto=True).calcular()
+    assert mv == Decimal("50.00")
+    assert isinstance(mv, Decimal)
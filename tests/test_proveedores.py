@@ -0,0 +1,62 @@
+from datetime import date, timedelta
+
+import pytest
+
+from impuestos_package.calculadora import CalculadoraDeuda
+from impuestos_package.proveedores import (
+    CadenaUFV, NivelDisco, NivelMemoria, ProveedorUFV, crear_cadena,
+)
+from impuestos_package.ufv import BCBAPIUFV, UFVFetchError
+from impuestos_package.ufv_cache import CacheUFV
+from impuestos_package.ufv_local import UFVArchivo
+
+def test_proveedores_cumplen_protocolo(proveedor_falso):
+    assert isinstance(BCBAPIUFV(), ProveedorUFV)
+    assert isinstance(UFVArchivo([("2024-01-01", 2.0)]), ProveedorUFV)
+    assert isinstance(crear_cadena(origen=proveedor_falso({})), ProveedorUFV)
+
+def test_cadena_memoria_disco_origen(proveedor_falso):
+    origen = proveedor_falso({"2024-01-01": 2.0, "2024-02-01": 2.1, "2024-03-01": 2.2})
+    disco = NivelDisco(CacheUFV(":memory:"))
+    disco.guardar([("2024-03-01", 2.2)])
+    memoria = NivelMemoria(capacidad=10)
+    cadena = CadenaUFV([memoria, disco], origen)
+
+    assert cadena.valores_en(["2024-01-01", "2024-03-01"]) == {"2024-01-01": 2.0, "2024-03-01": 2.2}
+    assert origen.consultas == [["2024-01-01"]]
+    # La segunda vez todo sale de memoria
+    cadena.valores_en(["2024-01-01", "2024-03-01"])
+    assert origen.consultas == [["2024-01-01"]]
+
+    est = cadena.estadisticas()
+    assert est["memoria"] == {"aciertos": 2, "fallos": 2}
+    assert est["disco"] == {"aciertos": 1, "fallos": 1}
+    assert est["origen"] == {"consultas": 1}
+
+def test_memoria_lru_acotada():
+    memoria = NivelMemoria(capacidad=2)
+    memoria.guardar([("2024-01-01", 1.0), ("2024-01-02", 2.0)])
+    memoria.buscar(["2024-01-01"])          # 01-01 pasa a ser el más reciente
+    memoria.guardar([("2024-01-03", 3.0)])  # desaloja 01-02
+    assert len(memoria) == 2
+    assert memoria.buscar(["2024-01-01", "2024-01-02", "2024-01-03"]) == {"2024-01-01": 1.0, "2024-01-03": 3.0}
+
+def test_memoria_ttl_para_hoy():
+    hoy = date.today().isoformat()
+    ayer = (date.today() - timedelta(days=1)).isoformat()
+    memoria = NivelMemoria(ttl_hoy=0)
+    memoria.guardar([(hoy, 3.0), (ayer, 2.9)])
+    assert memoria.buscar([hoy, ayer]) == {ayer: 2.9}
+
+def test_cadena_en_calculadora(proveedor_falso):
+    origen = proveedor_falso({"2024-01-01": 2.0, "2024-02-01": 2.1})
+    cadena = crear_cadena(origen=origen)
+    for _ in range(3):
+        res = CalculadoraDeuda(1000.0, "2024-01-01", "2024-02-01", 12.0, 30, 10.0, api=cadena).calcular()
+        assert res["DT"] == 1160.50
+    assert len(origen.consultas) == 1
+
+def test_cadena_fecha_inexistente(proveedor_falso):
+    cadena = crear_cadena(origen=proveedor_falso({}))
+    with pytest.raises(UFVFetchError):
+        cadena.valor_en("2024-01-01")
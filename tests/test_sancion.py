@@ -12,3 +12,10 @@ def test_sancion_to_negativo():
 def test_sancion_porcentaje_negativo():
     with pytest.raises(ValueError):
         Sancion(100, -5)
+
+def test_sancion_exacta_redondea_mitad_hacia_arriba():
+    from decimal import Decimal, ROUND_HALF_EVEN
+    # 590.625 en float queda como 590.62499... y round() baja
+    assert Sancion(5906.25, 10).calcular() == 590.62
+    assert Sancion(5906.25, 10, exacto=True).calcular() == Decimal("590.63")
+    assert Sancion(5906.25, 10, exacto=True, redondeo=ROUND_HALF_EVEN).calcular() == Decimal("590.62")
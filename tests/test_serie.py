@@ -0,0 +1,80 @@
+import sys
+from array import array
+
+import pytest
+
+from impuestos_package.mv import MantenimientoValor
+from impuestos_package.serie import SerieUFV
+from impuestos_package.ufv import BCBAPIUFV, UFVFetchError
+
+def _serie():
+    return SerieUFV.desde_pares([("2024-01-03", 2.02), ("2024-01-01", 2.0), ("2024-01-02", 2.01)])
+
+def test_serie_consulta_puntual():
+    serie = _serie()
+    assert serie["2024-01-02"] == 2.01
+    assert serie.get("2023-12-31") is None
+    assert "2024-01-03" in serie
+    assert (serie.fecha_inicio, serie.fecha_fin, len(serie)) == ("2024-01-01", "2024-01-03", 3)
+    with pytest.raises(UFVFetchError):
+        serie.valor("2024-02-01")
+
+def test_serie_dias_sin_dato():
+    serie = SerieUFV.desde_pares([("2024-01-01", 2.0), ("2024-01-04", 2.1)])
+    assert len(serie) == 4
+    assert serie.dias_con_valor() == 2
+    assert serie.get("2024-01-02") is None
+    assert list(serie.items()) == [("2024-01-01", 2.0), ("2024-01-04", 2.1)]
+
+def test_serie_rango_sin_copia():
+    valores = array("d", [2.0, 2.01, 2.02, 2.03])
+    serie = SerieUFV("2024-01-01", valores)
+    tramo = serie.rango("2023-12-01", "2024-01-02")
+    assert (tramo.fecha_inicio, tramo.fecha_fin) == ("2024-01-01", "2024-01-02")
+    valores[1] = 9.0  # la vista comparte el buffer
+    assert tramo["2024-01-02"] == 9.0
+    with pytest.raises(UFVFetchError):
+        serie.rango("2024-02-01", "2024-02-05")
+
+def test_serie_ratio_para_mv():
+    serie = SerieUFV.desde_pares([("2024-01-01", 2.0), ("2024-02-01", 2.1)])
+    assert serie.ratio("2024-02-01", "2024-01-01") == pytest.approx(1.05)
+    mv = MantenimientoValor(1000, serie["2024-02-01"], serie["2024-01-01"]).calcular()
+    assert mv == 50.0
+
+def test_serie_ocupa_menos_que_lista_de_dicts():
+    pares = [(f"2024-01-{d:02d}", 2.0 + d / 1000) for d in range(1, 29)]
+    serie = SerieUFV.desde_pares(pares)
+    lista = [{"fecha": f, "valor": v} for f, v in pares]
+    tam_lista = sys.getsizeof(lista) + sum(sys.getsizeof(x) for x in lista)
+    assert serie.valores.nbytes < tam_lista / 10
+
+def test_bcbapiufv_serie(requests_mock):
+    base = "https://www.bcb.gob.bo/librerias/charts/ufv.php"
+    requests_mock.get(f"{base}?cFecIni=2024-01-01&cFecFin=2024-01-02", json=[{"valor": "2.0"}, {"valor": "2.1"}])
+    serie = BCBAPIUFV().serie("2024-01-01", "2024-01-02")
+    assert serie["2024-01-02"] == 2.1
+
+def test_serie_binaria_mmap(tmp_path):
+    import pickle
+    ruta = str(tmp_path / "ufv.bin")
+    original = SerieUFV.desde_pares([("2024-01-01", 2.0), ("2024-01-03", 2.02)])
+    original.guardar_binario(ruta)
+
+    serie = SerieUFV.desde_binario(ruta)
+    assert (serie.fecha_inicio, serie.fecha_fin) == ("2024-01-01", "2024-01-03")
+    assert serie["2024-01-03"] == 2.02
+    assert serie.get("2024-01-02") is None
+    assert serie.valores.readonly
+    # Viaja a otros procesos como ruta y se vuelve a mapear
+    copia = pickle.loads(pickle.dumps(serie))
+    assert copia["2024-01-01"] == 2.0
+
+def test_serie_binaria_invalida(tmp_path):
+    ruta = tmp_path / "ufv.bin"
+    ruta.write_bytes(b"")
+    with pytest.raises(UFVFetchError):
+        SerieUFV.desde_binario(str(ruta))
+    ruta.write_bytes(b"XXXX" + bytes(12))
+    with pytest.raises(UFVFetchError):
+        SerieUFV.desde_binario(str(ruta))
@@ -46,3 +46,175 @@ def test_ufv_json_invalido(requests_mock):
     api = BCBAPIUFV()
     with pytest.raises(UFVFetchError):
         api.consumir_endpoint("2024-01-01", "2024-01-02")
+
+def test_ufv_valores_en_agrupa_fechas_cercanas(requests_mock):
+    base = "https://www.bcb.gob.bo/librerias/charts/ufv.php"
+    requests_mock.get(
+        f"{base}?cFecIni=2024-01-01&cFecFin=2024-01-03",
+        json=[{"valor": "2.00000"}, {"valor": "2.01000"}, {"valor": "2.02000"}],
+    )
+    requests_mock.get(
+        f"{base}?cFecIni=2024-06-01&cFecFin=2024-06-01",
+        json=[{"valor": "2.50000"}],
+    )
+    api = BCBAPIUFV(max_hueco=5)
+    valores = api.valores_en(["2024-06-01", "2024-01-03", "2024-01-01"])
+    assert valores == {"2024-01-01": 2.0, "2024-01-03": 2.02, "2024-06-01": 2.5}
+    assert requests_mock.call_count == 2
+
+def test_ufv_valor_en_puntual(requests_mock):
+    base = "https://www.bcb.gob.bo/librerias/charts/ufv.php"
+    requests_mock.get(
+        f"{base}?cFecIni=2024-01-02&cFecFin=2024-01-02",
+        json=[{"valor": "2,10000"}],
+    )
+    assert BCBAPIUFV().valor_en("2024-01-02") == 2.1
+
+def test_ufv_sesion_compartida_entre_hilos():
+    from concurrent.futures import ThreadPoolExecutor
+    api = BCBAPIUFV(pool_maxsize=4, reintentos=2)
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        sesiones = list(ex.map(lambda _: api._sesion(), range(16)))
+    assert all(s is sesiones[0] for s in sesiones)
+    adapter = sesiones[0].get_adapter(api.BASE_URL)
+    assert adapter._pool_maxsize == 4
+    assert adapter.max_retries.total == 2
+    assert 503 in adapter.max_retries.status_forcelist
+    api.cerrar()
+
+def test_ufv_reutiliza_sesion(requests_mock):
+    base = "https://www.bcb.gob.bo/librerias/charts/ufv.php"
+    requests_mock.get(f"{base}?cFecIni=2024-01-01&cFecFin=2024-01-01", json=[{"valor": "2.0"}])
+    api = BCBAPIUFV()
+    api.consumir_endpoint("2024-01-01")
+    sesion = api._sesion()
+    api.consumir_endpoint("2024-01-01")
+    assert api._sesion() is sesion
+    assert requests_mock.last_request.headers["User-Agent"] == api.USER_AGENT
+
+def test_ufv_se_puede_serializar():
+    import pickle
+    api = BCBAPIUFV(reintentos=5)
+    api._sesion()
+    copia = pickle.loads(pickle.dumps(api))
+    assert copia.reintentos == 5
+    assert copia._sesion() is not api._sesion()
+
+def test_ufv_consultas_simultaneas_comparten_descarga(requests_mock):
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    base = "https://www.bcb.gob.bo/librerias/charts/ufv.php"
+
+    def lenta(request, context):
+        time.sleep(0.2)
+        return [{"valor": "2.0"}, {"valor": "2.1"}]
+
+    requests_mock.get(f"{base}?cFecIni=2024-01-01&cFecFin=2024-01-02", json=lenta)
+    barrera = threading.Barrier(8)
+
+    def consultar(_):
+        barrera.wait()
+        # cada hilo usa su propio cliente: la unión es a nivel de proceso
+        return BCBAPIUFV().consumir_endpoint("2024-01-01", "2024-01-02")
+
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        resultados = list(ex.map(consultar, range(8)))
+    assert requests_mock.call_count == 1
+    assert all(len(r) == 2 for r in resultados)
+
+def test_ufv_consultas_simultaneas_comparten_error(requests_mock):
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    base = "https://www.bcb.gob.bo/librerias/charts/ufv.php"
+
+    def lenta(request, context):
+        time.sleep(0.2)
+        context.status_code = 503
+        return ""
+
+    requests_mock.get(f"{base}?cFecIni=2024-01-01&cFecFin=2024-01-02", text=lenta)
+    barrera = threading.Barrier(4)
+    api = BCBAPIUFV()
+
+    def consultar(_):
+        barrera.wait()
+        try:
+            api.consumir_endpoint("2024-01-01", "2024-01-02")
+        except UFVFetchError:
+            return "error"
+
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        assert list(ex.map(consultar, range(4))) == ["error"] * 4
+    assert requests_mock.call_count == 1
+
+def test_consultas_en_curso_copia_por_solicitante_y_timeout():
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from impuestos_package.ufv import _ConsultasEnCurso
+
+    consultas = _ConsultasEnCurso()
+    empezo, liberar = threading.Event(), threading.Event()
+
+    def descarga():
+        empezo.set()
+        liberar.wait()
+        return [{"valor": "2.0"}]
+
+    def consultar(timeout=None):
+        return consultas.ejecutar("url", descarga, timeout, copiar=lambda f: [dict(d) for d in f])
+
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        lider = ex.submit(consultar)
+        empezo.wait()
+        esperando = ex.submit(consultar)
+        # El timeout de quien espera se respeta aunque la descarga siga en curso
+        with pytest.raises(UFVFetchError, match="Tiempo de espera"):
+            consultar(timeout=0.05)
+        liberar.set()
+        a, b = lider.result(), esperando.result()
+    a[0]["valor"] = "modificado"
+    a.append({})
+    assert b == [{"valor": "2.0"}]
+
+def test_ufv_parse_payload_en_bloque():
+    api = BCBAPIUFV()
+    fechas, valores = api._parse_payload([
+        {"fecha": "2024-01-01T00:00:00", "valor": "2,00000"},
+        {"fecha": "2024-01-02T00:00:00", "valor": " 2.10000 "},
+    ])
+    assert fechas == ["2024-01-01", "2024-01-02"]
+    assert list(valores) == [2.0, 2.1]
+    assert valores.typecode == "d"
+
+def test_ufv_parse_payload_fecha_irregular_en_medio():
+    api = BCBAPIUFV()
+    fila = lambda fecha: {"fecha": fecha, "valor": "2.0"}
+    fechas, _ = api._parse_payload([fila("2024-01-01"), fila(" 2024-01-02"), fila("2024-01-03")])
+    assert fechas == ["2024-01-01", "2024-01-02", "2024-01-03"]
+    fechas, _ = api._parse_payload([fila("2024-01-01"), fila("02/01/2024"), fila("2024-01-03")])
+    assert fechas is None
+
+def test_ufv_parse_payload_esquema_mixto():
+    api = BCBAPIUFV()
+    fechas, valores = api._parse_payload([{"valor": 2.0}, {"UFV": "2,1"}, {"valor": "0"}])
+    assert fechas is None
+    assert valores[:2].tolist() == [2.0, 2.1]
+    assert valores[2] != valores[2]  # NaN: fila sin valor válido
+
+def test_ufv_fechas_no_iso_se_ignoran(requests_mock):
+    base = "https://www.bcb.gob.bo/librerias/charts/ufv.php"
+    api = BCBAPIUFV()
+    fechas, _ = api._parse_payload([{"fecha": "15/03/2023", "valor": "2.4"}])
+    assert fechas is None
+    requests_mock.get(f"{base}?cFecIni=2023-03-15&cFecFin=2023-03-20",
+                      json=[{"fecha": "15/03/2023", "valor": "2,40000"}, {"fecha": "20/03/2023", "valor": "2,41000"}])
+    requests_mock.get(f"{base}?cFecIni=2023-03-15&cFecFin=2023-03-15",
+                      json=[{"fecha": "15/03/2023", "valor": "2,40000"}])
+    requests_mock.get(f"{base}?cFecIni=2023-03-20&cFecFin=2023-03-20",
+                      json=[{"fecha": "20/03/2023", "valor": "2,41000"}])
+    # Con fechas no ISO en un rango, se pide cada fecha por separado
+    assert api.valores_en(["2023-03-15", "2023-03-20"]) == {"2023-03-15": 2.4, "2023-03-20": 2.41}
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from impuestos_package.calculadora import CalculadoraDeuda
+from impuestos_package.ufv import UFVFetchError
+from impuestos_package.ufv_async import AsyncBCBAPIUFV
+
+
+def test_async_une_consultas_identicas(servidor_bcb):
+    async def escenario():
+        api = AsyncBCBAPIUFV(base_url=servidor_bcb.url)
+        try:
+            return await asyncio.gather(*(api.valor_en("2024-01-01") for _ in range(20)))
+        finally:
+            await api.cerrar()
+
+    valores = asyncio.run(escenario())
+    assert valores == [2.0] * 20
+    assert servidor_bcb.consultas == [("2024-01-01", "2024-01-01")]
+
+
+def test_async_consultas_unidas_reciben_copias(servidor_bcb):
+    async def escenario():
+        api = AsyncBCBAPIUFV(base_url=servidor_bcb.url)
+        try:
+            return await asyncio.gather(*(api._consultar_api("2024-01-01", "2024-01-01") for _ in range(3)))
+        finally:
+            await api.cerrar()
+
+    a, b, c = asyncio.run(escenario())
+    assert len(servidor_bcb.consultas) == 1
+    a[0]["valor"] = "modificado"
+    assert b == c == [{"valor": "2.00000"}]
+
+
+def test_async_limita_concurrencia(servidor_bcb):
+    async def escenario():
+        api = AsyncBCBAPIUFV(base_url=servidor_bcb.url, max_concurrencia=2)
+        try:
+            await asyncio.gather(*(api.consumir_endpoint("2024-01-01", f"2024-01-{d:02d}")
+                                   for d in range(2, 8)), return_exceptions=True)
+        finally:
+            await api.cerrar()
+
+    asyncio.run(escenario())
+    assert len(servidor_bcb.consultas) == 6
+    assert servidor_bcb.max_simultaneas <= 2
+
+
+def test_async_error_http(servidor_bcb):
+    async def escenario():
+        api = AsyncBCBAPIUFV(base_url=servidor_bcb.url)
+        try:
+            await api.consumir_endpoint("2024-01-01", "2024-01-05")
+        finally:
+            await api.cerrar()
+
+    with pytest.raises(UFVFetchError):
+        asyncio.run(escenario())
+
+
+def test_calcular_async_comparte_event_loop(servidor_bcb):
+    async def escenario():
+        api = AsyncBCBAPIUFV(base_url=servidor_bcb.url, max_hueco=0)
+        try:
+            calcs = [CalculadoraDeuda(1000.0, "2024-01-01", "2024-02-01", 12.0, 30, 10.0, api=api)
+                     for _ in range(5)]
+            return await asyncio.gather(*(c.calcular_async() for c in calcs))
+        finally:
+            await api.cerrar()
+
+    resultados = asyncio.run(escenario())
+    assert all(r["DT"] == 1160.50 for r in resultados)
+    assert sorted(servidor_bcb.consultas) == [("2024-01-01", "2024-01-01"), ("2024-02-01", "2024-02-01")]
+
+
+def test_calcular_async_sin_api_comparte_cliente_del_loop(monkeypatch, servidor_bcb):
+    from impuestos_package import calculadora as calc_mod
+    monkeypatch.setattr(AsyncBCBAPIUFV, "BASE_URL", servidor_bcb.url)
+
+    async def escenario():
+        calcs = [CalculadoraDeuda(1000.0, "2024-01-01", "2024-01-01", 12.0, 30, 10.0) for _ in range(10)]
+        resultados = await asyncio.gather(*(c.calcular_async() for c in calcs))
+        return resultados, calc_mod._cliente_async_por_defecto()
+
+    resultados, cliente = asyncio.run(escenario())
+    assert all(r["MV"] == 0.0 for r in resultados)
+    # Una sola descarga para los 10 cálculos del mismo loop
+    assert servidor_bcb.consultas == [("2024-01-01", "2024-01-01")]
+    _, otro = asyncio.run(escenario())
+    assert otro is not cliente  # cada event loop tiene su cliente
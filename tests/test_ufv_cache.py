@@ -0,0 +1,51 @@
+from impuestos_package.ufv import BCBAPIUFV
+from impuestos_package.ufv_cache import CacheUFV
+from impuestos_package.calculadora import CalculadoraDeuda
+
+BASE = "https://www.bcb.gob.bo/librerias/charts/ufv.php"
+
+def test_cache_evita_segunda_consulta(requests_mock, tmp_path):
+    requests_mock.get(
+        f"{BASE}?cFecIni=2024-01-01&cFecFin=2024-01-03",
+        json=[{"valor": "2,00000"}, {"valor": "2.05000"}, {"valor": "2.10000"}],
+    )
+    api = BCBAPIUFV(cache=CacheUFV(str(tmp_path / "ufv.sqlite3")))
+    primera = api.consumir_endpoint("2024-01-01", "2024-01-03")
+    segunda = api.consumir_endpoint("2024-01-01", "2024-01-03")
+    assert requests_mock.call_count == 1
+    assert [api._parse_valor(x) for x in segunda] == [2.0, 2.05, 2.1]
+    assert api._parse_valor(primera[0]) == 2.0
+
+def test_cache_persiste_en_disco(requests_mock, tmp_path):
+    ruta = str(tmp_path / "ufv.sqlite3")
+    requests_mock.get(
+        f"{BASE}?cFecIni=2024-01-01&cFecFin=2024-01-02",
+        json=[{"valor": "2.00000"}, {"valor": "2.10000"}],
+    )
+    BCBAPIUFV(cache=CacheUFV(ruta)).consumir_endpoint("2024-01-01", "2024-01-02")
+    datos = BCBAPIUFV(cache=CacheUFV(ruta)).consumir_endpoint("2024-01-01", "2024-01-02")
+    assert requests_mock.call_count == 1
+    assert datos[-1] == {"fecha": "2024-01-02", "valor": 2.1}
+
+def test_cache_solo_pide_huecos(requests_mock):
+    cache = CacheUFV(":memory:")
+    cache.guardar([("2024-01-01", 2.0), ("2024-01-02", 2.01)])
+    requests_mock.get(
+        f"{BASE}?cFecIni=2024-01-03&cFecFin=2024-01-04",
+        json=[{"valor": "2.02"}, {"valor": "2.03"}],
+    )
+    datos = BCBAPIUFV(cache=cache).consumir_endpoint("2024-01-01", "2024-01-04")
+    assert requests_mock.call_count == 1
+    assert len(datos) == 4
+    assert cache.huecos("2024-01-01", "2024-01-04") == []
+
+def test_calculadora_con_cliente_compartido(requests_mock):
+    requests_mock.get(
+        f"{BASE}?cFecIni=2024-01-01&cFecFin=2024-01-02",
+        json=[{"valor": "2.00000"}, {"valor": "2.10000"}],
+    )
+    api = BCBAPIUFV(cache=CacheUFV(":memory:"))
+    for _ in range(3):
+        res = CalculadoraDeuda(1000, "2024-01-01", "2024-01-02", 12, 30, 10, api=api).calcular()
+        assert res["MV"] == 50.00
+    assert requests_mock.call_count == 1
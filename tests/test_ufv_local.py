@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+from impuestos_package.calculadora import CalculadoraDeuda
+from impuestos_package.ufv import UFVFetchError
+from impuestos_package.ufv_local import UFVArchivo
+
+def test_ufv_archivo_csv(tmp_path):
+    ruta = tmp_path / "ufv.csv"
+    ruta.write_text("fecha,valor\n2024-01-01,\"2,00000\"\n2024-01-02,2.05\n2024-01-04,2.10\n", encoding="utf-8")
+    api = UFVArchivo.desde_archivo(str(ruta))
+    assert api.valor_en("2024-01-02") == 2.05
+    assert api.valores_en(["2024-01-04", "2024-01-01"]) == {"2024-01-04": 2.10, "2024-01-01": 2.0}
+    # El día faltante (2024-01-03) se omite del rango
+    assert [x["fecha"] for x in api.consumir_endpoint("2024-01-01", "2024-01-04")] == \
+        ["2024-01-01", "2024-01-02", "2024-01-04"]
+    assert len(api) == 3
+
+def test_ufv_archivo_json(tmp_path):
+    ruta = tmp_path / "ufv.json"
+    ruta.write_text(json.dumps({"2024-01-01": 2.0, "2024-02-01": 2.1}), encoding="utf-8")
+    api = UFVArchivo.desde_archivo(str(ruta))
+    res = CalculadoraDeuda(1000.0, "2024-01-01", "2024-02-01", 12.0, 30, 10.0, api=api).calcular()
+    assert res["DT"] == 1160.50
+
+def test_ufv_archivo_fecha_fuera_de_rango():
+    api = UFVArchivo([("2024-01-01", 2.0)])
+    with pytest.raises(UFVFetchError):
+        api.valor_en("2023-12-31")
+    with pytest.raises(UFVFetchError):
+        api.valores_en(["2024-01-01", "2024-01-02"])
+    with pytest.raises(UFVFetchError):
+        api.consumir_endpoint("2024-02-01", "2024-02-03")
+
+def test_ufv_archivo_fila_invalida(tmp_path):
+    ruta = tmp_path / "ufv.csv"
+    ruta.write_text("fecha,valor\n2024-01-01,abc\n", encoding="utf-8")
+    with pytest.raises(UFVFetchError):
+        UFVArchivo.desde_archivo(str(ruta))